@@ -0,0 +1,93 @@
+"""
+Benchmark - response serialization for GET /tarefas pages
+
+Compara o serializer antigo (json_dumps com default=custom_serializer, que faz
+model_dump(mode="json") por objeto) com o atual (fast_json_dumps/orjson), com e
+sem o custo de montar os TarefaResponse. Não precisa de banco nem de AWS.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --rows 100 --repeat 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from models.tarefa import StatusTarefa  # noqa: E402
+from schemas import TarefaResponse  # noqa: E402
+from utils.json_serializer import fast_json_dumps, json_dumps, orjson  # noqa: E402
+
+
+def make_rows(count: int) -> list:
+    """Linhas no formato das entidades Tarefa carregadas pelo ORM"""
+    owner = str(uuid.uuid4())
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(
+            id=str(uuid.uuid4()),
+            titulo=f"Revisar contrato {i}",
+            descricao="Contrato de prestação de serviços " * 8,
+            status=StatusTarefa.PENDENTE if i % 3 else StatusTarefa.CONCLUIDA,
+            criado_por=owner,
+            atualizado_por=owner,
+            data_criacao=now - timedelta(minutes=i),
+            data_atualizacao=now,
+            data_conclusao=None if i % 3 else now,
+        )
+        for i in range(count)
+    ]
+
+
+def page(data: list, limit: int) -> dict:
+    return {"data": data, "count": len(data), "limit": limit, "offset": 0, "next_cursor": None}
+
+
+def build(rows: list) -> list:
+    return [TarefaResponse.model_validate(r) for r in rows]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100, help="Linhas por página")
+    parser.add_argument("--repeat", type=int, default=1000, help="Páginas serializadas por medição")
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows)
+    models = build(rows)
+    body = page(models, len(rows))
+
+    # Mesmo JSON nos dois caminhos (só a formatação de espaços muda)
+    assert json.loads(fast_json_dumps(body)) == json.loads(json_dumps(body))
+
+    cases = (
+        ("json_dumps", lambda: json_dumps(body)),
+        ("fast_json_dumps", lambda: fast_json_dumps(body)),
+        ("model_validate + json_dumps", lambda: json_dumps(page(build(rows), len(rows)))),
+        ("model_validate + fast_json_dumps", lambda: fast_json_dumps(page(build(rows), len(rows)))),
+    )
+
+    print(f"orjson: {'sim' if orjson else 'não (fallback json)'} | {args.rows} linhas/página | {args.repeat} páginas")
+    results = {}
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=args.repeat, repeat=5))
+        results[name] = best / args.repeat * 1e6
+        print(f"  {name:<34} {results[name]:>10.1f} µs/página")
+
+    print(f"  speedup serialização: {results['json_dumps'] / results['fast_json_dumps']:.1f}x")
+    print(
+        "  speedup fim a fim:    "
+        f"{results['model_validate + json_dumps'] / results['model_validate + fast_json_dumps']:.1f}x"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
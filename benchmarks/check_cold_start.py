@@ -0,0 +1,86 @@
+"""
+Cold start check - fails (exit 1) if `import app` regresses
+
+Importa o app em processos novos (como um cold start da Lambda) e verifica:
+- a mediana de `import app` fica dentro do orçamento (--budget-ms)
+- nenhum dos módulos pesados carregados sob demanda (SQLAlchemy, Pydantic,
+  jwt, bcrypt, X-Ray SDK) foi importado no carregamento
+
+O Tracer desligado do Powertools importa só aws_xray_sdk.sdk_config (leve);
+o que não pode carregar é aws_xray_sdk.core.
+
+Não acessa AWS nem banco. Uso (a partir da raiz do repositório):
+    python benchmarks/check_cold_start.py
+    python benchmarks/check_cold_start.py --budget-ms 300 --repeat 7
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Módulos que só podem carregar na primeira requisição que os usa
+DEFERRED_MODULES = ("sqlalchemy", "pydantic", "jwt", "bcrypt", "aws_xray_sdk.core")
+
+_PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import app\n"
+    "elapsed = (time.perf_counter() - start) * 1000\n"
+    f"loaded = [name for name in {DEFERRED_MODULES!r} if name in sys.modules]\n"
+    "print(json.dumps({'ms': elapsed, 'loaded': loaded}))\n"
+)
+
+
+def run_once() -> dict:
+    """Um processo novo: {'ms': tempo de `import app`, 'loaded': módulos adiados já carregados}"""
+    env = dict(os.environ)
+    env.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    env["LAZY_IMPORTS"] = "true"
+
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold start check for app.py")
+    parser.add_argument("--budget-ms", type=float, default=250, help="Mediana máxima de `import app`")
+    parser.add_argument("--repeat", type=int, default=5, help="Processos medidos")
+    args = parser.parse_args(argv)
+
+    # Primeira execução só aquece o cache de bytecode (.pyc)
+    run_once()
+    runs = [run_once() for _ in range(args.repeat)]
+
+    failures = []
+
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+    if loaded:
+        failures.append(f"módulos carregados no import: {', '.join(loaded)}")
+
+    median = statistics.median(run["ms"] for run in runs)
+    if median > args.budget_ms:
+        failures.append(f"import app levou {median:.1f} ms (orçamento {args.budget_ms:.0f} ms)")
+
+    if failures:
+        for failure in failures:
+            print(f"FALHOU: {failure}")
+        return 1
+
+    print(f"OK: import app em {median:.1f} ms (orçamento {args.budget_ms:.0f} ms), sem {', '.join(DEFERRED_MODULES)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Cold start - import time report for `import app`
+
+Roda `python -X importtime` em processos novos (como um cold start da Lambda),
+soma o tempo próprio de cada módulo por pacote de topo e mostra quanto cada
+um custa. Compara o modo lazy (padrão) com LAZY_IMPORTS=false.
+
+Não acessa AWS nem banco: com o modo lazy, `import app` não cria engine nem
+busca parâmetros no SSM.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --mode lazy --repeat 7 --top 20
+    python benchmarks/import_time.py --mode lazy --budget-ms 250   # exit 1 se estourar
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+_PROBE = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "import app\n"
+    "print('IMPORT_APP_MS', (time.perf_counter() - start) * 1000)\n"
+)
+
+
+def run_once(lazy: bool) -> tuple[float, dict[str, int]]:
+    """Um processo novo: retorna (ms de `import app`, µs próprios por pacote de topo)"""
+    env = dict(os.environ)
+    env.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    env["LAZY_IMPORTS"] = "true" if lazy else "false"
+    env["PYTHONDONTWRITEBYTECODE"] = "0"
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total_ms = next(
+        float(line.split()[1]) for line in proc.stdout.splitlines() if line.startswith("IMPORT_APP_MS")
+    )
+
+    by_package: dict[str, int] = defaultdict(int)
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        by_package[name.strip().split(".")[0]] += int(self_us)
+
+    return total_ms, dict(by_package)
+
+
+def report(lazy: bool, repeat: int, top: int) -> dict:
+    # Primeira execução só aquece o cache de bytecode (.pyc)
+    run_once(lazy)
+
+    totals, packages = [], defaultdict(list)
+    for _ in range(repeat):
+        total_ms, by_package = run_once(lazy)
+        totals.append(total_ms)
+        for name, us in by_package.items():
+            packages[name].append(us)
+
+    median_packages = {name: statistics.median(values) / 1000 for name, values in packages.items()}
+    ranked = sorted(median_packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    return {
+        "mode": "lazy" if lazy else "eager",
+        "import_app_ms": {
+            "median": statistics.median(totals),
+            "min": min(totals),
+            "max": max(totals),
+        },
+        "packages_ms": dict(ranked),
+    }
+
+
+def print_report(result: dict) -> None:
+    timing = result["import_app_ms"]
+    print(f"\n[{result['mode']}] import app: mediana {timing['median']:.1f} ms "
+          f"(min {timing['min']:.1f}, max {timing['max']:.1f})")
+    print(f"  {'pacote':<32} {'ms (self)':>10}")
+    for name, ms in result["packages_ms"].items():
+        print(f"  {name:<32} {ms:>10.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Import time report for app.py")
+    parser.add_argument("--mode", choices=["lazy", "eager", "both"], default="both")
+    parser.add_argument("--repeat", type=int, default=5, help="Processos medidos por modo")
+    parser.add_argument("--top", type=int, default=15, help="Pacotes listados")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="Falha (exit 1) se a mediana do modo lazy passar deste valor")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON")
+    args = parser.parse_args(argv)
+
+    modes = {"lazy": [True], "eager": [False], "both": [True, False]}[args.mode]
+    results = [report(lazy, args.repeat, args.top) for lazy in modes]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print_report(result)
+
+    if args.budget_ms is not None:
+        lazy_result = next((r for r in results if r["mode"] == "lazy"), None)
+        if lazy_result is None:
+            parser.error("--budget-ms requer --mode lazy ou both")
+
+        median = lazy_result["import_app_ms"]["median"]
+        if median > args.budget_ms:
+            print(f"\nFALHOU: import app levou {median:.1f} ms (orçamento {args.budget_ms:.0f} ms)")
+            return 1
+        print(f"\nOK: import app em {median:.1f} ms (orçamento {args.budget_ms:.0f} ms)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
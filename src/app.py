@@ -1,25 +1,36 @@
-from aws_lambda_powertools import Logger, Tracer
+import os
+
+from aws_lambda_powertools import Logger, Metrics
 from aws_lambda_powertools.event_handler import APIGatewayHttpResolver, Response
 from aws_lambda_powertools.logging import correlation_paths
 
-from database import init_db
+from config import parameters
 
 from routes.health import router as health_router
 from routes.usuario_routes import router as usuario_router
 from routes.tarefa_routes import router as tarefa_router
 
-from utils.json_serializer import json_dumps
+from utils import compression, read_your_writes, sql_stats, timing
+from utils.json_serializer import json_dumps, fast_json_dumps
+from utils.tracing import get_tracer
 
 logger = Logger()
-tracer = Tracer(disabled=True)
+tracer = get_tracer()
+# Namespace de POWERTOOLS_METRICS_NAMESPACE; o default evita que log_metrics
+# falhe a invocação quando a env não está definida (sam local, benchmarks)
+metrics = Metrics(namespace=os.getenv("POWERTOOLS_METRICS_NAMESPACE", "TodoAdvogados"))
+
+app = APIGatewayHttpResolver(serializer=timing.timed("serialize", fast_json_dumps))
 
-app = APIGatewayHttpResolver(serializer=json_dumps)
+# Schema é migrado no deploy (python -m migrations upgrade); no cold start,
+# no máximo um SELECT na schema_version quando DB_SCHEMA_CHECK=true
+if os.getenv("DB_SCHEMA_CHECK", "false").lower() == "true":
+    try:
+        from database import check_schema_version
 
-try:
-    init_db()
-    logger.info("Database inicializado.")
-except Exception as e:
-    logger.error(f"Falha ao iniciar database: {str(e)}")
+        check_schema_version()
+    except Exception as e:
+        logger.error(f"Falha ao verificar schema do database: {str(e)}")
 
 
 # Register Routers
@@ -31,19 +42,52 @@ app.include_router(tarefa_router)
 # Lambda Handler
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_HTTP)
 @tracer.capture_lambda_handler
+@metrics.log_metrics
 def lambda_handler(event, context):
     logger.info(
         f"Request received: {event}",
     )
 
+    route = event.get("routeKey") or "unknown"
+
+    # Statements, tempo de banco e statement mais lento desta invocação (EMF)
+    stats = sql_stats.begin_request()
+    # Fases da requisição -> header Server-Timing + log "Request timings"
+    timings = timing.begin_request()
+    # Última escrita do cliente (X-Last-Write / cookie): leituras no primário na janela
+    writes = read_your_writes.begin_request(
+        (event.get("headers") or {}).get(read_your_writes.HEADER.lower()), event.get("cookies") or ()
+    )
+
     try:
-        return app.resolve(event, context)
+        # Renova secrets do SSM vencidos (engine e chave JWT reagem via subscribe)
+        parameters.refresh_if_stale()
+
+        response = app.resolve(event, context)
+
+        # gzip/br conforme Accept-Encoding (body em base64 no formato HTTP API v2)
+        with timing.phase("compress"):
+            accept_encoding = (event.get("headers") or {}).get("accept-encoding")
+            response = compression.compress_response(response, accept_encoding)
     
     except Exception as e:
         logger.exception("Unhandled exception in lambda_handler")
-        return {
+        response = {
             "statusCode": 500,
             "body": json_dumps(
                 {"message": "Erro interno do servidor", "error": str(e)}
             ),
         }
+
+    finally:
+        sql_stats.end_request()
+        timing.end_request()
+        read_your_writes.end_request()
+        sql_stats.publish(metrics, stats, route)
+
+    cookie = read_your_writes.finish(response.setdefault("headers", {}), writes)
+    if cookie:
+        response.setdefault("cookies", []).append(cookie)
+
+    timing.finish(response.setdefault("headers", {}), timings, stats.total_ms, route, response["statusCode"])
+    return response
@@ -0,0 +1,339 @@
+"""
+ASGI entry point - serves the API from a long-lived container
+
+    cd src && uvicorn asgi:app --host 0.0.0.0 --port 8000
+
+Rotas com versão async (routes/async_routes.py) rodam direto no event loop
+com asyncpg. As demais (/, /health, rotas novas ainda sem versão async) passam
+pelo mesmo APIGatewayHttpResolver da Lambda, com a requisição convertida em
+evento HTTP API v2.
+"""
+
+import asyncio
+import base64
+import contextvars
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.event_handler.exceptions import ServiceError
+
+from app import app as resolver
+from config import config, parameters
+import database_async
+from routes.async_routes import router as async_router
+from utils.async_router import AsyncRequest, JSONResponse, StreamingResponse
+from utils.exceptions import (
+    ConflictException,
+    ForbiddenException,
+    NotFoundException,
+    UnauthorizedException,
+    ValidationException,
+)
+from utils import compression, read_your_writes, sql_stats, timing
+from utils.json_serializer import fast_json_dumps
+
+logger = Logger()
+
+# O resolver do Powertools guarda o evento atual em atributo de classe
+# (BaseRouter.current_event): uma única thread para não misturar requisições
+_resolver_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resolver")
+
+# Partes de uma resposta em streaming são agrupadas até este tamanho por envio
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+# Mesmo mapeamento das rotas síncronas (Forbidden -> 401, Conflict -> 400)
+_EXCEPTION_STATUS = (
+    (UnauthorizedException, 401),
+    (ForbiddenException, 401),
+    (NotFoundException, 404),
+    (ConflictException, 400),
+    (ValidationException, 400),
+)
+
+
+class _PayloadTooLarge(Exception):
+    pass
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+    elif scope["type"] == "http":
+        await _http(scope, receive, send)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+
+        if message["type"] == "lifespan.startup":
+            try:
+                # Carrega o SSM fora do event loop antes da primeira requisição
+                await asyncio.to_thread(parameters.refresh)
+            except Exception as e:
+                logger.error(f"Error preloading SSM parameters: {str(e)}")
+            await send({"type": "lifespan.startup.complete"})
+
+        elif message["type"] == "lifespan.shutdown":
+            await database_async.dispose_async_engine()
+            _resolver_executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _http(scope, receive, send):
+    route = f"{scope['method']} {scope['path']}"
+
+    # Contextvars por task: cada requisição concorrente tem seus próprios contadores
+    stats = sql_stats.begin_request()
+    timings = timing.begin_request()
+    request_headers = _headers(scope)
+    writes = read_your_writes.begin_request(
+        request_headers.get(read_your_writes.HEADER.lower()), request_headers.get("cookie", "").split(";")
+    )
+    try:
+        status, headers, payload = await _dispatch(scope, receive)
+        accept_encoding = request_headers.get("accept-encoding")
+
+        cookie = read_your_writes.finish(headers, writes)
+        if cookie:
+            headers.setdefault("Set-Cookie", []).append(cookie)
+
+        if isinstance(payload, bytes):
+            with timing.phase("compress"):
+                payload = compression.compress_body(payload, headers, accept_encoding)
+            timing.finish(headers, timings, stats.total_ms, route, status)
+            await _send(send, status, headers, payload)
+        else:
+            # Streaming: o Server-Timing cobre só as fases até a primeira parte
+            compressor = compression.stream_compressor(headers, accept_encoding)
+            timing.finish(headers, timings, stats.total_ms, route, status)
+            await _send_stream(send, status, headers, payload, compressor)
+    finally:
+        sql_stats.end_request()
+        timing.end_request()
+        read_your_writes.end_request()
+        # Sem EMF aqui (o Metrics do Powertools é por invocação Lambda); só log
+        logger.debug(
+            "SQL stats",
+            extra={
+                "route": route,
+                "sql_statements": stats.count,
+                "sql_time_ms": round(stats.total_ms, 3),
+                "sql_slowest_ms": round(stats.slowest_ms, 3),
+            },
+        )
+
+
+async def _dispatch(scope, receive) -> tuple[int, dict, object]:
+    """(status, headers, payload): payload em bytes, ou iterador async de str (streaming)"""
+
+    method = scope["method"]
+    path = scope["path"]
+
+    # POST /tarefas/import recebe arquivos inteiros: limite próprio
+    limit = config.IMPORT_MAX_BYTES if path == "/tarefas/import" else config.MAX_REQUEST_BODY_BYTES
+    try:
+        body = await _read_body(receive, limit)
+    except _PayloadTooLarge:
+        return _error(413, f"Corpo da requisição excede {limit} bytes")
+
+    # Renova secrets do SSM vencidos (refresh em background a partir de 80% do TTL)
+    parameters.refresh_if_stale()
+
+    match = async_router.match(method, path)
+    if match is None:
+        return await _resolve_sync(scope, body)
+
+    handler, path_params, error = match
+    request = AsyncRequest(method, path, _headers(scope), _query(scope), body)
+
+    try:
+        result = await handler(request, **path_params)
+
+        if isinstance(result, StreamingResponse):
+            # Primeira parte ainda aqui: falhas até a query inicial viram status de erro
+            first = await anext(result.body, None)
+            headers = {"Content-Type": result.content_type, **result.headers}
+            return 200, headers, _prepend(first, result.body)
+        if isinstance(result, JSONResponse):
+            headers = {"Content-Type": "application/json", **result.headers}
+            return result.status_code, headers, result.body.encode("utf-8")
+    except ServiceError as e:
+        return _error(e.status_code, e.msg)
+    except Exception as e:
+        for exception_class, status in _EXCEPTION_STATUS:
+            if isinstance(e, exception_class):
+                return _error(status, e.message)
+
+        logger.exception(f"Error handling {method} {path}")
+        return _error(500, f"{error}: {str(e)}")
+
+    status = 200
+    if isinstance(result, tuple):
+        result, status = result
+
+    with timing.phase("serialize"):
+        payload = fast_json_dumps(result).encode("utf-8")
+    return status, {"Content-Type": "application/json"}, payload
+
+
+async def _prepend(first, body):
+    try:
+        if first is not None:
+            yield first
+        async for chunk in body:
+            yield chunk
+    finally:
+        await body.aclose()
+
+
+async def _read_body(receive, limit: int) -> bytes:
+    chunks = []
+    size = 0
+    more_body = True
+
+    while more_body:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            raise _PayloadTooLarge()
+        chunks.append(chunk)
+        more_body = message.get("more_body", False)
+
+    return b"".join(chunks)
+
+
+def _headers(scope) -> dict:
+    """Headers em minúsculas; repetidos são unidos por vírgula (como no HTTP API v2)"""
+
+    headers = {}
+    for name, value in scope["headers"]:
+        name = name.decode("latin-1").lower()
+        value = value.decode("latin-1")
+        headers[name] = f"{headers[name]},{value}" if name in headers else value
+    return headers
+
+
+def _query(scope) -> dict:
+    query = {}
+    for name, value in parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True):
+        query[name] = f"{query[name]},{value}" if name in query else value
+    return query
+
+
+def _to_event(scope, body: bytes) -> dict:
+    """Requisição ASGI -> evento API Gateway HTTP API v2"""
+
+    headers = _headers(scope)
+    client = scope.get("client") or ("127.0.0.1", 0)
+
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": scope["path"],
+        "rawQueryString": scope["query_string"].decode("latin-1"),
+        "cookies": [c.strip() for c in headers.get("cookie", "").split(";") if c.strip()] or None,
+        "headers": headers,
+        "queryStringParameters": _query(scope) or None,
+        "requestContext": {
+            "http": {
+                "method": scope["method"],
+                "path": scope["path"],
+                "protocol": f"HTTP/{scope.get('http_version', '1.1')}",
+                "sourceIp": client[0],
+                "userAgent": headers.get("user-agent", ""),
+            },
+            "requestId": str(uuid.uuid4()),
+            "stage": "$default",
+            "timeEpoch": int(time.time() * 1000),
+        },
+        "body": base64.b64encode(body).decode("ascii") if body else None,
+        "isBase64Encoded": bool(body),
+    }
+
+
+async def _resolve_sync(scope, body: bytes) -> tuple[int, dict, bytes]:
+    event = _to_event(scope, body)
+    loop = asyncio.get_running_loop()
+
+    try:
+        # copy_context: o thread do resolver enxerga os contadores desta requisição
+        context = contextvars.copy_context()
+        response = await loop.run_in_executor(_resolver_executor, context.run, resolver.resolve, event, None)
+    except Exception as e:
+        logger.exception("Unhandled exception in resolver")
+        return 500, {"Content-Type": "application/json"}, fast_json_dumps(
+            {"message": "Erro interno do servidor", "error": str(e)}
+        ).encode("utf-8")
+
+    payload = response.get("body") or ""
+    if response.get("isBase64Encoded"):
+        payload = base64.b64decode(payload)
+    else:
+        payload = payload.encode("utf-8")
+
+    headers = dict(response.get("headers") or {})
+    for cookie in response.get("cookies") or []:
+        headers.setdefault("Set-Cookie", [])
+        headers["Set-Cookie"].append(cookie)
+    return response["statusCode"], headers, payload
+
+
+def _error(status: int, message: str) -> tuple[int, dict, bytes]:
+    # Mesmo formato de erro do Powertools
+    payload = fast_json_dumps({"statusCode": status, "message": message}).encode("utf-8")
+    return status, {"Content-Type": "application/json"}, payload
+
+
+def _raw_headers(headers: dict) -> list:
+    raw_headers = []
+    for name, value in headers.items():
+        values = value if isinstance(value, list) else [value]
+        raw_headers.extend((name.lower().encode("latin-1"), str(v).encode("latin-1")) for v in values)
+    return raw_headers
+
+
+async def _send(send, status: int, headers: dict, payload: bytes) -> None:
+    raw_headers = [(b"content-length", str(len(payload)).encode("latin-1"))] + _raw_headers(headers)
+
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def _send_stream(send, status: int, headers: dict, chunks, compressor) -> None:
+    """Sem content-length: o servidor ASGI envia com Transfer-Encoding: chunked"""
+
+    await send({"type": "http.response.start", "status": status, "headers": _raw_headers(headers)})
+
+    buffer = []
+    size = 0
+    try:
+        async for chunk in chunks:
+            data = chunk.encode("utf-8")
+            buffer.append(data)
+            size += len(data)
+            if size >= _STREAM_CHUNK_BYTES:
+                await _send_chunk(send, b"".join(buffer), compressor)
+                buffer = []
+                size = 0
+    except Exception:
+        # Headers já enviados: só resta interromper a resposta (body incompleto)
+        logger.exception("Error streaming response")
+        raise
+
+    tail = b"".join(buffer)
+    if compressor is not None:
+        tail = compressor.compress(tail) + compressor.finish()
+    await send({"type": "http.response.body", "body": tail, "more_body": False})
+
+
+async def _send_chunk(send, data: bytes, compressor) -> None:
+    if compressor is not None:
+        data = compressor.compress(data)
+    if data:
+        await send({"type": "http.response.body", "body": data, "more_body": True})
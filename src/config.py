@@ -3,29 +3,26 @@ Configuration - Load secrets from SSM Parameter Store
 """
 
 import os
-import boto3
-from functools import lru_cache
-from aws_lambda_powertools import Logger
-
-logger = Logger(child=True)
-
-ssm = boto3.client("ssm")
-
-
-@lru_cache(maxsize=128)
-def get_ssm_parameter(parameter_name: str, with_decryption: bool = True) -> str:
-    """
-    Pegar parâmetro do SSM através no nome
-    """
-    try:
-        logger.info(f"Fetching SSM parameter: {parameter_name}")
-        response = ssm.get_parameter(
-            Name=parameter_name, WithDecryption=with_decryption
-        )
-        return response["Parameter"]["Value"]
-    except Exception as e:
-        logger.error(f"Error fetching SSM parameter {parameter_name}: {str(e)}")
-        raise
+from typing import Optional
+from parameter_store import ParameterStore
+
+# Env vars com os NOMES dos parâmetros no SSM (os valores vêm de um único GetParameters)
+SSM_PARAMETER_KEYS = (
+    "SSM_DB_HOST",
+    "SSM_DB_PORT",
+    "SSM_DB_NAME",
+    "SSM_DB_USER",
+    "SSM_DB_PASSWORD",
+    "SSM_JWT_SECRET",
+    "SSM_SECRET_KEY",
+    # Opcional: réplica de leitura (mesmas credenciais, porta e database)
+    "SSM_DB_REPLICA_HOST",
+)
+
+parameters = ParameterStore(
+    SSM_PARAMETER_KEYS,
+    ttl_seconds=float(os.getenv("SSM_CACHE_TTL_SECONDS", "300")),
+)
 
 
 class Config:
@@ -34,42 +31,121 @@ class Config:
     # Database configuration (from SSM)
     @property
     def DB_HOST(self) -> str:
-        return get_ssm_parameter(os.getenv("SSM_DB_HOST"))
+        return parameters.get("SSM_DB_HOST")
 
     @property
     def DB_PORT(self) -> str:
-        return get_ssm_parameter(os.getenv("SSM_DB_PORT"))
+        return parameters.get("SSM_DB_PORT")
 
     @property
     def DB_NAME(self) -> str:
-        return get_ssm_parameter(os.getenv("SSM_DB_NAME"))
+        return parameters.get("SSM_DB_NAME")
 
     @property
     def DB_USER(self) -> str:
-        return get_ssm_parameter(os.getenv("SSM_DB_USER"))
+        return parameters.get("SSM_DB_USER")
 
     @property
     def DB_PASSWORD(self) -> str:
-        return get_ssm_parameter(os.getenv("SSM_DB_PASSWORD"), with_decryption=True)
+        return parameters.get("SSM_DB_PASSWORD")
+
+    @property
+    def DB_REPLICA_HOST(self) -> Optional[str]:
+        """Host da réplica de leitura; None sem o parâmetro ou quando aponta para o primário"""
+        if not os.getenv("SSM_DB_REPLICA_HOST"):
+            return None
+        try:
+            host = parameters.get("SSM_DB_REPLICA_HOST")
+        except KeyError:
+            return None
+        return host if host and host != self.DB_HOST else None
 
     # Application secrets (from SSM)
     @property
     def JWT_SECRET_KEY(self) -> str:
-        return get_ssm_parameter(os.getenv("SSM_JWT_SECRET"), with_decryption=True)
+        return parameters.get("SSM_JWT_SECRET")
 
     @property
     def SECRET_KEY(self) -> str:
-        return get_ssm_parameter(os.getenv("SSM_SECRET_KEY"), with_decryption=True)
+        return parameters.get("SSM_SECRET_KEY")
 
     # Database URL
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    # Modo ASGI (container): mesmo banco via asyncpg
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    # Réplica de leitura (get_db(readonly=True)); só usadas com DB_REPLICA_HOST
+    @property
+    def REPLICA_DATABASE_URL(self) -> str:
+        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_REPLICA_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    @property
+    def ASYNC_REPLICA_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_REPLICA_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    # Depois de uma escrita, as leituras do mesmo usuário ficam no primário por
+    # esta janela (lag da réplica): por container e pelo marcador X-Last-Write
+    # que volta ao cliente (utils/read_your_writes.py)
+    DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+    # Connection pool (ver db_pool.py): single | null | pooled
+    DB_POOL_PROFILE = os.getenv("DB_POOL_PROFILE", "single").lower()
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))  # Recycle connections after 1 hour
+    # Ping (SELECT 1) só em conexões ociosas há mais que isso; 0 = pinga todo checkout
+    DB_PREPING_IDLE_SECONDS = float(os.getenv("DB_PREPING_IDLE_SECONDS", "30"))
+    # "true" atrás de PgBouncer em transaction mode (sem startup options / prepared statements)
+    DB_TRANSACTION_POOLER = os.getenv("DB_TRANSACTION_POOLER", "false").lower() == "true"
+    # Timeout para abrir a conexão TCP/TLS (host fora do ar não prende a Lambda até os 30s)
+    DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "3"))
+    # Depois de uma falha de conexão, a réplica é ignorada (leituras no primário) por este tempo
+    DB_REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+
+    # Cache de UsuarioResponse por id (services/usuario_cache.py)
+    USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+
+    # /health/ready: resultado do SELECT 1 reaproveitado por este tempo
+    HEALTH_PROBE_TTL_SECONDS = float(os.getenv("HEALTH_PROBE_TTL_SECONDS", "5"))
+    # ?deep=true só com o header X-Health-Token igual a este valor (vazio = desligado)
+    HEALTH_DEEP_TOKEN = os.getenv("HEALTH_DEEP_TOKEN", "")
+
+    # Idempotency-Key (utils/idempotency.py): resposta guardada por
+    # IDEMPOTENCY_TTL_SECONDS; a reserva da requisição em andamento expira em
+    # IDEMPOTENCY_LOCK_SECONDS (acima do timeout da Lambda, 30s)
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+    IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+
     # JWT Configuration
     JWT_ALGORITHM = "HS256"
     JWT_EXPIRATION_HOURS = 24
 
+    # Limite do corpo das requisições (checado antes do parse)
+    MAX_REQUEST_BODY_BYTES = int(os.getenv("MAX_REQUEST_BODY_BYTES", str(256 * 1024)))
+
+    # Batch endpoints (/tarefas/batch)
+    TAREFA_BATCH_MAX_SIZE = int(os.getenv("TAREFA_BATCH_MAX_SIZE", "500"))
+
+    # Exportação (/tarefas/export): linhas por fetch do cursor no servidor e
+    # tamanho máximo do body na Lambda (o restante continua via X-Next-Cursor)
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    EXPORT_MAX_BYTES = int(os.getenv("EXPORT_MAX_BYTES", str(4 * 1024 * 1024)))
+
+    # Importação (POST /tarefas/import): limite próprio de corpo (arquivos de
+    # onboarding), linhas por lote de validação / INSERT sem COPY e erros
+    # listados na resposta. O HTTP API entrega uploads não-texto (NDJSON) em
+    # base64, +33%: 4 MB viram ~5,4 MB, abaixo dos 6 MB do payload da Lambda
+    IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(4 * 1024 * 1024)))
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+
 
 # Singleton instance
 config = Config()
@@ -1,39 +1,240 @@
-from models import Base
+import time
 from contextlib import contextmanager
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, Session
 from aws_lambda_powertools import Logger
-from config import config
+from config import config, parameters
+import db_pool
+from utils import read_your_writes, sql_stats, timing
+from utils.ttl_cache import TTLCache
 
 logger = Logger(child=True)
 
-# Pool connection settings for better performance in Lambda environment
-# Reaproveita conexões anteriores para reduzir latência
-engine = create_engine(
-    config.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    echo=False,  # Set to True for SQL debugging
-    connect_args={"options": "-c client_encoding=utf8"},  # Ensure UTF-8 encoding
-)
+# Parâmetros SSM que entram na DATABASE_URL
+DB_PARAMETER_KEYS = {"SSM_DB_HOST", "SSM_DB_PORT", "SSM_DB_NAME", "SSM_DB_USER", "SSM_DB_PASSWORD"}
+# ... e na URL da réplica (o host do primário entra na comparação de DB_REPLICA_HOST)
+REPLICA_PARAMETER_KEYS = DB_PARAMETER_KEYS | {"SSM_DB_REPLICA_HOST"}
+
+
+def _create_engine(url: Optional[str] = None):
+    # Estratégia de pool conforme DB_POOL_PROFILE (Lambda, RDS Proxy, PgBouncer, container)
+    url = url or config.DATABASE_URL
+    engine = create_engine(url, **db_pool.engine_options(url))
+    db_pool.instrument(engine)
+    sql_stats.instrument(engine)
+    return engine
+
+
+# Engine criado na primeira sessão (não no import): rotas que não usam o banco
+# não pagam SSM + create_engine no cold start
+_engine = None
 
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Réplica de leitura: criada na primeira sessão readonly, se configurada
+_replica_engine = None
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# Usuários com escrita commitada neste container há menos de
+# DB_READ_YOUR_WRITES_SECONDS (entre containers, vale o marcador da requisição)
+_recent_writes = TTLCache(maxsize=10_000, ttl_seconds=config.DB_READ_YOUR_WRITES_SECONDS)
+
+# Circuit breaker da réplica: até este instante (time.monotonic) as leituras
+# vão direto ao primário, sem pagar o connect timeout a cada requisição
+_replica_skip_until = 0.0
+
+
+def get_engine():
+    global _engine
+
+    if _engine is None:
+        _engine = _create_engine()
+        SessionLocal.configure(bind=_engine)
+        logger.info("Database engine created")
+    return _engine
+
+
+def get_replica_engine():
+    """Engine da réplica de leitura, ou None sem SSM_DB_REPLICA_HOST"""
+
+    global _replica_engine
+
+    if _replica_engine is None and config.DB_REPLICA_HOST:
+        _replica_engine = _create_engine(config.REPLICA_DATABASE_URL)
+        ReplicaSessionLocal.configure(bind=_replica_engine)
+        logger.info("Replica database engine created")
+    return _replica_engine
+
+
+def record_write(usuario_id: str) -> None:
+    """
+    Leituras de usuario_id ficam no primário pelos próximos
+    DB_READ_YOUR_WRITES_SECONDS: neste container e, pelo marcador X-Last-Write
+    da resposta, nos demais
+    """
+    _recent_writes.set(usuario_id, True)
+    read_your_writes.record_write()
+
+
+def use_replica(readonly: bool, usuario_id: Optional[str]) -> bool:
+    """Sessão readonly, sem escrita recente do usuário (read-your-writes) e réplica sem falha recente"""
+    if not readonly or read_your_writes.recent_write() or time.monotonic() < _replica_skip_until:
+        return False
+    return usuario_id is None or _recent_writes.get(usuario_id) is None
+
+
+def mark_replica_unavailable(error: Exception) -> None:
+    """Falha ao conectar na réplica: leituras no primário pelos próximos DB_REPLICA_RETRY_SECONDS"""
+
+    global _replica_skip_until
+
+    _replica_skip_until = time.monotonic() + config.DB_REPLICA_RETRY_SECONDS
+    logger.warning(
+        f"Read replica unavailable, falling back to primary for {config.DB_REPLICA_RETRY_SECONDS:.0f}s: {str(error)}"
+    )
+
+
+def __getattr__(name):
+    # Compatibilidade com `from database import engine`
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def pool_stats() -> dict:
+    """Contadores de conexão deste container + estado atual do pool"""
+    snapshot = db_pool.stats.snapshot()
+    snapshot["profile"] = config.DB_POOL_PROFILE
+    if _engine is not None:
+        snapshot["pool"] = _engine.pool.status()
+    if _replica_engine is not None:
+        snapshot["replica_pool"] = _replica_engine.pool.status()
+    return snapshot
+
+
+def ping() -> float:
+    """SELECT 1 no primário (sem sessão ORM); retorna a latência em ms"""
+    started = time.perf_counter()
+    with get_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return (time.perf_counter() - started) * 1000
+
+
+def replication_lag_seconds() -> Optional[float]:
+    """
+    Atraso de replay da réplica em segundos (0 se já aplicou todo o WAL
+    recebido); None sem réplica ou fora do Postgres
+    """
+    engine = get_replica_engine()
+    if engine is None or engine.dialect.name != "postgresql":
+        return None
+
+    with engine.connect() as conn:
+        lag = conn.execute(
+            text(
+                "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+                " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+            )
+        ).scalar()
+    return float(lag) if lag is not None else None
+
+
+def rebuild_engine() -> None:
+    """Recria o engine (ex.: senha do banco rotacionada no SSM)"""
+
+    global _engine
+
+    if _engine is None:
+        return
+
+    old_engine = _engine
+    _engine = _create_engine()
+    SessionLocal.configure(bind=_engine)
+    # Sessões em andamento mantêm a conexão atual; o pool antigo é descartado
+    old_engine.dispose()
+    logger.info("Database engine rebuilt with new credentials")
+
+
+def drop_replica_engine() -> None:
+    """Descarta o engine da réplica; o próximo get_db(readonly=True) relê o host"""
+
+    global _replica_engine, _replica_skip_until
+
+    # Host novo: tenta de novo sem esperar o circuit breaker
+    _replica_skip_until = 0.0
+
+    if _replica_engine is None:
+        return
+
+    old_engine, _replica_engine = _replica_engine, None
+    old_engine.dispose()
+    logger.info("Replica database engine dropped")
+
+
+def _on_parameters_changed(changed: set[str]) -> None:
+    if changed & DB_PARAMETER_KEYS:
+        rebuild_engine()
+    if changed & REPLICA_PARAMETER_KEYS:
+        drop_replica_engine()
+
+
+parameters.subscribe(_on_parameters_changed)
+
+
+def _checkout(db: Session, target: str) -> None:
+    # Checkout explícito para medir espera no pool + connect + ping
+    started = time.perf_counter()
+    db.connection()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    db_pool.stats.record_checkout(elapsed_ms)
+    timing.record("db_acquire", elapsed_ms)
+    logger.debug(f"Database session created on {target} (checkout {elapsed_ms:.1f} ms)")
+
+
+def _open_session(readonly: bool, usuario_id: Optional[str]) -> Session:
+    get_engine()
+
+    if use_replica(readonly, usuario_id) and get_replica_engine() is not None:
+        db = ReplicaSessionLocal()
+        try:
+            _checkout(db, "replica")
+            return db
+        except OperationalError as e:
+            # Réplica fora do ar não derruba as leituras: cai no primário
+            db.close()
+            mark_replica_unavailable(e)
+
+    db = SessionLocal()
+    try:
+        _checkout(db, "primary")
+    except Exception as e:
+        logger.error(f"Database error: {str(e)}")
+        db.close()
+        raise
+    return db
 
 
 @contextmanager
-def get_db() -> Session:
+def get_db(readonly: bool = False, usuario_id: Optional[str] = None) -> Session:
     """
     Para usar:
         with get_db() as db:
             user = db.query(Usuario).first()
+
+    readonly=True lê da réplica (se configurada), exceto para um usuario_id
+    que escreveu há menos de DB_READ_YOUR_WRITES_SECONDS. Em sessões de
+    escrita, usuario_id abre essa janela após o commit.
     """
-    db = SessionLocal()
+    db = _open_session(readonly, usuario_id)
     try:
-        logger.debug("Database session created")
         yield db
         db.commit()
         logger.debug("Database session committed")
+        if usuario_id and not readonly:
+            record_write(usuario_id)
     except Exception as e:
         logger.error(f"Database error: {str(e)}")
         db.rollback()
@@ -44,8 +245,30 @@ def get_db() -> Session:
 
 
 def init_db():
-    """Inicializa o database (create tables)"""
+    """Aplica as migrations pendentes (deploy / desenvolvimento local)"""
+
+    from migrations import upgrade
+
+    logger.info("Running database migrations...")
+    upgrade(get_engine())
+    logger.info("Database migrations applied successfully")
+
+
+def check_schema_version() -> bool:
+    """
+    Confere (um único SELECT) se o schema está na versão esperada pelo código.
+    Não aplica nada: migrations rodam no deploy via `python -m migrations upgrade`.
+    """
+
+    from migrations import current_version, head_version
+
+    with get_engine().connect() as conn:
+        current = current_version(conn)
+
+    expected = head_version()
+    if current < expected:
+        logger.warning(f"Database schema outdated: version {current}, expected {expected}")
+        return False
 
-    logger.info("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created successfully")
+    logger.info(f"Database schema at version {current}")
+    return True
@@ -0,0 +1,150 @@
+"""
+Async database - SQLAlchemy asyncio engine (asyncpg) for the ASGI container mode
+"""
+
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from aws_lambda_powertools import Logger
+from config import config, parameters
+from database import DB_PARAMETER_KEYS, REPLICA_PARAMETER_KEYS, mark_replica_unavailable, record_write, use_replica
+import db_pool
+from utils import sql_stats, timing
+
+logger = Logger(child=True)
+
+# Engines criados na primeira sessão, como em database.py
+_engine = None
+_replica_engine = None
+
+# Engine substituído por rotação de senha, descartado na próxima sessão
+# (dispose é async e o callback do SSM não roda no event loop)
+_retired_engines = []
+
+# expire_on_commit=False: atributos não são recarregados (IO implícito) após o commit
+AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+AsyncReplicaSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+
+
+def _create_async_engine(url: str):
+    engine = create_async_engine(url, **db_pool.engine_options(url, is_async=True))
+    db_pool.instrument(engine.sync_engine)
+    sql_stats.instrument(engine.sync_engine)
+    return engine
+
+
+def get_async_engine():
+    global _engine
+
+    if _engine is None:
+        _engine = _create_async_engine(config.ASYNC_DATABASE_URL)
+        AsyncSessionLocal.configure(bind=_engine)
+        logger.info("Async database engine created")
+    return _engine
+
+
+def get_async_replica_engine():
+    """Engine da réplica de leitura, ou None sem SSM_DB_REPLICA_HOST"""
+
+    global _replica_engine
+
+    if _replica_engine is None and config.DB_REPLICA_HOST:
+        _replica_engine = _create_async_engine(config.ASYNC_REPLICA_DATABASE_URL)
+        AsyncReplicaSessionLocal.configure(bind=_replica_engine)
+        logger.info("Async replica database engine created")
+    return _replica_engine
+
+
+def _on_parameters_changed(changed: set[str]) -> None:
+    global _engine, _replica_engine
+
+    if changed & DB_PARAMETER_KEYS and _engine is not None:
+        _retired_engines.append(_engine)
+        _engine = None
+        logger.info("Async database engine will be rebuilt with new credentials")
+
+    if changed & REPLICA_PARAMETER_KEYS and _replica_engine is not None:
+        _retired_engines.append(_replica_engine)
+        _replica_engine = None
+        logger.info("Async replica database engine will be rebuilt")
+
+
+parameters.subscribe(_on_parameters_changed)
+
+
+async def dispose_async_engine() -> None:
+    """Fecha os pools (shutdown do servidor ASGI)"""
+
+    global _engine, _replica_engine
+
+    while _retired_engines:
+        await _retired_engines.pop().dispose()
+
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+    if _replica_engine is not None:
+        await _replica_engine.dispose()
+        _replica_engine = None
+
+
+async def _checkout(db: AsyncSession, target: str) -> None:
+    started = time.perf_counter()
+    await db.connection()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    db_pool.stats.record_checkout(elapsed_ms)
+    timing.record("db_acquire", elapsed_ms)
+    logger.debug(f"Async database session created on {target} (checkout {elapsed_ms:.1f} ms)")
+
+
+async def _open_session(readonly: bool, usuario_id: Optional[str]) -> AsyncSession:
+    while _retired_engines:
+        await _retired_engines.pop().dispose()
+
+    get_async_engine()
+
+    if use_replica(readonly, usuario_id) and get_async_replica_engine() is not None:
+        db = AsyncReplicaSessionLocal()
+        try:
+            await _checkout(db, "replica")
+            return db
+        except OperationalError as e:
+            await db.close()
+            mark_replica_unavailable(e)
+
+    db = AsyncSessionLocal()
+    try:
+        await _checkout(db, "primary")
+    except Exception as e:
+        logger.error(f"Database error: {str(e)}")
+        await db.close()
+        raise
+    return db
+
+
+@asynccontextmanager
+async def get_async_db(readonly: bool = False, usuario_id: Optional[str] = None) -> AsyncSession:
+    """
+    Para usar:
+        async with get_async_db() as db:
+            usuario = (await db.scalars(select(Usuario))).first()
+
+    readonly e usuario_id como em database.get_db (réplica + read-your-writes).
+    """
+    db = await _open_session(readonly, usuario_id)
+    try:
+        yield db
+        await db.commit()
+        logger.debug("Async database session committed")
+        if usuario_id and not readonly:
+            record_write(usuario_id)
+    except Exception as e:
+        logger.error(f"Database error: {str(e)}")
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+        logger.debug("Async database session closed")
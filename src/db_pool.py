@@ -0,0 +1,189 @@
+"""
+Database pool profiles - connection strategy per deployment, with connect/checkout/ping timings
+"""
+
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+import uuid
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from aws_lambda_powertools import Logger
+from config import config
+
+logger = Logger(child=True)
+
+# single:  1 conexão persistente por container (Lambda atende uma requisição por vez)
+# null:    conecta/desconecta a cada sessão (RDS Proxy guarda as conexões por nós)
+# pooled:  QueuePool com DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW (container de longa duração)
+POOL_PROFILES = ("single", "null", "pooled")
+
+
+class PoolStats:
+    """Contadores do pool deste container (para dimensionar max_connections no RDS)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.connects = 0
+        self.connect_ms_total = 0.0
+        self.connect_ms_max = 0.0
+        self.checkouts = 0
+        self.checkout_ms_total = 0.0
+        self.checkout_ms_max = 0.0
+        self.pings = 0
+        self.ping_ms_total = 0.0
+        self.ping_failures = 0
+        self.checked_out = 0
+        self.checked_out_peak = 0
+
+    def record_connect(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.connects += 1
+            self.connect_ms_total += elapsed_ms
+            self.connect_ms_max = max(self.connect_ms_max, elapsed_ms)
+
+    def record_checkout(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_ms_total += elapsed_ms
+            self.checkout_ms_max = max(self.checkout_ms_max, elapsed_ms)
+
+    def record_ping(self, elapsed_ms: float, ok: bool) -> None:
+        with self._lock:
+            self.pings += 1
+            self.ping_ms_total += elapsed_ms
+            if not ok:
+                self.ping_failures += 1
+
+    def checked_out_changed(self, delta: int) -> None:
+        with self._lock:
+            self.checked_out += delta
+            self.checked_out_peak = max(self.checked_out_peak, self.checked_out)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "connect_ms_avg": round(self.connect_ms_total / self.connects, 2) if self.connects else 0.0,
+                "connect_ms_max": round(self.connect_ms_max, 2),
+                "checkouts": self.checkouts,
+                "checkout_ms_avg": round(self.checkout_ms_total / self.checkouts, 2) if self.checkouts else 0.0,
+                "checkout_ms_max": round(self.checkout_ms_max, 2),
+                "pings": self.pings,
+                "ping_ms_avg": round(self.ping_ms_total / self.pings, 2) if self.pings else 0.0,
+                "ping_failures": self.ping_failures,
+                "checked_out": self.checked_out,
+                "checked_out_peak": self.checked_out_peak,
+            }
+
+
+# Singleton por container (sobrevive a rebuild_engine)
+stats = PoolStats()
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """kwargs de create_engine / create_async_engine para o DB_POOL_PROFILE configurado"""
+
+    profile = config.DB_POOL_PROFILE
+    if profile not in POOL_PROFILES:
+        raise ValueError(f"DB_POOL_PROFILE inválido: {profile} (use {', '.join(POOL_PROFILES)})")
+
+    options = {"echo": False}  # Set to True for SQL debugging
+
+    if profile == "null":
+        options["poolclass"] = NullPool
+    else:
+        single = profile == "single"
+        options.update(
+            poolclass=AsyncAdaptedQueuePool if is_async else QueuePool,
+            pool_size=1 if single else config.DB_POOL_SIZE,
+            max_overflow=0 if single else config.DB_POOL_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            # Lambda: a conexão é devolvida ao fim de cada requisição, então
+            # LIFO mantém sempre a mesma (quente) no topo
+            pool_use_lifo=True,
+        )
+
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql":
+        return options
+
+    if parsed.get_driver_name() == "asyncpg":
+        connect_args = {"server_settings": {"client_encoding": "utf8"}, "timeout": config.DB_CONNECT_TIMEOUT}
+        if config.DB_TRANSACTION_POOLER:
+            # asyncpg prepara todo statement: sem cache e com nomes únicos, para
+            # não colidir quando o PgBouncer troca a conexão do servidor
+            connect_args.update(
+                statement_cache_size=0,
+                prepared_statement_cache_size=0,
+                prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+            )
+        options["connect_args"] = connect_args
+    elif config.DB_TRANSACTION_POOLER:
+        # PgBouncer em transaction mode recusa o startup parameter "options"
+        # e não garante a mesma sessão entre transações: só client_encoding
+        options["connect_args"] = {"client_encoding": "utf8", "connect_timeout": config.DB_CONNECT_TIMEOUT}
+    else:
+        options["connect_args"] = {
+            "options": "-c client_encoding=utf8",  # Ensure UTF-8 encoding
+            "connect_timeout": config.DB_CONNECT_TIMEOUT,
+        }
+
+    return options
+
+
+def instrument(engine) -> None:
+    """
+    Mede connect, checkout e ping, e troca o pool_pre_ping (SELECT 1 a cada
+    checkout) por um ping só quando a conexão ficou ociosa mais que
+    DB_PREPING_IDLE_SECONDS (0 = pinga sempre).
+    """
+
+    idle_threshold = config.DB_PREPING_IDLE_SECONDS
+
+    @event.listens_for(engine, "do_connect")
+    def _before_connect(dialect, connection_record, cargs, cparams):
+        connection_record.info["connect_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        started = connection_record.info.pop("connect_started", None)
+        connection_record.info["checked_in_at"] = time.monotonic()
+        # Conexão recém-aberta não precisa de ping no primeiro checkout
+        connection_record.info["fresh"] = True
+        if started is None:
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats.record_connect(elapsed_ms)
+        logger.info(
+            "Database connection opened",
+            extra={"connect_ms": round(elapsed_ms, 2), "connects": stats.connects, "pool_profile": config.DB_POOL_PROFILE},
+        )
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        fresh = connection_record.info.pop("fresh", False)
+        idle = time.monotonic() - connection_record.info.get("checked_in_at", time.monotonic())
+
+        if not fresh and (idle_threshold == 0 or idle >= idle_threshold):
+            started = time.perf_counter()
+            try:
+                engine.dialect.do_ping(dbapi_connection)
+            except Exception as e:
+                stats.record_ping((time.perf_counter() - started) * 1000, ok=False)
+                logger.warning(f"Stale database connection after {idle:.0f}s idle, reconnecting: {str(e)}")
+                # O pool invalida a conexão e tenta outra
+                raise exc.DisconnectionError() from e
+            stats.record_ping((time.perf_counter() - started) * 1000, ok=True)
+
+        stats.checked_out_changed(+1)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+        stats.checked_out_changed(-1)
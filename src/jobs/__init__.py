@@ -0,0 +1,3 @@
+"""
+Jobs package - Maintenance tasks run outside the API (deploy, cron)
+"""
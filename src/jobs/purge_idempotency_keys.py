@@ -0,0 +1,43 @@
+"""
+Limpeza dos registros vencidos de idempotency_key
+
+Reservas abandonadas e respostas além de IDEMPOTENCY_TTL_SECONDS já são
+ignoradas pelas rotas; o job só devolve o espaço. Uso (a partir de src/, com
+as variáveis SSM_* do ambiente exportadas):
+    python -m jobs.purge_idempotency_keys
+    python -m jobs.purge_idempotency_keys --batch-size 5000
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from aws_lambda_powertools import Logger
+
+from database import engine
+from services.idempotency_store import purge_expired
+
+logger = Logger(child=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jobs.purge_idempotency_keys")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Registros removidos por transação")
+    args = parser.parse_args(argv)
+
+    now = datetime.utcnow()
+    total = 0
+    while True:
+        # Uma transação por lote: cada DELETE trava poucas linhas por pouco tempo
+        with engine.begin() as conn:
+            deleted = purge_expired(conn, args.batch_size, now)
+        total += deleted
+        if deleted < args.batch_size:
+            break
+
+    logger.info("Idempotency keys purged", extra={"deleted": total})
+    print(f"Registros de idempotência removidos: {total}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
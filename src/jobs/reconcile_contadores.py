@@ -0,0 +1,105 @@
+"""
+Reconciliação de tarefa_contador com a contagem real das tarefas
+
+Uso (a partir de src/, com as variáveis SSM_* do ambiente exportadas):
+    python -m jobs.reconcile_contadores          # só verifica (exit code 1 se houver divergência)
+    python -m jobs.reconcile_contadores --fix    # regrava os totais dos usuários divergentes
+"""
+
+import argparse
+import sys
+from sqlalchemy import func, select
+from aws_lambda_powertools import Logger
+
+from database import engine
+from models import Tarefa, TarefaContador
+from services import tarefa_counters
+
+logger = Logger(child=True)
+
+
+def find_drift(conn) -> dict[str, dict]:
+    """
+    Compara os contadores com um GROUP BY na tarefa
+
+    Returns:
+        usuario_id -> {status: (contador, real)} só com os status divergentes
+    """
+    actual = {
+        (usuario_id, status): total
+        for usuario_id, status, total in conn.execute(
+            select(Tarefa.criado_por, Tarefa.status, func.count()).group_by(Tarefa.criado_por, Tarefa.status)
+        )
+    }
+    counters = {
+        (usuario_id, status): total
+        for usuario_id, status, total in conn.execute(
+            select(TarefaContador.usuario_id, TarefaContador.status, TarefaContador.total)
+        )
+    }
+
+    drift: dict[str, dict] = {}
+    for key in actual.keys() | counters.keys():
+        counted, real = counters.get(key, 0), actual.get(key, 0)
+        if counted != real:
+            usuario_id, status = key
+            drift.setdefault(usuario_id, {})[status] = (counted, real)
+    return drift
+
+
+def fix_user(usuario_id: str) -> None:
+    """Recalcula os totais do usuário em uma transação, com os contadores travados"""
+
+    with engine.begin() as conn:
+        # FOR UPDATE: escritas do usuário em andamento esperam o fim da transação
+        # e somam o delta delas sobre o total recalculado
+        conn.execute(
+            select(TarefaContador.status).where(TarefaContador.usuario_id == usuario_id).with_for_update()
+        ).all()
+
+        totals = dict(
+            conn.execute(
+                select(Tarefa.status, func.count())
+                .where(Tarefa.criado_por == usuario_id)
+                .group_by(Tarefa.status)
+            ).all()
+        )
+        conn.execute(tarefa_counters.reset_statement(conn.dialect.name, usuario_id, totals))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jobs.reconcile_contadores")
+    parser.add_argument("--fix", action="store_true", help="Corrige os contadores divergentes")
+    args = parser.parse_args(argv)
+
+    with engine.connect() as conn:
+        drift = find_drift(conn)
+
+    for usuario_id, statuses in drift.items():
+        logger.warning(
+            "Tarefa counters drift",
+            extra={
+                "usuario_id": usuario_id,
+                "drift": {
+                    status.value: {"contador": counted, "real": real}
+                    for status, (counted, real) in statuses.items()
+                },
+            },
+        )
+
+    if not drift:
+        print("Contadores consistentes")
+        return 0
+
+    if not args.fix:
+        print(f"Usuários com contadores divergentes: {len(drift)} (use --fix para corrigir)")
+        return 1
+
+    for usuario_id in drift:
+        fix_user(usuario_id)
+    print(f"Contadores corrigidos para {len(drift)} usuário(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+Migrations package - Versioned schema migrations
+"""
+
+from .runner import (
+    current_version,
+    head_version,
+    list_migrations,
+    upgrade,
+)
+
+__all__ = ["current_version", "head_version", "list_migrations", "upgrade"]
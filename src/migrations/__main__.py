@@ -0,0 +1,40 @@
+"""
+Deploy-time migration runner
+
+Uso (a partir de src/, com as variáveis SSM_* do ambiente exportadas):
+    python -m migrations upgrade
+    python -m migrations upgrade --target 2
+    python -m migrations current
+"""
+
+import argparse
+import sys
+
+from database import engine
+from migrations import current_version, head_version, upgrade
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    upgrade_parser = sub.add_parser("upgrade", help="Aplica migrations pendentes")
+    upgrade_parser.add_argument("--target", type=int, default=None)
+
+    sub.add_parser("current", help="Mostra a versão atual do schema")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "upgrade":
+        applied = upgrade(engine, target=args.target)
+        print(f"Migrations aplicadas: {applied or 'nenhuma'}")
+        return 0
+
+    with engine.connect() as conn:
+        current = current_version(conn)
+    print(f"Versão atual: {current} (head: {head_version()})")
+    return 0 if current == head_version() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Migration runner - applies versions/ scripts and tracks them in schema_version
+"""
+
+import importlib
+import pkgutil
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from aws_lambda_powertools import Logger
+
+from . import versions
+
+logger = Logger(child=True)
+
+_MODULE_NAME = re.compile(r"^v(\d{4})_\w+$")
+
+# Chave fixa do advisory lock (evita dois deploys migrando ao mesmo tempo)
+_ADVISORY_LOCK_KEY = 7_340_001
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    module_name: str
+
+    def load(self):
+        return importlib.import_module(f"{versions.__name__}.{self.module_name}")
+
+
+def list_migrations() -> list[Migration]:
+    """Discover migration modules without importing them"""
+    found = []
+    for module in pkgutil.iter_modules(versions.__path__):
+        match = _MODULE_NAME.match(module.name)
+        if match:
+            found.append(Migration(int(match.group(1)), module.name))
+
+    found.sort(key=lambda m: m.version)
+    versions_seen = [m.version for m in found]
+    if len(versions_seen) != len(set(versions_seen)):
+        raise RuntimeError(f"Duplicated migration versions: {versions_seen}")
+    return found
+
+
+def head_version() -> int:
+    """Latest version shipped with this code"""
+    migrations = list_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(conn: Connection) -> int:
+    """Latest version applied to the database (0 if never migrated)"""
+    if not inspect(conn).has_table(schema_version.name):
+        return 0
+    return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> list[int]:
+    """
+    Apply pending migrations, each one in its own transaction
+
+    Args:
+        engine: Engine connected to the target database
+        target: Stop after this version (default: head)
+
+    Returns:
+        Versions applied by this call
+    """
+    applied = []
+
+    with engine.begin() as conn:
+        schema_version.create(conn, checkfirst=True)
+
+    for migration in list_migrations():
+        if target is not None and migration.version > target:
+            break
+
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.execute(
+                    text("SELECT pg_advisory_xact_lock(:key)"),
+                    {"key": _ADVISORY_LOCK_KEY},
+                )
+
+            if current_version(conn) >= migration.version:
+                continue
+
+            module = migration.load()
+            description = (module.__doc__ or migration.module_name).strip().splitlines()[0]
+
+            logger.info(f"Applying migration {migration.version}: {description}")
+            module.upgrade(conn)
+
+            conn.execute(
+                schema_version.insert().values(
+                    version=migration.version,
+                    description=description[:200],
+                    applied_at=datetime.utcnow(),
+                )
+            )
+            applied.append(migration.version)
+
+    logger.info(f"Migrations applied: {applied}")
+    return applied
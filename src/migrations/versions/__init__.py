@@ -0,0 +1,5 @@
+"""
+Migration scripts - one module per version, named v<NNNN>_<slug>.py
+
+Each module exposes upgrade(conn) and a one-line docstring used as description.
+"""
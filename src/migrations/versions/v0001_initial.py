@@ -0,0 +1,57 @@
+"""
+Initial schema - usuario and tarefa tables
+
+Tabelas congeladas aqui (e não importadas de models/) para que a migration
+continue reproduzindo o schema da versão 1 mesmo quando os models mudarem.
+checkfirst mantém a migration idempotente em bancos criados pelo antigo
+Base.metadata.create_all.
+"""
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+usuario = Table(
+    "usuario",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("nome", String(100), nullable=False),
+    Column("email", String(255), unique=True, nullable=False, index=True),
+    Column("senha_hash", String(255), nullable=False),
+    Column("data_criacao", DateTime, nullable=False),
+    Column("data_atualizacao", DateTime, nullable=False),
+)
+
+tarefa = Table(
+    "tarefa",
+    metadata,
+    Column("id", String(36), primary_key=True),
+    Column("titulo", String(200), nullable=False),
+    Column("descricao", Text, nullable=True),
+    Column(
+        "status",
+        Enum("PENDENTE", "EM_ANDAMENTO", "CONCLUIDA", name="statustarefa"),
+        nullable=False,
+    ),
+    Column(
+        "criado_por",
+        String(36),
+        ForeignKey("usuario.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    ),
+    Column(
+        "atualizado_por",
+        String(36),
+        ForeignKey("usuario.id", ondelete="SET NULL"),
+        nullable=True,
+    ),
+    Column("data_criacao", DateTime, nullable=False),
+    Column("data_atualizacao", DateTime, nullable=False),
+    Column("data_conclusao", DateTime, nullable=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(conn, checkfirst=True)
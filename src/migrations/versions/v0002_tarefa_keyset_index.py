@@ -0,0 +1,15 @@
+"""
+Composite index for keyset pagination on tarefa (criado_por, data_criacao, id)
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_tarefa_criado_por_data_criacao_id "
+            "ON tarefa (criado_por, data_criacao, id)"
+        )
+    )
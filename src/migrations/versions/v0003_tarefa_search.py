@@ -0,0 +1,57 @@
+"""
+Full-text search on tarefa (titulo, descricao)
+
+Postgres: coluna gerada busca_vetor (tsvector, stemming em português, titulo
+com peso A e descricao com peso B) com índice GIN, mais índices de trigramas
+(pg_trgm) para buscas parciais com ILIKE.
+
+SQLite (desenvolvimento local): tabela FTS5 tarefa_fts com conteúdo externo,
+mantida por triggers.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+_POSTGRES = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE tarefa ADD COLUMN IF NOT EXISTS busca_vetor tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('portuguese', coalesce(titulo, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce(descricao, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_tarefa_busca_vetor ON tarefa USING gin (busca_vetor)",
+    "CREATE INDEX IF NOT EXISTS ix_tarefa_titulo_trgm ON tarefa USING gin (titulo gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_tarefa_descricao_trgm ON tarefa USING gin (descricao gin_trgm_ops)",
+)
+
+_SQLITE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tarefa_fts USING fts5("
+    "titulo, descricao, content='tarefa', content_rowid='rowid', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tarefa_fts_ai AFTER INSERT ON tarefa BEGIN "
+    "INSERT INTO tarefa_fts (rowid, titulo, descricao) VALUES (new.rowid, new.titulo, new.descricao); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS tarefa_fts_ad AFTER DELETE ON tarefa BEGIN "
+    "INSERT INTO tarefa_fts (tarefa_fts, rowid, titulo, descricao) "
+    "VALUES ('delete', old.rowid, old.titulo, old.descricao); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS tarefa_fts_au AFTER UPDATE OF titulo, descricao ON tarefa BEGIN "
+    "INSERT INTO tarefa_fts (tarefa_fts, rowid, titulo, descricao) "
+    "VALUES ('delete', old.rowid, old.titulo, old.descricao); "
+    "INSERT INTO tarefa_fts (rowid, titulo, descricao) VALUES (new.rowid, new.titulo, new.descricao); "
+    "END",
+    # Indexa as tarefas que já existiam
+    "INSERT INTO tarefa_fts (tarefa_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        statements = _POSTGRES
+    elif conn.dialect.name == "sqlite":
+        statements = _SQLITE
+    else:
+        return
+
+    for statement in statements:
+        conn.execute(text(statement))
@@ -0,0 +1,44 @@
+"""
+Per-user tarefa counters by status (tarefa_contador) with backfill
+
+Tabela congelada aqui, como na migration 1. O backfill conta as tarefas
+existentes; escritas feitas por código antigo entre o backfill e o deploy
+são corrigidas pelo job de reconciliação (python -m jobs.reconcile_contadores).
+"""
+
+from sqlalchemy import Column, Enum, ForeignKey, Integer, MetaData, String, Table, text
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+# Tabelas referenciadas só para a FK (não são criadas aqui)
+Table("usuario", metadata, Column("id", String(36), primary_key=True))
+
+tarefa_contador = Table(
+    "tarefa_contador",
+    metadata,
+    Column(
+        "usuario_id",
+        String(36),
+        ForeignKey("usuario.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "status",
+        Enum("PENDENTE", "EM_ANDAMENTO", "CONCLUIDA", name="statustarefa"),
+        primary_key=True,
+    ),
+    Column("total", Integer, nullable=False),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    tarefa_contador.create(conn, checkfirst=True)
+
+    conn.execute(text("DELETE FROM tarefa_contador"))
+    conn.execute(
+        text(
+            "INSERT INTO tarefa_contador (usuario_id, status, total) "
+            "SELECT criado_por, status, COUNT(*) FROM tarefa GROUP BY criado_por, status"
+        )
+    )
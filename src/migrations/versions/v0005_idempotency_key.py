@@ -0,0 +1,26 @@
+"""
+Stored responses for Idempotency-Key (idempotency_key)
+
+Tabela congelada aqui, como na migration 1. Linhas vencidas são removidas por
+python -m jobs.purge_idempotency_keys (e substituídas quando a chave é reusada).
+"""
+
+from sqlalchemy import Column, DateTime, Index, MetaData, SmallInteger, String, Table, Text
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+idempotency_key = Table(
+    "idempotency_key",
+    metadata,
+    Column("id", String(64), primary_key=True),
+    Column("request_hash", String(64), nullable=False),
+    Column("status_code", SmallInteger, nullable=True),
+    Column("response_body", Text, nullable=True),
+    Column("expires_at", DateTime, nullable=False),
+    Index("ix_idempotency_key_expires_at", "expires_at"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    idempotency_key.create(conn, checkfirst=True)
@@ -0,0 +1,55 @@
+"""
+Native uuid columns for usuario/tarefa ids and their foreign keys
+
+Postgres: varchar(36) -> uuid (16 bytes) em usuario.id, tarefa.id,
+tarefa.criado_por, tarefa.atualizado_por e tarefa_contador.usuario_id. Os
+valores existentes (UUID4 em texto) são convertidos com ::uuid; IDs novos são
+UUIDv7 gerados pela aplicação. As FKs para usuario são removidas e recriadas
+em volta da conversão (as duas pontas precisam ter o mesmo tipo), e os índices
+são reconstruídos pelo próprio ALTER COLUMN TYPE.
+
+SQLite (desenvolvimento local) continua com texto: nada a fazer.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+# (tabela, coluna) convertidas, na ordem do ALTER
+_COLUMNS = (
+    ("usuario", "id"),
+    ("tarefa", "id"),
+    ("tarefa", "criado_por"),
+    ("tarefa", "atualizado_por"),
+    ("tarefa_contador", "usuario_id"),
+)
+
+# FKs recriadas após a conversão: (tabela, coluna, ON DELETE)
+_FOREIGN_KEYS = (
+    ("tarefa", "criado_por", "CASCADE"),
+    ("tarefa", "atualizado_por", "SET NULL"),
+    ("tarefa_contador", "usuario_id", "CASCADE"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+
+    inspector = inspect(conn)
+
+    # Nomes gerados pelo banco na migration 1/4 (sem naming convention)
+    for table in {table for table, _, _ in _FOREIGN_KEYS}:
+        for foreign_key in inspector.get_foreign_keys(table):
+            if foreign_key["referred_table"] == "usuario":
+                conn.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT "{foreign_key["name"]}"'))
+
+    for table, column in _COLUMNS:
+        conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE uuid USING {column}::uuid"))
+
+    for table, column, on_delete in _FOREIGN_KEYS:
+        conn.execute(
+            text(
+                f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_fkey "
+                f"FOREIGN KEY ({column}) REFERENCES usuario (id) ON DELETE {on_delete}"
+            )
+        )
@@ -5,5 +5,7 @@ Models package
 from .base import Base
 from .usuario import Usuario
 from .tarefa import Tarefa, StatusTarefa
+from .tarefa_contador import TarefaContador
+from .idempotency_key import IdempotencyKey
 
-__all__ = ["Base", "Usuario", "Tarefa", "StatusTarefa"]
+__all__ = ["Base", "Usuario", "Tarefa", "StatusTarefa", "TarefaContador", "IdempotencyKey"]
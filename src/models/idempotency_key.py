@@ -0,0 +1,28 @@
+"""
+IdempotencyKey ORM Model
+"""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Text, DateTime, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+
+
+class IdempotencyKey(Base):
+    """Resposta guardada de uma escrita com header Idempotency-Key"""
+
+    __tablename__ = "idempotency_key"
+
+    # Primary Key: sha256 (hex) do usuário + Idempotency-Key, tamanho fixo
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    # Fields
+    # sha256 de método, path, query e body: a mesma chave com outro corpo é recusada
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # NULL enquanto a requisição original está em andamento
+    status_code: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    response_body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Timestamps
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
@@ -0,0 +1,68 @@
+"""
+Primary key helpers - time-ordered UUIDv7 ids and the UUID column type
+"""
+
+import secrets
+import threading
+import time
+import uuid
+from typing import Optional
+from sqlalchemy import String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    UUIDv7 (RFC 9562): 48 bits de timestamp em ms + 74 bits aleatórios.
+    IDs gerados em sequência crescem (contador de 12 bits no mesmo ms), então
+    os INSERTs entram no fim do índice da chave primária.
+    """
+    global _last_ms, _counter
+
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            # Semente aleatória com folga para ~2000 IDs no mesmo ms
+            _last_ms, _counter = ms, secrets.randbits(11)
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms, _counter = _last_ms + 1, 0
+        ms, counter = _last_ms, _counter
+
+    value = (ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | secrets.randbits(62)
+    return uuid.UUID(int=value)
+
+
+def new_id() -> str:
+    return str(uuid7())
+
+
+class UUIDString(TypeDecorator):
+    """
+    UUID nativo no Postgres (16 bytes), String(36) nos demais bancos; em
+    Python o valor é sempre a string canônica. No Postgres, um valor que não é
+    UUID (ex.: id inválido na URL) vira NULL no parâmetro e não casa com
+    nenhuma linha, em vez de erro de sintaxe do banco.
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect) -> Optional[str]:
+        if value is None or dialect.name != "postgresql":
+            return value
+        try:
+            return str(uuid.UUID(str(value)))
+        except ValueError:
+            return None
@@ -1,9 +1,9 @@
-import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base
+from .ids import UUIDString, new_id
 
 
 class StatusTarefa(str, PyEnum):
@@ -14,11 +14,18 @@ class StatusTarefa(str, PyEnum):
 
 class Tarefa(Base):
     __tablename__ = "tarefa"
+    __table_args__ = (
+        # Keyset pagination: WHERE criado_por = ? AND (data_criacao, id) < (?, ?)
+        Index(
+            "ix_tarefa_criado_por_data_criacao_id",
+            "criado_por",
+            "data_criacao",
+            "id",
+        ),
+    )
 
     # Primary Key
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_id)
 
     # Fields
     titulo: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -29,13 +36,13 @@ class Tarefa(Base):
 
     # Foreign Keys
     criado_por: Mapped[str] = mapped_column(
-        String(36),
+        UUIDString,
         ForeignKey("usuario.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
     atualizado_por: Mapped[str] = mapped_column(
-        String(36), ForeignKey("usuario.id", ondelete="SET NULL"), nullable=True
+        UUIDString, ForeignKey("usuario.id", ondelete="SET NULL"), nullable=True
     )
 
     # Timestamps
@@ -0,0 +1,26 @@
+"""
+TarefaContador ORM Model
+"""
+
+from sqlalchemy import ForeignKey, Enum, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+from .ids import UUIDString
+from .tarefa import StatusTarefa
+
+
+class TarefaContador(Base):
+    """Total de tarefas por (usuário, status), atualizado na mesma transação das escritas"""
+
+    __tablename__ = "tarefa_contador"
+
+    # Primary Key
+    usuario_id: Mapped[str] = mapped_column(
+        UUIDString,
+        ForeignKey("usuario.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    status: Mapped[StatusTarefa] = mapped_column(Enum(StatusTarefa), primary_key=True)
+
+    # Fields
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -2,20 +2,18 @@
 Usuario ORM Model
 """
 
-import uuid
 from datetime import datetime
 from sqlalchemy import String, DateTime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base
+from .ids import UUIDString, new_id
 
 
 class Usuario(Base):
     __tablename__ = "usuario"
 
     # Primary Key
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_id)
 
     # Fields
     nome: Mapped[str] = mapped_column(String(100), nullable=False)
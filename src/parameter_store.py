@@ -0,0 +1,172 @@
+"""
+Parameter Store - Batched, TTL-refreshed SSM parameters
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+from aws_lambda_powertools import Logger
+
+logger = Logger(child=True)
+
+# Limite da API GetParameters
+_MAX_NAMES_PER_CALL = 10
+
+
+class StaticParameterClient:
+    """
+    Stand-in local do SSM (testes/benchmarks): responde get_parameters a partir
+    de um dict {nome_do_parametro: valor}
+    """
+
+    def __init__(self, values: dict[str, str]):
+        self.values = dict(values)
+        self.calls = 0
+
+    def get_parameters(self, Names: list[str], WithDecryption: bool = True) -> dict:
+        self.calls += 1
+        return {
+            "Parameters": [
+                {"Name": name, "Value": self.values[name]}
+                for name in Names
+                if name in self.values
+            ],
+            "InvalidParameters": [name for name in Names if name not in self.values],
+        }
+
+
+def _default_client():
+    import boto3
+
+    return boto3.client("ssm", endpoint_url=os.getenv("SSM_ENDPOINT_URL") or None)
+
+
+class ParameterStore:
+    """
+    Carrega todos os parâmetros de uma vez (GetParameters, 10 nomes por chamada)
+    e mantém os valores em memória por ttl_seconds.
+
+    Depois de refresh_ahead * ttl os valores continuam sendo servidos e um
+    refresh roda em background; só depois do TTL inteiro o refresh bloqueia.
+    Quem precisa reagir a rotação de secrets registra um callback em subscribe().
+    """
+
+    def __init__(
+        self,
+        env_keys: Iterable[str],
+        client_factory: Callable = _default_client,
+        ttl_seconds: float = 300,
+        refresh_ahead: float = 0.8,
+    ):
+        self.env_keys = tuple(env_keys)
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead = refresh_ahead
+        self._client_factory = client_factory
+        self._client = None
+        self._values: dict[str, str] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._subscribers: list[Callable[[set[str]], None]] = []
+
+    def set_client(self, client) -> None:
+        """Troca o client SSM (ex.: StaticParameterClient) e descarta o cache"""
+        with self._lock:
+            self._client = client
+            self._values = {}
+            self._loaded_at = None
+
+    def subscribe(self, callback: Callable[[set[str]], None]) -> None:
+        """callback(changed_env_keys) é chamado quando um refresh altera valores"""
+        self._subscribers.append(callback)
+
+    def get(self, env_key: str) -> str:
+        if self._loaded_at is None:
+            self.refresh()
+        else:
+            self.refresh_if_stale()
+
+        try:
+            return self._values[env_key]
+        except KeyError:
+            raise KeyError(f"SSM parameter not loaded for {env_key}")
+
+    def refresh_if_stale(self) -> None:
+        """
+        Aplica o TTL sem ler nenhum valor. Chamado uma vez por invocação para que
+        valores cacheados pelos consumidores (engine, chave JWT) também sejam
+        renovados quando o secret rotaciona. Antes da primeira leitura não faz nada.
+        """
+        if self._loaded_at is None:
+            return
+
+        age = time.monotonic() - self._loaded_at
+
+        if age >= self.ttl_seconds:
+            self.refresh()
+        elif age >= self.ttl_seconds * self.refresh_ahead:
+            self._refresh_in_background()
+
+    def refresh(self) -> set[str]:
+        """Busca todos os parâmetros agora; retorna as env keys cujo valor mudou"""
+        with self._lock:
+            try:
+                values = self._fetch()
+            except Exception as e:
+                if not self._values:
+                    logger.error(f"Error fetching SSM parameters: {str(e)}")
+                    raise
+                # Mantém os valores antigos e tenta de novo no próximo acesso
+                logger.error(f"Error refreshing SSM parameters, serving cached values: {str(e)}")
+                self._loaded_at = time.monotonic() - self.ttl_seconds * self.refresh_ahead
+                return set()
+
+            first_load = self._loaded_at is None
+            changed = {k for k in values if self._values.get(k) != values[k]}
+            self._values = values
+            self._loaded_at = time.monotonic()
+
+        if changed and not first_load:
+            logger.info(f"SSM parameters changed: {sorted(changed)}")
+            for callback in self._subscribers:
+                try:
+                    callback(changed)
+                except Exception:
+                    logger.exception("SSM parameter change callback failed")
+
+        return changed
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="ssm-refresh", daemon=True).start()
+
+    def _fetch(self) -> dict[str, str]:
+        if self._client is None:
+            self._client = self._client_factory()
+
+        names_by_key = {k: os.getenv(k) for k in self.env_keys if os.getenv(k)}
+        names = sorted(set(names_by_key.values()))
+
+        by_name = {}
+        for i in range(0, len(names), _MAX_NAMES_PER_CALL):
+            chunk = names[i : i + _MAX_NAMES_PER_CALL]
+            logger.info(f"Fetching SSM parameters: {chunk}")
+            response = self._client.get_parameters(Names=chunk, WithDecryption=True)
+
+            if response.get("InvalidParameters"):
+                logger.error(f"Invalid SSM parameters: {response['InvalidParameters']}")
+            for parameter in response["Parameters"]:
+                by_name[parameter["Name"]] = parameter["Value"]
+
+        return {k: by_name[name] for k, name in names_by_key.items() if name in by_name}
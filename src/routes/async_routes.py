@@ -0,0 +1,289 @@
+"""
+Async Routes - native asyncio handlers for the ASGI mode (asgi.py)
+
+Mesmos contratos das rotas síncronas de usuario_routes e tarefa_routes, sobre
+AsyncSession + asyncpg. Exceções de domínio viram status HTTP no dispatcher
+(asgi.py); rotas sem versão async (/, /health) caem no resolver síncrono.
+"""
+
+from aws_lambda_powertools import Logger
+import database_async
+import schemas
+import services
+from routes.tarefa_routes import (
+    check_batch_size,
+    created_batch_response,
+    deleted_batch_response,
+    export_params,
+    fields_param,
+    import_format_param,
+    import_response,
+    list_params,
+    list_response,
+    project,
+    unique_ids,
+    updated_batch_response,
+    validate_batch_items,
+    validate_import_rows,
+)
+from services.async_tarefa_service import AsyncTarefaService
+from services.async_usuario_service import AsyncUsuarioService
+from utils.async_router import AsyncRequest, AsyncRouter, StreamingResponse
+from utils.auth import get_current_user_id
+from utils.idempotency import idempotent_async, idempotent_response_async
+from utils.import_reader import read_rows
+from utils.request_body import decode_json_body
+
+logger = Logger(child=True)
+
+router = AsyncRouter()
+
+
+# ==========================================
+# USUARIOS
+# ==========================================
+@router.post("/usuarios", error="Erro ao criar usuário")
+async def create_usuario(request: AsyncRequest):
+    logger.info("Creating new usuario")
+
+    data = decode_json_body(schemas.UsuarioCreate, request.body)
+
+    async with database_async.get_async_db() as db:
+        usuario = await AsyncUsuarioService.create_usuario(db, data)
+
+    # GET /usuarios/me logo após o cadastro ainda lê do primário
+    database_async.record_write(usuario.id)
+
+    return {
+        "message": "Usuário criado com sucesso",
+        "data": usuario,
+    }, 201
+
+
+@router.post("/login", error="Erro ao realizar login")
+async def login(request: AsyncRequest):
+    logger.info("Usuario login attempt")
+
+    data = decode_json_body(schemas.UsuarioLogin, request.body)
+
+    async with database_async.get_async_db() as db:
+        usuario, access_token = await AsyncUsuarioService.authenticate(
+            db, data.email, data.senha
+        )
+
+    return {
+        "message": "Login realizado com sucesso",
+        "data": {
+            "usuario": usuario,
+            "access_token": access_token,
+            "token_type": "Bearer",
+        },
+    }
+
+
+@router.get("/usuarios/me", error="Erro ao buscar usuário")
+async def get_current_usuario(request: AsyncRequest):
+    logger.info("Getting current usuario")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+
+    usuario = services.UsuarioService.get_cached_usuario(usuario_id)
+    if usuario is None:
+        async with database_async.get_async_db(readonly=True, usuario_id=usuario_id) as db:
+            usuario = await AsyncUsuarioService.get_usuario_by_id(db, usuario_id)
+
+    return {"data": usuario}
+
+
+# ==========================================
+# TAREFAS
+# ==========================================
+@router.post("/tarefas", error="Erro ao criar tarefa")
+@idempotent_async
+async def create_tarefa(request: AsyncRequest):
+    logger.info("Creating new tarefa")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+    data = decode_json_body(schemas.TarefaCreate, request.body)
+
+    async with database_async.get_async_db(usuario_id=usuario_id) as db:
+        tarefa = await AsyncTarefaService.create_tarefa(db, data, usuario_id)
+
+        return await idempotent_response_async(db, ({
+            "message": "Tarefa criada com sucesso",
+            "data": tarefa,
+        }, 201))
+
+
+@router.get("/tarefas", error="Erro ao listar tarefas")
+async def list_tarefas(request: AsyncRequest):
+    logger.info("Listing tarefas")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+    status, limit, offset, cursor, q = list_params(request.query)
+    fields = fields_param(request.query)
+
+    async with database_async.get_async_db(readonly=True, usuario_id=usuario_id) as db:
+        if q:
+            tarefas = await AsyncTarefaService.search_tarefas(
+                db, usuario_id, q, status=status, limit=limit, offset=offset, fields=fields
+            )
+        else:
+            tarefas = await AsyncTarefaService.list_tarefas(
+                db, usuario_id, status=status, limit=limit, offset=offset, cursor=cursor, fields=fields
+            )
+
+    return list_response(tarefas, limit, offset, cursor, q, fields)
+
+
+@router.get("/tarefas/stats", error="Erro ao buscar estatísticas das tarefas")
+async def get_tarefa_stats(request: AsyncRequest):
+    logger.info("Getting tarefa stats")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+
+    async with database_async.get_async_db(readonly=True, usuario_id=usuario_id) as db:
+        stats = await AsyncTarefaService.get_stats(db, usuario_id)
+
+    return {"data": stats}
+
+
+@router.get("/tarefas/export", error="Erro ao exportar tarefas")
+async def export_tarefas(request: AsyncRequest):
+    """Sem limite de tamanho: linhas vão para o cliente conforme saem do cursor no servidor"""
+
+    logger.info("Exporting tarefas")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+    encoder, status, cursor = export_params(request.query)
+
+    async def body():
+        count = 0
+        async with database_async.get_async_db(readonly=True, usuario_id=usuario_id) as db:
+            rows = await AsyncTarefaService.export_tarefas(
+                db, usuario_id, encoder.fields, status=status, cursor=cursor
+            )
+            yield encoder.header()
+            async for row in rows:
+                yield encoder.row(row)
+                count += 1
+        logger.info(f"Exported {count} tarefas for user {usuario_id}")
+
+    return StreamingResponse(
+        body(),
+        encoder.content_type,
+        {"Content-Disposition": f'attachment; filename="{encoder.filename}"'},
+    )
+
+
+@router.post("/tarefas/batch", error="Erro ao criar tarefas em lote")
+@idempotent_async
+async def create_tarefas_batch(request: AsyncRequest):
+    logger.info("Creating tarefas in batch")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+
+    body = decode_json_body(schemas.TarefaBatchCreate, request.body)
+    check_batch_size(len(body.items))
+
+    results, valid = validate_batch_items(body.items)
+
+    async with database_async.get_async_db(usuario_id=usuario_id) as db:
+        tarefas = await AsyncTarefaService.create_tarefas_batch(
+            db, [data for _, data in valid], usuario_id
+        )
+
+        return await idempotent_response_async(db, created_batch_response(results, valid, tarefas))
+
+
+@router.patch("/tarefas/batch", error="Erro ao atualizar tarefas em lote")
+@idempotent_async
+async def update_tarefas_batch(request: AsyncRequest):
+    logger.info("Updating tarefas in batch")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+
+    body = decode_json_body(schemas.TarefaBatchUpdate, request.body)
+    ids = unique_ids(body.ids)
+    check_batch_size(len(ids))
+
+    async with database_async.get_async_db(usuario_id=usuario_id) as db:
+        tarefas = await AsyncTarefaService.update_tarefas_batch(
+            db, ids, body.changes, usuario_id
+        )
+
+        return await idempotent_response_async(db, updated_batch_response(ids, tarefas))
+
+
+@router.delete("/tarefas/batch", error="Erro ao deletar tarefas em lote")
+@idempotent_async
+async def delete_tarefas_batch(request: AsyncRequest):
+    logger.info("Deleting tarefas in batch")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+
+    body = decode_json_body(schemas.TarefaBatchDelete, request.body)
+    ids = unique_ids(body.ids)
+    check_batch_size(len(ids))
+
+    async with database_async.get_async_db(usuario_id=usuario_id) as db:
+        deleted = await AsyncTarefaService.delete_tarefas_batch(db, ids, usuario_id)
+
+        return await idempotent_response_async(db, deleted_batch_response(ids, deleted))
+
+
+@router.post("/tarefas/import", error="Erro ao importar tarefas")
+@idempotent_async
+async def import_tarefas(request: AsyncRequest):
+    logger.info("Importing tarefas")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+
+    import_format = import_format_param(request.query, request.get_header_value("Content-Type"))
+    # Corpo já limitado a IMPORT_MAX_BYTES na leitura (asgi._read_body)
+    valid, errors = validate_import_rows(read_rows(request.body, import_format))
+
+    async with database_async.get_async_db(usuario_id=usuario_id) as db:
+        imported = await AsyncTarefaService.import_tarefas(db, valid, usuario_id)
+
+        return await idempotent_response_async(db, import_response(imported, errors))
+
+
+@router.get("/tarefas/<id>", error="Erro ao buscar tarefa")
+async def get_tarefa(request: AsyncRequest, id: str):
+    logger.info(f"Getting tarefa: {id}")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+    fields = fields_param(request.query)
+
+    async with database_async.get_async_db(readonly=True, usuario_id=usuario_id) as db:
+        tarefa = await AsyncTarefaService.get_tarefa_by_id(db, id, usuario_id, fields=fields)
+
+    return {"data": project(tarefa, fields) if fields else tarefa}
+
+
+@router.put("/tarefas/<id>", error="Erro ao atualizar tarefa")
+@idempotent_async
+async def update_tarefa(request: AsyncRequest, id: str):
+    logger.info(f"Updating tarefa: {id}")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+    data = decode_json_body(schemas.TarefaUpdate, request.body)
+
+    async with database_async.get_async_db(usuario_id=usuario_id) as db:
+        tarefa = await AsyncTarefaService.update_tarefa(db, id, data, usuario_id)
+
+        return await idempotent_response_async(db, {"message": "Tarefa atualizada com sucesso", "data": tarefa})
+
+
+@router.delete("/tarefas/<id>", error="Erro ao deletar tarefa")
+@idempotent_async
+async def delete_tarefa(request: AsyncRequest, id: str):
+    logger.info(f"Deleting tarefa: {id}")
+
+    usuario_id = get_current_user_id(request.get_header_value("Authorization"))
+
+    async with database_async.get_async_db(usuario_id=usuario_id) as db:
+        await AsyncTarefaService.delete_tarefa(db, id, usuario_id)
+
+        return await idempotent_response_async(db, {"message": "Tarefa deletada com sucesso"})
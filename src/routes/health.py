@@ -1,14 +1,49 @@
 """
 Health Check Routes
+
+- GET /health/live: o processo responde; nunca toca no banco
+- GET /health/ready: SELECT 1 no primário, resultado reaproveitado por
+  HEALTH_PROBE_TTL_SECONDS (503 se o banco não responde)
+- GET /health: mesmo probe do ready, no formato antigo (sempre 200)
+
+?deep=true acrescenta o diagnóstico (pool de conexões e atraso da réplica),
+só com o header X-Health-Token igual a HEALTH_DEEP_TOKEN; sem ele, ou sem
+HEALTH_DEEP_TOKEN configurado, o parâmetro é ignorado. O diagnóstico também é
+reaproveitado por HEALTH_PROBE_TTL_SECONDS.
 """
 
-from aws_lambda_powertools import Logger, Tracer
+import hmac
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.event_handler import ApiGatewayResolver
 from aws_lambda_powertools.event_handler.api_gateway import Router
-from database import get_db
-from models import Usuario
+from config import config
+from utils.lazy_import import lazy_import
+from utils.tracing import get_tracer
+
+# Só o probe precisa do banco; GET / e /health/live respondem sem carregar SQLAlchemy
+database = lazy_import("database")
 
 logger = Logger(child=True)
-tracer = Tracer(disabled=True)
+tracer = get_tracer()
+
+API_NAME = "todo-advogados-api"
+
+DEEP_TOKEN_HEADER = "X-Health-Token"
+
+# Último probe do banco neste container; o lock faz requisições simultâneas
+# esperarem o mesmo SELECT 1 em vez de abrir um probe cada
+_probe_lock = threading.Lock()
+_last_probe: Optional[dict] = None
+_last_probe_at = 0.0
+
+# Último diagnóstico (?deep=true), com o mesmo TTL do probe
+_deep_lock = threading.Lock()
+_last_deep: Optional[dict] = None
+_last_deep_at = 0.0
 
 # Create router
 router = Router()
@@ -19,37 +54,115 @@ router = Router()
 def root():
     logger.info("Root endpoint called - Informações da API")
     return {
-        "api": "todo-advogados-api",
+        "api": API_NAME,
         "message": "API is running",
         "endpoints": {
-            "health": "GET /health",
+            "health": "GET /health/live, GET /health/ready",
             "usuarios": "POST /usuarios",
             "login": "POST /login",
             "me": "GET /usuarios/me",
             "tarefas": "GET /tarefas, POST /tarefas",
             "tarefa": "GET /tarefas/{id}, PUT /tarefas/{id}, DELETE /tarefas/{id}",
+            "tarefas_batch": "POST /tarefas/batch, PATCH /tarefas/batch, DELETE /tarefas/batch",
+            "tarefas_stats": "GET /tarefas/stats",
+            "tarefas_export": "GET /tarefas/export",
+            "tarefas_import": "POST /tarefas/import",
         },
     }
 
 
+@router.get("/health/live")
+@tracer.capture_method
+def liveness():
+    return {"status": "alive", "api": API_NAME}
+
+
+@router.get("/health/ready")
+@tracer.capture_method
+def readiness():
+    probe, cached = probe_database()
+
+    body = {
+        "status": "ready" if probe["connected"] else "unavailable",
+        "api": API_NAME,
+        "database": {**probe, "cached": cached},
+    }
+    if deep_requested():
+        body["diagnostics"] = deep_diagnostics()
+
+    return body, 200 if probe["connected"] else 503
+
+
 @router.get("/health")
 @tracer.capture_method
 def health_check():
     logger.info("Health check called")
 
-    try:
-        with get_db() as db:
-            db.query(Usuario).first()
-
-        return {
-            "status": "healthy",
-            "api": "todo-advogados-api",
-            "database": {"connected": True},
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        return {
-            "status": "unhealthy",
-            "api": "todo-advogados-api",
-            "database": {"connected": False, "error": str(e)},
-        }
+    probe, cached = probe_database()
+
+    body = {
+        "status": "healthy" if probe["connected"] else "unhealthy",
+        "api": API_NAME,
+        "database": {**probe, "cached": cached},
+    }
+    if deep_requested():
+        body["diagnostics"] = deep_diagnostics()
+
+    return body
+
+
+def probe_database() -> tuple[dict, bool]:
+    """(resultado do último SELECT 1, veio do cache)"""
+
+    global _last_probe, _last_probe_at
+
+    with _probe_lock:
+        if _last_probe is not None and time.monotonic() - _last_probe_at < config.HEALTH_PROBE_TTL_SECONDS:
+            return _last_probe, True
+
+        try:
+            result = {"connected": True, "latency_ms": round(database.ping(), 2)}
+        except Exception as e:
+            # Endpoint público: o detalhe (host, usuário) fica só no log
+            logger.error(f"Health check failed: {str(e)}")
+            result = {"connected": False, "error": type(e).__name__}
+
+        result["checked_at"] = datetime.now(timezone.utc).isoformat()
+        _last_probe, _last_probe_at = result, time.monotonic()
+        return result, False
+
+
+def deep_requested() -> bool:
+    """?deep=true com o X-Health-Token correto"""
+
+    event = ApiGatewayResolver.current_event
+    query_params = event.query_string_parameters or {}
+    if query_params.get("deep", "").lower() not in ("true", "1"):
+        return False
+
+    expected = config.HEALTH_DEEP_TOKEN
+    provided = event.get_header_value(DEEP_TOKEN_HEADER) or ""
+    if not expected or not hmac.compare_digest(provided.encode("utf-8"), expected.encode("utf-8")):
+        logger.warning("Deep health check requested without a valid token")
+        return False
+    return True
+
+
+def deep_diagnostics() -> dict:
+    """Pool de conexões deste container e atraso de replay da réplica (cache de HEALTH_PROBE_TTL_SECONDS)"""
+
+    global _last_deep, _last_deep_at
+
+    with _deep_lock:
+        if _last_deep is not None and time.monotonic() - _last_deep_at < config.HEALTH_PROBE_TTL_SECONDS:
+            return _last_deep
+
+        diagnostics = {"pool": database.pool_stats(), "replication_lag_seconds": None}
+        try:
+            diagnostics["replication_lag_seconds"] = database.replication_lag_seconds()
+        except Exception as e:
+            logger.warning(f"Replication lag check failed: {str(e)}")
+            diagnostics["replica_error"] = type(e).__name__
+
+        _last_deep, _last_deep_at = diagnostics, time.monotonic()
+        return diagnostics
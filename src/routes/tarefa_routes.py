@@ -2,51 +2,54 @@
 Tarefa Routes
 """
 
-from aws_lambda_powertools.event_handler import ApiGatewayResolver
-from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.event_handler import ApiGatewayResolver, Response
+from aws_lambda_powertools import Logger
 from aws_lambda_powertools.event_handler.api_gateway import Router
 from aws_lambda_powertools.event_handler.exceptions import (
     BadRequestError,
     UnauthorizedError,
     NotFoundError,
     InternalServerError,
+    ServiceError,
 )
-from pydantic import ValidationError
-
-from database import get_db
-from schemas import TarefaCreate, TarefaUpdate
-from services import TarefaService
+from config import config
 from utils.auth import get_current_user_id
+from utils.request_body import get_adapter, parse_json_body, raw_body
 from utils.exceptions import (
     UnauthorizedException,
     ForbiddenException,
     NotFoundException,
+    ValidationException,
 )
-from models.tarefa import StatusTarefa
+from utils import timing
+from utils.lazy_import import lazy_import
+from utils.tracing import get_tracer
+from utils.export import CONTENT_TYPES as EXPORT_FORMATS, ExportEncoder
+from utils.idempotency import idempotent, idempotent_response
+from utils.import_reader import CONTENT_TYPES as IMPORT_FORMATS, detect_format, read_rows
+from utils.pagination import encode_cursor, next_cursor
+
+# Carregados na primeira requisição que os usa (SQLAlchemy, Pydantic)
+database = lazy_import("database")
+models = lazy_import("models")
+pydantic = lazy_import("pydantic")
+schemas = lazy_import("schemas")
+services = lazy_import("services")
 
 logger = Logger(child=True)
-tracer = Tracer(disabled=True)
+tracer = get_tracer()
+
+# Limites de ?q= (busca textual)
+MIN_QUERY_LENGTH = 2
+MAX_QUERY_LENGTH = 200
 
 # Create router
 router = Router()
 
 
-def parse_json_body(schema_class):
-    """Parse e valida o JSON body utilizando Pydantic schema"""
-
-    try:
-        body = ApiGatewayResolver.current_event.json_body
-        return schema_class(**body)
-    except ValidationError as e:
-        logger.warning(f"Validation error: {e.errors()}")
-        raise BadRequestError(f"Erro de validação: {e.errors()}")
-    except Exception as e:
-        logger.error(f"Error parsing body: {str(e)}")
-        raise BadRequestError("Corpo da requisição inválido")
-
-
 @router.post("/tarefas")
 @tracer.capture_method
+@idempotent
 def create_tarefa():
     logger.info("Creating new tarefa")
 
@@ -54,18 +57,20 @@ def create_tarefa():
         auth_header = ApiGatewayResolver.current_event.get_header_value("Authorization")
         usuario_id = get_current_user_id(auth_header)
 
-        data = parse_json_body(TarefaCreate)
+        data = parse_json_body(schemas.TarefaCreate)
 
-        with get_db() as db:
-            tarefa = TarefaService.create_tarefa(db, data, usuario_id)
+        with database.get_db(usuario_id=usuario_id) as db:
+            tarefa = services.TarefaService.create_tarefa(db, data, usuario_id)
 
-        return {
-            "message": "Tarefa criada com sucesso",
-            "data": tarefa,
-        }, 201
+            return idempotent_response(db, ({
+                "message": "Tarefa criada com sucesso",
+                "data": tarefa,
+            }, 201))
 
     except UnauthorizedException as e:
         raise UnauthorizedError(e.message)
+    except ServiceError:
+        raise
     except Exception as e:
         logger.exception("Error creating tarefa")
         raise InternalServerError(f"Erro ao criar tarefa: {str(e)}")
@@ -81,34 +86,465 @@ def list_tarefas():
         usuario_id = get_current_user_id(auth_header)
 
         query_params = ApiGatewayResolver.current_event.query_string_parameters or {}
-        status_str = query_params.get("status")
-        limit = int(query_params.get("limit", 100))
-        offset = int(query_params.get("offset", 0))
+        status, limit, offset, cursor, q = list_params(query_params)
+        fields = fields_param(query_params)
+
+        with database.get_db(readonly=True, usuario_id=usuario_id) as db:
+            if q:
+                tarefas = services.TarefaService.search_tarefas(
+                    db, usuario_id, q, status=status, limit=limit, offset=offset, fields=fields
+                )
+            else:
+                tarefas = services.TarefaService.list_tarefas(
+                    db, usuario_id, status=status, limit=limit, offset=offset, cursor=cursor, fields=fields
+                )
+
+        return list_response(tarefas, limit, offset, cursor, q, fields)
+
+    except UnauthorizedException as e:
+        raise UnauthorizedError(e.message)
+    except ValidationException as e:
+        raise BadRequestError(e.message)
+    except ServiceError:
+        raise
+    except Exception as e:
+        logger.exception("Error listing tarefas")
+        raise InternalServerError(f"Erro ao listar tarefas: {str(e)}")
+
+
+# Registrada antes de /tarefas/<id> para "stats" não ser tratado como ID
+@router.get("/tarefas/stats")
+@tracer.capture_method
+def get_tarefa_stats():
+    logger.info("Getting tarefa stats")
+
+    try:
+        auth_header = ApiGatewayResolver.current_event.get_header_value("Authorization")
+        usuario_id = get_current_user_id(auth_header)
+
+        with database.get_db(readonly=True, usuario_id=usuario_id) as db:
+            stats = services.TarefaService.get_stats(db, usuario_id)
+
+        return {"data": stats}
+
+    except UnauthorizedException as e:
+        raise UnauthorizedError(e.message)
+    except ServiceError:
+        raise
+    except Exception as e:
+        logger.exception("Error getting tarefa stats")
+        raise InternalServerError(f"Erro ao buscar estatísticas das tarefas: {str(e)}")
+
+
+@router.get("/tarefas/export")
+@tracer.capture_method
+def export_tarefas():
+    """
+    NDJSON ou CSV com todas as tarefas do usuário. A Lambda (API Gateway) não
+    faz streaming da resposta: o body vai até EXPORT_MAX_BYTES e, se sobrar
+    tarefa, o header X-Next-Cursor indica de onde continuar (?cursor=).
+    """
+
+    logger.info("Exporting tarefas")
+
+    try:
+        auth_header = ApiGatewayResolver.current_event.get_header_value("Authorization")
+        usuario_id = get_current_user_id(auth_header)
+
+        query_params = ApiGatewayResolver.current_event.query_string_parameters or {}
+        encoder, status, cursor = export_params(query_params)
+
+        parts = [encoder.header()]
+        size = len(parts[0])
+        last = None
+        continue_from = None
+
+        with database.get_db(readonly=True, usuario_id=usuario_id) as db:
+            rows = services.TarefaService.export_tarefas(
+                db, usuario_id, encoder.fields, status=status, cursor=cursor
+            )
+            try:
+                for row in rows:
+                    line = encoder.row(row)
+                    line_size = len(line.encode("utf-8"))
+                    if last is not None and size + line_size > config.EXPORT_MAX_BYTES:
+                        continue_from = encode_cursor(last.data_criacao, last.id)
+                        break
+                    parts.append(line)
+                    size += line_size
+                    last = row
+            finally:
+                rows.close()
+
+        headers = {"Content-Disposition": f'attachment; filename="{encoder.filename}"'}
+        if continue_from:
+            headers["X-Next-Cursor"] = continue_from
+
+        logger.info(f"Exported {len(parts) - 1} tarefas ({size} bytes) for user {usuario_id}")
+        return Response(
+            status_code=200,
+            content_type=encoder.content_type,
+            body="".join(parts),
+            headers=headers,
+        )
+
+    except UnauthorizedException as e:
+        raise UnauthorizedError(e.message)
+    except ValidationException as e:
+        raise BadRequestError(e.message)
+    except ServiceError:
+        raise
+    except Exception as e:
+        logger.exception("Error exporting tarefas")
+        raise InternalServerError(f"Erro ao exportar tarefas: {str(e)}")
+
+
+def list_params(query_params: dict) -> tuple:
+    """(status, limit, offset, cursor, q) a partir da query string de GET /tarefas"""
+
+    status_str = query_params.get("status")
+    limit = int(query_params.get("limit", 100))
+    offset = int(query_params.get("offset", 0))
+    cursor = query_params.get("cursor")
+    q = (query_params.get("q") or "").strip() or None
+
+    if q:
+        if cursor:
+            # Resultado ordenado por relevância: só paginação por offset
+            raise BadRequestError("Parâmetro cursor não pode ser combinado com q")
+        if not MIN_QUERY_LENGTH <= len(q) <= MAX_QUERY_LENGTH:
+            raise BadRequestError(
+                f"Parâmetro q deve ter entre {MIN_QUERY_LENGTH} e {MAX_QUERY_LENGTH} caracteres"
+            )
+
+    status = None
+    if status_str:
+        try:
+            status = models.StatusTarefa(status_str)
+        except ValueError:
+            raise BadRequestError(f"Status inválido: {status_str}")
+
+    return status, limit, offset, cursor, q
+
+
+def fields_param(query_params: dict):
+    """?fields=id,titulo,status -> tupla de campos do TarefaResponse (None = resposta completa)"""
+
+    raw = query_params.get("fields")
+    if not raw:
+        return None
+
+    fields = tuple(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    if not fields:
+        raise BadRequestError("Parâmetro fields não informa nenhum campo")
+
+    invalid = [name for name in fields if name not in schemas.TarefaResponse.model_fields]
+    if invalid:
+        raise BadRequestError(f"Campos inválidos em fields: {', '.join(invalid)}")
+
+    return fields
+
+
+def export_params(query_params: dict) -> tuple:
+    """(encoder, status, cursor) a partir da query string de GET /tarefas/export"""
+
+    export_format = (query_params.get("format") or "ndjson").lower()
+    if export_format not in EXPORT_FORMATS:
+        raise BadRequestError(
+            f"Formato inválido: {export_format} (use {' ou '.join(EXPORT_FORMATS)})"
+        )
+
+    status, _, _, cursor, _ = list_params(query_params)
+    fields = fields_param(query_params) or tuple(schemas.TarefaResponse.model_fields)
+
+    return ExportEncoder(export_format, fields), status, cursor
+
+
+def project(row, fields) -> dict:
+    """Serializer reduzido: só as colunas pedidas, sem passar pelo Pydantic"""
+    return {name: getattr(row, name) for name in fields}
 
-        status = None
-        if status_str:
+
+def list_response(tarefas: list, limit: int, offset: int, cursor, q=None, fields=None) -> dict:
+    return {
+        "data": [project(t, fields) for t in tarefas] if fields else [t for t in tarefas],
+        "count": len(tarefas),
+        "limit": limit,
+        "offset": 0 if cursor else offset,
+        "next_cursor": None if q else next_cursor(tarefas, limit),
+    }
+
+
+def check_batch_size(size: int):
+    """Rejeita lotes maiores que TAREFA_BATCH_MAX_SIZE"""
+
+    if size > config.TAREFA_BATCH_MAX_SIZE:
+        raise BadRequestError(
+            f"Lote excede o máximo de {config.TAREFA_BATCH_MAX_SIZE} itens"
+        )
+
+
+def unique_ids(ids: list[str]) -> list[str]:
+    return list(dict.fromkeys(ids))
+
+
+def validate_batch_items(items: list[dict]) -> tuple[list, list]:
+    """
+    Validação por item: itens inválidos não derrubam o lote.
+    Retorna (results, valid) com results[index] preenchido para os inválidos
+    e valid = [(index, TarefaCreate)].
+    """
+
+    results = [None] * len(items)
+    valid = []
+    with timing.phase("validation"):
+        for index, item in enumerate(items):
             try:
-                status = StatusTarefa(status_str)
-            except ValueError:
-                raise BadRequestError(f"Status inválido: {status_str}")
+                valid.append((index, schemas.TarefaCreate.model_validate(item)))
+            except pydantic.ValidationError as e:
+                results[index] = {
+                    "index": index,
+                    "status": "invalid",
+                    "errors": e.errors(include_url=False, include_context=False),
+                }
+    return results, valid
+
+
+def created_batch_response(results: list, valid: list, tarefas: list) -> dict:
+    for (index, _), tarefa in zip(valid, tarefas):
+        results[index] = {"index": index, "status": "created", "data": tarefa}
+
+    return {
+        "message": "Lote processado",
+        "data": results,
+        "created": len(tarefas),
+        "failed": len(results) - len(tarefas),
+    }
+
+
+def updated_batch_response(ids: list[str], tarefas: list) -> dict:
+    updated = {t.id: t for t in tarefas}
+    results = [
+        {"id": id, "status": "updated", "data": updated[id]}
+        if id in updated
+        else {"id": id, "status": "not_found"}
+        for id in ids
+    ]
+
+    return {
+        "message": "Lote processado",
+        "data": results,
+        "updated": len(updated),
+        "failed": len(ids) - len(updated),
+    }
+
+
+def deleted_batch_response(ids: list[str], deleted: set[str]) -> dict:
+    results = [
+        {"id": id, "status": "deleted" if id in deleted else "not_found"}
+        for id in ids
+    ]
+
+    return {
+        "message": "Lote processado",
+        "data": results,
+        "deleted": len(deleted),
+        "failed": len(ids) - len(deleted),
+    }
+
+
+def import_format_param(query_params: dict, content_type) -> str:
+    """?format= tem precedência sobre o Content-Type do upload"""
+
+    import_format = (query_params.get("format") or detect_format(content_type)).lower()
+    if import_format not in IMPORT_FORMATS:
+        raise BadRequestError(
+            f"Formato inválido: {import_format} (use {' ou '.join(IMPORT_FORMATS)})"
+        )
+    return import_format
+
+
+def validate_import_rows(rows) -> tuple[list, list]:
+    """
+    Valida as linhas em lotes de IMPORT_BATCH_SIZE (um TypeAdapter de
+    list[TarefaCreate] por lote). Retorna (valid, errors) com errors por
+    número de linha do arquivo.
+    """
+
+    valid, errors, batch = [], [], []
+    with timing.phase("validation"):
+        for line, item, read_errors in rows:
+            if read_errors:
+                errors.append({"line": line, "errors": read_errors})
+                continue
+
+            batch.append((line, item))
+            if len(batch) == config.IMPORT_BATCH_SIZE:
+                _validate_import_batch(batch, valid, errors)
+                batch = []
+
+        if batch:
+            _validate_import_batch(batch, valid, errors)
+
+    if not valid and not errors:
+        raise BadRequestError("Arquivo de importação sem linhas")
+
+    errors.sort(key=lambda error: error["line"])
+    return valid, errors
+
+
+def _validate_import_batch(batch: list, valid: list, errors: list):
+    try:
+        valid.extend(get_adapter(list[schemas.TarefaCreate]).validate_python([item for _, item in batch]))
+        return
+    except pydantic.ValidationError as e:
+        # loc começa pelo índice no lote: agrupa os erros por linha
+        invalid = {}
+        # Sem input: a resposta não devolve o conteúdo das linhas inválidas
+        for error in e.errors(include_url=False, include_context=False, include_input=False):
+            index, *loc = error["loc"]
+            invalid.setdefault(index, []).append({**error, "loc": loc})
+
+    for index, (line, item) in enumerate(batch):
+        if index in invalid:
+            errors.append({"line": line, "errors": invalid[index]})
+        else:
+            valid.append(schemas.TarefaCreate.model_validate(item))
+
+
+def import_response(imported: int, errors: list) -> dict:
+    """Só os primeiros IMPORT_MAX_ERRORS erros (truncated indica se há mais)"""
+    return {
+        "message": "Importação processada",
+        "imported": imported,
+        "failed": len(errors),
+        "errors": errors[: config.IMPORT_MAX_ERRORS],
+        "truncated": len(errors) > config.IMPORT_MAX_ERRORS,
+    }
+
+
+@router.post("/tarefas/batch")
+@tracer.capture_method
+@idempotent
+def create_tarefas_batch():
+    logger.info("Creating tarefas in batch")
+
+    try:
+        auth_header = ApiGatewayResolver.current_event.get_header_value("Authorization")
+        usuario_id = get_current_user_id(auth_header)
+
+        body = parse_json_body(schemas.TarefaBatchCreate)
+        check_batch_size(len(body.items))
 
-        with get_db() as db:
-            tarefas = TarefaService.list_tarefas(
-                db, usuario_id, status=status, limit=limit, offset=offset
+        results, valid = validate_batch_items(body.items)
+
+        with database.get_db(usuario_id=usuario_id) as db:
+            tarefas = services.TarefaService.create_tarefas_batch(
+                db, [data for _, data in valid], usuario_id
             )
 
-        return {
-            "data": [t for t in tarefas],
-            "count": len(tarefas),
-            "limit": limit,
-            "offset": offset,
-        }
+            return idempotent_response(db, created_batch_response(results, valid, tarefas))
 
     except UnauthorizedException as e:
         raise UnauthorizedError(e.message)
+    except ServiceError:
+        raise
     except Exception as e:
-        logger.exception("Error listing tarefas")
-        raise InternalServerError(f"Erro ao listar tarefas: {str(e)}")
+        logger.exception("Error creating tarefas in batch")
+        raise InternalServerError(f"Erro ao criar tarefas em lote: {str(e)}")
+
+
+@router.patch("/tarefas/batch")
+@tracer.capture_method
+@idempotent
+def update_tarefas_batch():
+    logger.info("Updating tarefas in batch")
+
+    try:
+        auth_header = ApiGatewayResolver.current_event.get_header_value("Authorization")
+        usuario_id = get_current_user_id(auth_header)
+
+        body = parse_json_body(schemas.TarefaBatchUpdate)
+        ids = unique_ids(body.ids)
+        check_batch_size(len(ids))
+
+        with database.get_db(usuario_id=usuario_id) as db:
+            tarefas = services.TarefaService.update_tarefas_batch(db, ids, body.changes, usuario_id)
+
+            return idempotent_response(db, updated_batch_response(ids, tarefas))
+
+    except UnauthorizedException as e:
+        raise UnauthorizedError(e.message)
+    except ServiceError:
+        raise
+    except Exception as e:
+        logger.exception("Error updating tarefas in batch")
+        raise InternalServerError(f"Erro ao atualizar tarefas em lote: {str(e)}")
+
+
+@router.delete("/tarefas/batch")
+@tracer.capture_method
+@idempotent
+def delete_tarefas_batch():
+    logger.info("Deleting tarefas in batch")
+
+    try:
+        auth_header = ApiGatewayResolver.current_event.get_header_value("Authorization")
+        usuario_id = get_current_user_id(auth_header)
+
+        body = parse_json_body(schemas.TarefaBatchDelete)
+        ids = unique_ids(body.ids)
+        check_batch_size(len(ids))
+
+        with database.get_db(usuario_id=usuario_id) as db:
+            deleted = services.TarefaService.delete_tarefas_batch(db, ids, usuario_id)
+
+            return idempotent_response(db, deleted_batch_response(ids, deleted))
+
+    except UnauthorizedException as e:
+        raise UnauthorizedError(e.message)
+    except ServiceError:
+        raise
+    except Exception as e:
+        logger.exception("Error deleting tarefas in batch")
+        raise InternalServerError(f"Erro ao deletar tarefas em lote: {str(e)}")
+
+
+@router.post("/tarefas/import")
+@tracer.capture_method
+@idempotent
+def import_tarefas():
+    """
+    Carga inicial de tarefas a partir de NDJSON ou CSV (body até IMPORT_MAX_BYTES).
+    Linhas válidas são gravadas; as inválidas voltam em errors com o número da linha.
+    """
+
+    logger.info("Importing tarefas")
+
+    try:
+        event = ApiGatewayResolver.current_event
+        usuario_id = get_current_user_id(event.get_header_value("Authorization"))
+
+        import_format = import_format_param(
+            event.query_string_parameters or {}, event.get_header_value("Content-Type")
+        )
+        rows = read_rows(raw_body(config.IMPORT_MAX_BYTES), import_format)
+        valid, errors = validate_import_rows(rows)
+
+        with database.get_db(usuario_id=usuario_id) as db:
+            imported = services.TarefaService.import_tarefas(db, valid, usuario_id)
+
+            return idempotent_response(db, import_response(imported, errors))
+
+    except UnauthorizedException as e:
+        raise UnauthorizedError(e.message)
+    except ValidationException as e:
+        raise BadRequestError(e.message)
+    except ServiceError:
+        raise
+    except Exception as e:
+        logger.exception("Error importing tarefas")
+        raise InternalServerError(f"Erro ao importar tarefas: {str(e)}")
 
 
 @router.get("/tarefas/<id>")
@@ -122,10 +558,13 @@ def get_tarefa(id: str):
         auth_header = ApiGatewayResolver.current_event.get_header_value("Authorization")
         usuario_id = get_current_user_id(auth_header)
 
-        with get_db() as db:
-            tarefa = TarefaService.get_tarefa_by_id(db, id, usuario_id)
+        query_params = ApiGatewayResolver.current_event.query_string_parameters or {}
+        fields = fields_param(query_params)
+
+        with database.get_db(readonly=True, usuario_id=usuario_id) as db:
+            tarefa = services.TarefaService.get_tarefa_by_id(db, id, usuario_id, fields=fields)
 
-        return {"data": tarefa}
+        return {"data": project(tarefa, fields) if fields else tarefa}
 
     except UnauthorizedException as e:
         raise UnauthorizedError(e.message)
@@ -133,6 +572,8 @@ def get_tarefa(id: str):
         raise UnauthorizedError(e.message)
     except NotFoundException as e:
         raise NotFoundError(e.message)
+    except ServiceError:
+        raise
     except Exception as e:
         logger.exception("Error getting tarefa")
         raise InternalServerError(f"Erro ao buscar tarefa: {str(e)}")
@@ -140,6 +581,7 @@ def get_tarefa(id: str):
 
 @router.put("/tarefas/<id>")
 @tracer.capture_method
+@idempotent
 def update_tarefa(id: str):
     logger.info(f"Updating tarefa: {id}")
 
@@ -147,12 +589,12 @@ def update_tarefa(id: str):
         auth_header = ApiGatewayResolver.current_event.get_header_value("Authorization")
         usuario_id = get_current_user_id(auth_header)
 
-        data = parse_json_body(TarefaUpdate)
+        data = parse_json_body(schemas.TarefaUpdate)
 
-        with get_db() as db:
-            tarefa = TarefaService.update_tarefa(db, id, data, usuario_id)
+        with database.get_db(usuario_id=usuario_id) as db:
+            tarefa = services.TarefaService.update_tarefa(db, id, data, usuario_id)
 
-        return {"message": "Tarefa atualizada com sucesso", "data": tarefa}
+            return idempotent_response(db, {"message": "Tarefa atualizada com sucesso", "data": tarefa})
 
     except UnauthorizedException as e:
         raise UnauthorizedError(e.message)
@@ -160,6 +602,8 @@ def update_tarefa(id: str):
         raise UnauthorizedError(e.message)
     except NotFoundException as e:
         raise NotFoundError(e.message)
+    except ServiceError:
+        raise
     except Exception as e:
         logger.exception("Error updating tarefa")
         raise InternalServerError(f"Erro ao atualizar tarefa: {str(e)}")
@@ -167,6 +611,7 @@ def update_tarefa(id: str):
 
 @router.delete("/tarefas/<id>")
 @tracer.capture_method
+@idempotent
 def delete_tarefa(id: str):
     logger.info(f"Deleting tarefa: {id}")
 
@@ -174,10 +619,10 @@ def delete_tarefa(id: str):
         auth_header = ApiGatewayResolver.current_event.get_header_value("Authorization")
         usuario_id = get_current_user_id(auth_header)
 
-        with get_db() as db:
-            TarefaService.delete_tarefa(db, id, usuario_id)
+        with database.get_db(usuario_id=usuario_id) as db:
+            services.TarefaService.delete_tarefa(db, id, usuario_id)
 
-        return {"message": "Tarefa deletada com sucesso"}
+            return idempotent_response(db, {"message": "Tarefa deletada com sucesso"})
 
     except UnauthorizedException as e:
         raise UnauthorizedError(e.message)
@@ -185,6 +630,8 @@ def delete_tarefa(id: str):
         raise UnauthorizedError(e.message)
     except NotFoundException as e:
         raise NotFoundError(e.message)
+    except ServiceError:
+        raise
     except Exception as e:
         logger.exception("Error deleting tarefa")
         raise InternalServerError(f"Erro ao deletar tarefa: {str(e)}")
@@ -2,7 +2,7 @@
 Usuario Routes
 """
 
-from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools import Logger
 from aws_lambda_powertools.event_handler import ApiGatewayResolver
 from aws_lambda_powertools.event_handler.api_gateway import Router
 from aws_lambda_powertools.event_handler.exceptions import (
@@ -11,45 +11,38 @@ from aws_lambda_powertools.event_handler.exceptions import (
     NotFoundError,
     InternalServerError,
 )
-from pydantic import ValidationError
 
-from database import get_db
-from schemas import UsuarioCreate, UsuarioLogin
-from services import UsuarioService
 from utils.auth import get_current_user_id
+from utils.request_body import parse_json_body
 from utils.exceptions import UnauthorizedException, NotFoundException, ConflictException
+from utils.lazy_import import lazy_import
+from utils.tracing import get_tracer
+
+# Carregados na primeira requisição que os usa (SQLAlchemy, Pydantic, bcrypt)
+database = lazy_import("database")
+schemas = lazy_import("schemas")
+services = lazy_import("services")
 
 
 logger = Logger(child=True)
-tracer = Tracer(disabled=True)
+tracer = get_tracer()
 
 router = Router()
 
 
-def parse_json_body(schema_class):
-    """Parse and validate JSON body using Pydantic schema"""
-
-    try:
-        body = ApiGatewayResolver.current_event.json_body
-        return schema_class(**body)
-    except ValidationError as e:
-        logger.warning(f"Validation error: {e.errors()}")
-        raise BadRequestError(f"Erro de validação: {e.errors()}")
-    except Exception as e:
-        logger.error(f"Error parsing body: {str(e)}")
-        raise BadRequestError("Corpo da requisição inválido")
-
-
 @router.post("/usuarios")
 @tracer.capture_method
 def create_usuario():
     logger.info("Creating new usuario")
 
-    data = parse_json_body(UsuarioCreate)
+    data = parse_json_body(schemas.UsuarioCreate)
 
     try:
-        with get_db() as db:
-            usuario = UsuarioService.create_usuario(db, data)
+        with database.get_db() as db:
+            usuario = services.UsuarioService.create_usuario(db, data)
+
+        # GET /usuarios/me logo após o cadastro ainda lê do primário
+        database.record_write(usuario.id)
 
         return {
             "message": "Usuário criado com sucesso",
@@ -68,11 +61,11 @@ def create_usuario():
 def login():
     logger.info("Usuario login attempt")
 
-    data = parse_json_body(UsuarioLogin)
+    data = parse_json_body(schemas.UsuarioLogin)
 
     try:
-        with get_db() as db:
-            usuario, access_token = UsuarioService.authenticate(
+        with database.get_db() as db:
+            usuario, access_token = services.UsuarioService.authenticate(
                 db, data.email, data.senha
             )
 
@@ -103,8 +96,11 @@ def get_current_usuario():
         auth_header = ApiGatewayResolver.current_event.get_header_value("Authorization")
         usuario_id = get_current_user_id(auth_header)
 
-        with get_db() as db:
-            usuario = UsuarioService.get_usuario_by_id(db, usuario_id)
+        # Perfil quase nunca muda: container warm responde sem ir ao banco
+        usuario = services.UsuarioService.get_cached_usuario(usuario_id)
+        if usuario is None:
+            with database.get_db(readonly=True, usuario_id=usuario_id) as db:
+                usuario = services.UsuarioService.get_usuario_by_id(db, usuario_id)
 
         return {"data": usuario}
 
@@ -3,7 +3,15 @@ Schemas package
 """
 
 from .usuario import UsuarioCreate, UsuarioLogin, UsuarioResponse
-from .tarefa import TarefaCreate, TarefaUpdate, TarefaResponse
+from .tarefa import (
+    TarefaCreate,
+    TarefaUpdate,
+    TarefaResponse,
+    TarefaBatchCreate,
+    TarefaBatchUpdate,
+    TarefaBatchDelete,
+    TarefaStatsResponse,
+)
 
 __all__ = [
     "UsuarioCreate",
@@ -12,4 +20,8 @@ __all__ = [
     "TarefaCreate",
     "TarefaUpdate",
     "TarefaResponse",
+    "TarefaBatchCreate",
+    "TarefaBatchUpdate",
+    "TarefaBatchDelete",
+    "TarefaStatsResponse",
 ]
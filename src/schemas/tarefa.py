@@ -3,7 +3,7 @@ Tarefa Schemas - Pydantic models for validation and serialization
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from models.tarefa import StatusTarefa
 
@@ -24,6 +24,20 @@ class TarefaUpdate(BaseModel):
     data_conclusao: Optional[datetime] = None
 
 
+class TarefaBatchCreate(BaseModel):
+    # Itens validados um a um contra TarefaCreate (erros reportados por item)
+    items: list[dict[str, Any]] = Field(..., min_length=1)
+
+
+class TarefaBatchUpdate(BaseModel):
+    ids: list[str] = Field(..., min_length=1)
+    changes: TarefaUpdate
+
+
+class TarefaBatchDelete(BaseModel):
+    ids: list[str] = Field(..., min_length=1)
+
+
 class TarefaResponse(TarefaBase):
     id: str
     status: StatusTarefa
@@ -37,3 +51,10 @@ class TarefaResponse(TarefaBase):
         from_attributes=True,
         json_encoders={datetime: lambda v: v.isoformat() if v else None},
     )
+
+
+class TarefaStatsResponse(BaseModel):
+    pendente: int = 0
+    em_andamento: int = 0
+    concluida: int = 0
+    total: int = 0
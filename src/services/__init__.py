@@ -5,4 +5,8 @@ Services package
 from .usuario_service import UsuarioService
 from .tarefa_service import TarefaService
 
+# AsyncUsuarioService/AsyncTarefaService ficam fora daqui: só o modo ASGI os
+# usa, e importá-los carregaria sqlalchemy.ext.asyncio (e greenlet) na Lambda.
+# Importe de services.async_usuario_service / services.async_tarefa_service.
+
 __all__ = ["UsuarioService", "TarefaService"]
@@ -0,0 +1,288 @@
+from typing import Optional
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from aws_lambda_powertools import Logger
+from config import config
+from models import Tarefa, StatusTarefa
+from models.ids import new_id
+from schemas import TarefaCreate, TarefaUpdate, TarefaResponse, TarefaStatsResponse
+from utils.exceptions import NotFoundException, ForbiddenException
+from . import tarefa_counters, tarefa_import
+from .tarefa_search import search_statement
+from .tarefa_service import TarefaService
+
+logger = Logger(child=True)
+
+
+class AsyncTarefaService:
+    """Mesmas regras do TarefaService, sobre AsyncSession (modo ASGI)"""
+
+    @staticmethod
+    async def create_tarefa(db: AsyncSession, data: TarefaCreate, usuario_id: str) -> TarefaResponse:
+        tarefa = Tarefa(
+            titulo=data.titulo,
+            descricao=data.descricao,
+            criado_por=usuario_id,
+            atualizado_por=usuario_id
+        )
+
+        db.add(tarefa)
+        await db.flush()
+        await AsyncTarefaService._apply_counters(db, usuario_id, tarefa_counters.created([tarefa.status]))
+
+        logger.info(f"Tarefa created: {tarefa.id} by user {usuario_id}")
+        return TarefaResponse.model_validate(tarefa)
+
+    @staticmethod
+    async def list_tarefas(
+        db: AsyncSession,
+        usuario_id: str,
+        status: Optional[StatusTarefa] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        fields: Optional[tuple[str, ...]] = None
+    ) -> list:
+        entities = TarefaService._columns(fields) if fields else [Tarefa]
+        stmt = select(*entities).where(Tarefa.criado_por == usuario_id)
+
+        if status:
+            stmt = stmt.where(Tarefa.status == status)
+
+        if cursor:
+            stmt = stmt.where(TarefaService._after_cursor(cursor))
+            offset = 0
+
+        stmt = (
+            stmt.order_by(Tarefa.data_criacao.desc(), Tarefa.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        tarefas = (await db.execute(stmt)).all()
+
+        logger.info(f"Listed {len(tarefas)} tarefas for user {usuario_id}")
+        if fields:
+            return tarefas
+        return [TarefaResponse.model_validate(t) for (t,) in tarefas]
+
+    @staticmethod
+    async def search_tarefas(
+        db: AsyncSession,
+        usuario_id: str,
+        q: str,
+        status: Optional[StatusTarefa] = None,
+        limit: int = 100,
+        offset: int = 0,
+        fields: Optional[tuple[str, ...]] = None
+    ) -> list:
+        columns = TarefaService._columns(fields) if fields else None
+        stmt = search_statement(db.bind.dialect.name, usuario_id, q, status, columns)
+        tarefas = (await db.execute(stmt.limit(limit).offset(offset))).all() if stmt is not None else []
+
+        logger.info(f"Search matched {len(tarefas)} tarefas for user {usuario_id}")
+        if fields:
+            return tarefas
+        return [TarefaResponse.model_validate(t) for (t,) in tarefas]
+
+    @staticmethod
+    async def export_tarefas(
+        db: AsyncSession,
+        usuario_id: str,
+        fields: tuple[str, ...],
+        status: Optional[StatusTarefa] = None,
+        cursor: Optional[str] = None
+    ) -> AsyncResult:
+        """Streaming com cursor no servidor (asyncpg); consuma com async for dentro da sessão"""
+        stmt = TarefaService._export_statement(usuario_id, fields, status, cursor)
+        return await db.stream(stmt)
+
+    @staticmethod
+    async def get_stats(db: AsyncSession, usuario_id: str) -> TarefaStatsResponse:
+        rows = (await db.execute(tarefa_counters.stats_statement(usuario_id))).all()
+        return TarefaStatsResponse(**tarefa_counters.stats_values(rows))
+
+    @staticmethod
+    async def get_tarefa_by_id(
+        db: AsyncSession, tarefa_id: str, usuario_id: str, fields: Optional[tuple[str, ...]] = None
+    ):
+        entities = TarefaService._columns(fields) if fields else [Tarefa]
+        stmt = select(*entities).where(Tarefa.id == tarefa_id, Tarefa.criado_por == usuario_id)
+        tarefa = (await db.execute(stmt)).first()
+
+        if not tarefa:
+            await AsyncTarefaService._raise_not_owned(
+                db, tarefa_id, usuario_id, "access",
+                "Você não tem permissão para acessar esta tarefa",
+            )
+
+        if fields:
+            return tarefa
+        return TarefaResponse.model_validate(tarefa[0])
+
+    @staticmethod
+    async def update_tarefa(db: AsyncSession, tarefa_id: str, data: TarefaUpdate, usuario_id: str) -> TarefaResponse:
+        old_statuses = await AsyncTarefaService._lock_statuses(db, [tarefa_id], usuario_id, data)
+
+        stmt = (
+            update(Tarefa)
+            .where(Tarefa.id == tarefa_id, Tarefa.criado_por == usuario_id)
+            .values(**TarefaService._update_values(data, usuario_id))
+            .returning(Tarefa)
+            .execution_options(synchronize_session=False)
+        )
+        tarefa = (await db.scalars(stmt)).first()
+
+        if not tarefa:
+            await AsyncTarefaService._raise_not_owned(
+                db, tarefa_id, usuario_id, "update",
+                "Você não tem permissão para atualizar esta tarefa",
+            )
+
+        await AsyncTarefaService._apply_status_change(db, usuario_id, old_statuses, [tarefa], data)
+
+        logger.info(f"Tarefa updated: {tarefa_id} by user {usuario_id}")
+        return TarefaResponse.model_validate(tarefa)
+
+    @staticmethod
+    async def delete_tarefa(db: AsyncSession, tarefa_id: str, usuario_id: str) -> None:
+        stmt = (
+            delete(Tarefa)
+            .where(Tarefa.id == tarefa_id, Tarefa.criado_por == usuario_id)
+            .returning(Tarefa.id, Tarefa.status)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_row = (await db.execute(stmt)).first()
+
+        if not deleted_row:
+            await AsyncTarefaService._raise_not_owned(
+                db, tarefa_id, usuario_id, "delete",
+                "Você não tem permissão para deletar esta tarefa",
+            )
+
+        await AsyncTarefaService._apply_counters(db, usuario_id, tarefa_counters.deleted([deleted_row.status]))
+
+        logger.info(f"Tarefa deleted: {tarefa_id} by user {usuario_id}")
+
+    @staticmethod
+    async def create_tarefas_batch(
+        db: AsyncSession, items: list[TarefaCreate], usuario_id: str
+    ) -> list[TarefaResponse]:
+        if not items:
+            return []
+
+        # Mesma ordem de items: IDs gerados aqui, como em TarefaService
+        rows = [
+            {
+                "id": new_id(),
+                "titulo": item.titulo,
+                "descricao": item.descricao,
+                "criado_por": usuario_id,
+                "atualizado_por": usuario_id,
+            }
+            for item in items
+        ]
+        by_id = {t.id: t for t in await db.scalars(insert(Tarefa).returning(Tarefa), rows)}
+        tarefas = [by_id[row["id"]] for row in rows]
+        await AsyncTarefaService._apply_counters(db, usuario_id, tarefa_counters.created(t.status for t in tarefas))
+
+        logger.info(f"Batch created {len(tarefas)} tarefas by user {usuario_id}")
+        return [TarefaResponse.model_validate(t) for t in tarefas]
+
+    @staticmethod
+    async def update_tarefas_batch(
+        db: AsyncSession, tarefa_ids: list[str], data: TarefaUpdate, usuario_id: str
+    ) -> list[TarefaResponse]:
+        old_statuses = await AsyncTarefaService._lock_statuses(db, tarefa_ids, usuario_id, data)
+
+        stmt = (
+            update(Tarefa)
+            .where(Tarefa.id.in_(tarefa_ids), Tarefa.criado_por == usuario_id)
+            .values(**TarefaService._update_values(data, usuario_id))
+            .returning(Tarefa)
+            .execution_options(synchronize_session=False)
+        )
+        tarefas = (await db.scalars(stmt)).all()
+        await AsyncTarefaService._apply_status_change(db, usuario_id, old_statuses, tarefas, data)
+
+        logger.info(f"Batch updated {len(tarefas)} tarefas by user {usuario_id}")
+        return [TarefaResponse.model_validate(t) for t in tarefas]
+
+    @staticmethod
+    async def delete_tarefas_batch(db: AsyncSession, tarefa_ids: list[str], usuario_id: str) -> set[str]:
+        stmt = (
+            delete(Tarefa)
+            .where(Tarefa.id.in_(tarefa_ids), Tarefa.criado_por == usuario_id)
+            .returning(Tarefa.id, Tarefa.status)
+            .execution_options(synchronize_session=False)
+        )
+        rows = (await db.execute(stmt)).all()
+        deleted = {row.id for row in rows}
+        await AsyncTarefaService._apply_counters(db, usuario_id, tarefa_counters.deleted(row.status for row in rows))
+
+        logger.info(f"Batch deleted {len(deleted)} tarefas by user {usuario_id}")
+        return deleted
+
+    @staticmethod
+    async def import_tarefas(db: AsyncSession, items: list[TarefaCreate], usuario_id: str) -> int:
+        """COPY via asyncpg (copy_records_to_table) + INSERT ... SELECT; demais drivers em lotes"""
+        if not items:
+            return 0
+
+        rows = list(tarefa_import.records(items))
+
+        if db.bind.dialect.driver == "asyncpg":
+            connection = await db.connection()
+            await connection.run_sync(tarefa_import.staging.create)
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                tarefa_import.staging.name, records=rows, columns=tarefa_import.STAGING_COLUMNS
+            )
+            await db.execute(tarefa_import.insert_from_staging_statement(usuario_id))
+        else:
+            for start in range(0, len(rows), config.IMPORT_BATCH_SIZE):
+                batch = rows[start:start + config.IMPORT_BATCH_SIZE]
+                await db.execute(insert(Tarefa), tarefa_import.insert_values(batch, usuario_id))
+
+        await AsyncTarefaService._apply_counters(
+            db, usuario_id, tarefa_counters.created([StatusTarefa.PENDENTE] * len(rows))
+        )
+
+        logger.info(f"Imported {len(rows)} tarefas by user {usuario_id}")
+        return len(rows)
+
+    @staticmethod
+    async def _lock_statuses(db: AsyncSession, tarefa_ids: list[str], usuario_id: str, data: TarefaUpdate) -> dict:
+        if data.status is None:
+            return {}
+
+        stmt = tarefa_counters.lock_statuses_statement(tarefa_ids, usuario_id)
+        return dict((await db.execute(stmt)).all())
+
+    @staticmethod
+    async def _apply_status_change(
+        db: AsyncSession, usuario_id: str, old_statuses: dict, tarefas: list, data: TarefaUpdate
+    ) -> None:
+        if not old_statuses:
+            return
+
+        deltas = tarefa_counters.status_changed((old_statuses[t.id] for t in tarefas), data.status)
+        await AsyncTarefaService._apply_counters(db, usuario_id, deltas)
+
+    @staticmethod
+    async def _apply_counters(db: AsyncSession, usuario_id: str, deltas) -> None:
+        stmt = tarefa_counters.apply_statement(db.bind.dialect.name, usuario_id, deltas)
+        if stmt is not None:
+            await db.execute(stmt)
+
+    @staticmethod
+    async def _raise_not_owned(
+        db: AsyncSession, tarefa_id: str, usuario_id: str, action: str, forbidden_message: str
+    ) -> None:
+        owner = await db.scalar(select(Tarefa.criado_por).where(Tarefa.id == tarefa_id))
+
+        if owner is None:
+            logger.warning(f"Tarefa not found: {tarefa_id}")
+            raise NotFoundException("Tarefa não encontrada")
+
+        logger.warning(f"User {usuario_id} tried to {action} tarefa {tarefa_id} owned by {owner}")
+        raise ForbiddenException(forbidden_message)
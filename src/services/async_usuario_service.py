@@ -0,0 +1,73 @@
+import asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from aws_lambda_powertools import Logger
+from models import Usuario
+from schemas import UsuarioCreate, UsuarioResponse
+from utils.auth import hash_password, verify_password, create_access_token
+from utils.exceptions import ConflictException, UnauthorizedException, NotFoundException
+from . import usuario_cache
+
+logger = Logger(child=True)
+
+
+class AsyncUsuarioService:
+    """
+    Mesmas regras do UsuarioService, sobre AsyncSession (modo ASGI).
+    bcrypt roda em thread (asyncio.to_thread) para não travar o event loop.
+    """
+
+    @staticmethod
+    async def create_usuario(db: AsyncSession, data: UsuarioCreate) -> UsuarioResponse:
+        # Check if email already exists
+        existing = await db.scalar(select(Usuario.id).where(Usuario.email == data.email))
+        if existing:
+            logger.warning(f"Email already exists: {data.email}")
+            raise ConflictException("Email já cadastrado")
+
+        senha_hash = await asyncio.to_thread(hash_password, data.senha)
+
+        usuario = Usuario(nome=data.nome, email=data.email, senha_hash=senha_hash)
+
+        db.add(usuario)
+        await db.flush()
+
+        response = UsuarioResponse.model_validate(usuario)
+        usuario_cache.put_on_commit(db.sync_session, response)
+
+        logger.info(f"Usuario created: {usuario.id}")
+        return response
+
+    @staticmethod
+    async def authenticate(
+        db: AsyncSession, email: str, senha: str
+    ) -> tuple[UsuarioResponse, str]:
+        usuario = (await db.scalars(select(Usuario).where(Usuario.email == email))).first()
+
+        if not usuario:
+            logger.warning(f"Login failed: email not found - {email}")
+            raise UnauthorizedException("Email ou senha inválidos")
+
+        if not await asyncio.to_thread(verify_password, senha, usuario.senha_hash):
+            logger.warning(f"Login failed: invalid password - {email}")
+            raise UnauthorizedException("Email ou senha inválidos")
+
+        access_token = create_access_token(usuario.id, usuario.email)
+
+        response = UsuarioResponse.model_validate(usuario)
+        usuario_cache.put(response)
+
+        logger.info(f"Usuario authenticated: {usuario.id}")
+        return response, access_token
+
+    @staticmethod
+    async def get_usuario_by_id(db: AsyncSession, usuario_id: str) -> UsuarioResponse:
+        usuario = await db.get(Usuario, usuario_id)
+
+        if not usuario:
+            logger.warning(f"Usuario not found: {usuario_id}")
+            raise NotFoundException("Usuário não encontrado")
+
+        response = UsuarioResponse.model_validate(usuario)
+        usuario_cache.put(response)
+        return response
@@ -0,0 +1,79 @@
+"""
+Idempotency store - Idempotency-Key records in the idempotency_key table
+
+Reserva e liberação são transações curtas no primário, separadas da sessão da
+rota: a reserva é visível para as outras requisições antes do service rodar. A
+resposta é gravada na sessão da rota (complete com db), no mesmo commit da escrita. O
+INSERT ... ON CONFLICT DO NOTHING decide quem reserva a chave; no Postgres, um
+INSERT concorrente espera o commit do outro e então lê o registro dele.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from database import get_engine
+from models import IdempotencyKey
+from utils.idempotency import StoredResponse
+
+_INSERT = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+class SqlIdempotencyStore:
+    def reserve(self, key_id: str, request_hash: str, lock_seconds: int) -> Optional[StoredResponse]:
+        now = datetime.utcnow()
+
+        with get_engine().begin() as conn:
+            # Registro vencido (resposta antiga ou reserva abandonada) não conta
+            conn.execute(delete(IdempotencyKey).where(IdempotencyKey.id == key_id, IdempotencyKey.expires_at <= now))
+
+            stmt = _INSERT[conn.dialect.name](IdempotencyKey).values(
+                id=key_id, request_hash=request_hash, expires_at=now + timedelta(seconds=lock_seconds)
+            )
+            if conn.execute(stmt.on_conflict_do_nothing(index_elements=[IdempotencyKey.id])).rowcount == 1:
+                return None
+
+            row = conn.execute(
+                select(IdempotencyKey.request_hash, IdempotencyKey.status_code, IdempotencyKey.response_body).where(
+                    IdempotencyKey.id == key_id
+                )
+            ).one_or_none()
+
+        if row is None:
+            # Liberada entre o INSERT e o SELECT: trata como ainda em andamento
+            return StoredResponse(request_hash)
+        return StoredResponse(*row)
+
+    def complete(self, key_id: str, status_code: int, body: str, ttl_seconds: int, db=None) -> None:
+        stmt = (
+            update(IdempotencyKey)
+            .where(IdempotencyKey.id == key_id)
+            .values(
+                status_code=status_code,
+                response_body=body,
+                expires_at=datetime.utcnow() + timedelta(seconds=ttl_seconds),
+            )
+        )
+        if db is not None:
+            db.execute(stmt)
+            return
+
+        with get_engine().begin() as conn:
+            conn.execute(stmt)
+
+    def release(self, key_id: str) -> None:
+        with get_engine().begin() as conn:
+            conn.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.id == key_id, IdempotencyKey.status_code.is_(None))
+            )
+
+
+def purge_expired(conn, batch_size: int, now: Optional[datetime] = None) -> int:
+    """Remove até batch_size registros vencidos (lotes curtos, sem travar a tabela); retorna quantos"""
+    expired = (
+        select(IdempotencyKey.id)
+        .where(IdempotencyKey.expires_at <= (now or datetime.utcnow()))
+        .limit(batch_size)
+    )
+    return conn.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(expired))).rowcount
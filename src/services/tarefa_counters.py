@@ -0,0 +1,101 @@
+"""
+Tarefa counters - per-user totals by status kept in tarefa_contador
+
+Os services aplicam os deltas na mesma transação da escrita em tarefa, com um
+único INSERT ... ON CONFLICT DO UPDATE (total = total + delta), então
+GET /tarefas/stats lê no máximo três linhas em vez de um COUNT(*) na tarefa.
+"""
+
+from collections import Counter
+from typing import Iterable, Optional
+from sqlalchemy import Insert, Select, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import StatusTarefa, Tarefa, TarefaContador
+
+_INSERT = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def created(statuses: Iterable[StatusTarefa]) -> Counter:
+    return Counter(statuses)
+
+
+def deleted(statuses: Iterable[StatusTarefa]) -> Counter:
+    deltas = Counter()
+    for status in statuses:
+        deltas[status] -= 1
+    return deltas
+
+
+def status_changed(old_statuses: Iterable[StatusTarefa], new_status: StatusTarefa) -> Counter:
+    deltas = Counter()
+    for status in old_statuses:
+        if status != new_status:
+            deltas[status] -= 1
+            deltas[new_status] += 1
+    return deltas
+
+
+def lock_statuses_statement(tarefa_ids: list[str], usuario_id: str) -> Select:
+    """
+    Status atual das tarefas, com FOR UPDATE: nenhuma outra transação muda o
+    status entre esta leitura e o UPDATE, então o delta calculado é exato
+    """
+    return (
+        select(Tarefa.id, Tarefa.status)
+        .where(Tarefa.id.in_(tarefa_ids), Tarefa.criado_por == usuario_id)
+        .with_for_update()
+    )
+
+
+def apply_statement(dialect_name: str, usuario_id: str, deltas: Counter) -> Optional[Insert]:
+    """
+    Upsert somando os deltas aos totais do usuário
+
+    Returns:
+        Insert a executar, ou None quando não há delta
+    """
+    # Ordem fixa de status: duas transações do mesmo usuário travam as linhas
+    # na mesma ordem (sem deadlock)
+    rows = [
+        {"usuario_id": usuario_id, "status": status, "total": delta}
+        for status, delta in sorted(deltas.items(), key=lambda item: item[0].value)
+        if delta
+    ]
+    if not rows:
+        return None
+
+    stmt = _INSERT[dialect_name](TarefaContador).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[TarefaContador.usuario_id, TarefaContador.status],
+        set_={"total": TarefaContador.total + stmt.excluded.total},
+    )
+
+
+def reset_statement(dialect_name: str, usuario_id: str, totals: dict) -> Insert:
+    """Upsert gravando os totais absolutos do usuário (reconciliação)"""
+    rows = [
+        {"usuario_id": usuario_id, "status": status, "total": totals.get(status, 0)}
+        for status in sorted(StatusTarefa, key=lambda status: status.value)
+    ]
+
+    stmt = _INSERT[dialect_name](TarefaContador).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[TarefaContador.usuario_id, TarefaContador.status],
+        set_={"total": stmt.excluded.total},
+    )
+
+
+def stats_statement(usuario_id: str) -> Select:
+    return select(TarefaContador.status, TarefaContador.total).where(
+        TarefaContador.usuario_id == usuario_id
+    )
+
+
+def stats_values(rows: Iterable) -> dict[str, int]:
+    """Linhas (status, total) -> totais por status (0 para os ausentes) mais o total geral"""
+    values = {status.value: 0 for status in StatusTarefa}
+    for status, total in rows:
+        values[status.value] = total
+    values["total"] = sum(values.values())
+    return values
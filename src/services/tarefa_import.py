@@ -0,0 +1,99 @@
+"""
+Tarefa import - bulk load of validated rows into tarefa
+
+No Postgres as linhas vão por COPY para uma tabela temporária (tarefa_import,
+ON COMMIT DROP) e entram na tarefa com um único INSERT ... SELECT; nos demais
+bancos (SQLite nos testes), INSERT em lotes via executemany. IDs (UUIDv7) e
+data_criacao saem daqui; data_criacao em ordem decrescente: a primeira linha
+do arquivo fica como a mais recente, a mesma ordem de GET /tarefas/export.
+"""
+
+import io
+from datetime import datetime, timedelta
+from typing import Iterator
+from sqlalchemy import Column, DateTime, Insert, MetaData, String, Table, Text, cast, insert, literal, select
+from models import StatusTarefa, Tarefa
+from models.ids import UUIDString, new_id
+from schemas import TarefaCreate
+
+# Tabela de staging: só as colunas que variam por linha
+staging = Table(
+    "tarefa_import",
+    MetaData(),
+    Column("id", UUIDString, nullable=False),
+    Column("titulo", String(200), nullable=False),
+    Column("descricao", Text),
+    Column("data_criacao", DateTime, nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+STAGING_COLUMNS = tuple(column.name for column in staging.columns)
+
+# Caracteres com escape no formato text do COPY (NULL é \N)
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def records(items: list[TarefaCreate]) -> Iterator[tuple]:
+    """(id, titulo, descricao, data_criacao) por item, na ordem de STAGING_COLUMNS"""
+    now = datetime.utcnow()
+    for position, item in enumerate(items):
+        yield new_id(), item.titulo, item.descricao, now - timedelta(microseconds=position)
+
+
+def copy_buffer(rows) -> io.StringIO:
+    """Linhas no formato text do COPY (tab entre colunas, \\N para NULL)"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def copy_statement() -> str:
+    return f"COPY {staging.name} ({', '.join(STAGING_COLUMNS)}) FROM STDIN"
+
+
+def insert_from_staging_statement(usuario_id: str) -> Insert:
+    """INSERT ... SELECT da staging com os valores comuns a todas as linhas"""
+    return insert(Tarefa).from_select(
+        ["id", "titulo", "descricao", "data_criacao", "data_atualizacao", "status", "criado_por", "atualizado_por"],
+        select(
+            staging.c.id,
+            staging.c.titulo,
+            staging.c.descricao,
+            staging.c.data_criacao,
+            staging.c.data_criacao,
+            # Parâmetro no SELECT seria text: o cast explícito casa com o enum da coluna
+            # (o tipo UUID já envia o parâmetro com ::UUID)
+            cast(literal(StatusTarefa.PENDENTE, Tarefa.status.type), Tarefa.status.type),
+            literal(usuario_id, Tarefa.criado_por.type),
+            literal(usuario_id, Tarefa.atualizado_por.type),
+        ),
+    )
+
+
+def insert_values(rows, usuario_id: str) -> list[dict]:
+    """Parâmetros do INSERT em lote (fallback sem COPY)"""
+    return [
+        {
+            "id": id,
+            "titulo": titulo,
+            "descricao": descricao,
+            "status": StatusTarefa.PENDENTE,
+            "criado_por": usuario_id,
+            "atualizado_por": usuario_id,
+            "data_criacao": data_criacao,
+            "data_atualizacao": data_criacao,
+        }
+        for id, titulo, descricao, data_criacao in rows
+    ]
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value).translate(_COPY_ESCAPES)
@@ -0,0 +1,106 @@
+"""
+Tarefa search - ranked full-text query over titulo/descricao per dialect
+
+Postgres usa a coluna busca_vetor (tsvector em português, migration 3) e os
+índices de trigramas para matches parciais; SQLite usa a tabela FTS5 tarefa_fts.
+"""
+
+import re
+from typing import Optional
+from sqlalchemy import Float, Select, column, func, literal_column, or_, select, table
+from models import Tarefa, StatusTarefa
+
+_TOKEN = re.compile(r"\w+")
+
+_tarefa_fts = table("tarefa_fts", column("rowid"))
+
+
+def search_statement(
+    dialect_name: str,
+    usuario_id: str,
+    q: str,
+    status: Optional[StatusTarefa] = None,
+    columns: Optional[list] = None,
+) -> Optional[Select]:
+    """
+    SELECT das tarefas do usuário que casam com q, mais relevantes primeiro
+
+    Args:
+        columns: Colunas a projetar (padrão: a entidade Tarefa inteira)
+
+    Returns:
+        Select sem limit/offset, ou None quando q não tem termos pesquisáveis
+    """
+    entities = columns or [Tarefa]
+
+    if dialect_name == "postgresql":
+        stmt = _postgres(q, entities)
+    elif dialect_name == "sqlite":
+        stmt = _sqlite(q, entities)
+    else:
+        stmt = _like(q, entities)
+
+    if stmt is None:
+        return None
+
+    stmt = stmt.where(Tarefa.criado_por == usuario_id)
+    if status:
+        stmt = stmt.where(Tarefa.status == status)
+
+    # Desempate estável entre tarefas com a mesma relevância
+    return stmt.order_by(Tarefa.data_criacao.desc(), Tarefa.id.desc())
+
+
+def _postgres(q: str, entities: list) -> Select:
+    busca_vetor = literal_column("tarefa.busca_vetor")
+    tsquery = func.websearch_to_tsquery(literal_column("'portuguese'::regconfig"), q)
+    pattern = _like_pattern(q)
+
+    # Termos com stemming pesam mais; similaridade de trigramas ordena os parciais
+    rank = func.ts_rank_cd(busca_vetor, tsquery, type_=Float) + func.similarity(
+        Tarefa.titulo, q, type_=Float
+    )
+
+    return (
+        select(*entities)
+        .where(
+            or_(
+                busca_vetor.op("@@")(tsquery),
+                Tarefa.titulo.ilike(pattern, escape="\\"),
+                Tarefa.descricao.ilike(pattern, escape="\\"),
+            )
+        )
+        .order_by(rank.desc())
+    )
+
+
+def _sqlite(q: str, entities: list) -> Optional[Select]:
+    tokens = _TOKEN.findall(q)
+    if not tokens:
+        return None
+
+    # Todos os termos, cada um como prefixo ("contrat"* acha "contrato")
+    match = " ".join(f'"{token}"*' for token in tokens)
+
+    return (
+        select(*entities)
+        .join(_tarefa_fts, _tarefa_fts.c.rowid == literal_column("tarefa.rowid"))
+        .where(literal_column("tarefa_fts").op("MATCH")(match))
+        # bm25: menor é melhor; titulo pesa 10x a descricao
+        .order_by(literal_column("bm25(tarefa_fts, 10.0, 1.0)"))
+    )
+
+
+def _like(q: str, entities: list) -> Select:
+    pattern = _like_pattern(q)
+    return select(*entities).where(
+        or_(
+            Tarefa.titulo.ilike(pattern, escape="\\"),
+            Tarefa.descricao.ilike(pattern, escape="\\"),
+        )
+    )
+
+
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
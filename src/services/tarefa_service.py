@@ -1,10 +1,16 @@
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import ColumnElement, Result, Select, delete, func, insert, literal, select, tuple_, update
 from sqlalchemy.orm import Session
 from aws_lambda_powertools import Logger
+from config import config
 from models import Tarefa, StatusTarefa
-from schemas import TarefaCreate, TarefaUpdate, TarefaResponse
+from models.ids import new_id
+from schemas import TarefaCreate, TarefaUpdate, TarefaResponse, TarefaStatsResponse
 from utils.exceptions import NotFoundException, ForbiddenException
+from utils.pagination import decode_cursor
+from . import tarefa_counters, tarefa_import
+from .tarefa_search import search_statement
 
 logger = Logger(child=True)
 
@@ -21,6 +27,7 @@ class TarefaService:
         
         db.add(tarefa)
         db.flush()
+        TarefaService._apply_counters(db, usuario_id, tarefa_counters.created([tarefa.status]))
         
         logger.info(f"Tarefa created: {tarefa.id} by user {usuario_id}")
         return TarefaResponse.model_validate(tarefa)
@@ -31,78 +38,327 @@ class TarefaService:
         usuario_id: str,
         status: Optional[StatusTarefa] = None,
         limit: int = 100,
-        offset: int = 0
-    ) -> list[TarefaResponse]:
-        query = db.query(Tarefa).filter(Tarefa.criado_por == usuario_id)
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        fields: Optional[tuple[str, ...]] = None
+    ) -> list:
+        """
+        Tarefas do usuário, mais recentes primeiro.
+        Com fields, retorna Rows só com essas colunas (mais id e data_criacao, do cursor).
+        """
+        entities = TarefaService._columns(fields) if fields else [Tarefa]
+        query = db.query(*entities).filter(Tarefa.criado_por == usuario_id)
         
         if status:
             query = query.filter(Tarefa.status == status)
         
-        tarefas = query.order_by(Tarefa.data_criacao.desc()).limit(limit).offset(offset).all()
+        # Keyset mode: seek past the last (data_criacao, id) instead of OFFSET,
+        # so every page is an index range scan on ix_tarefa_criado_por_data_criacao_id
+        if cursor:
+            query = query.filter(TarefaService._after_cursor(cursor))
+            offset = 0
+        
+        tarefas = (
+            query.order_by(Tarefa.data_criacao.desc(), Tarefa.id.desc())
+            .limit(limit)
+            .offset(offset)
+            .all()
+        )
         
         logger.info(f"Listed {len(tarefas)} tarefas for user {usuario_id}")
+        if fields:
+            return tarefas
         return [TarefaResponse.model_validate(t) for t in tarefas]
     
     @staticmethod
-    def get_tarefa_by_id(db: Session, tarefa_id: str, usuario_id: str) -> TarefaResponse:
-        tarefa = db.query(Tarefa).filter(Tarefa.id == tarefa_id).first()
+    def search_tarefas(
+        db: Session,
+        usuario_id: str,
+        q: str,
+        status: Optional[StatusTarefa] = None,
+        limit: int = 100,
+        offset: int = 0,
+        fields: Optional[tuple[str, ...]] = None
+    ) -> list:
+        """Busca textual em titulo/descricao, mais relevantes primeiro (paginação por offset)"""
+        columns = TarefaService._columns(fields) if fields else None
+        stmt = search_statement(db.get_bind().dialect.name, usuario_id, q, status, columns)
+        tarefas = db.execute(stmt.limit(limit).offset(offset)).all() if stmt is not None else []
         
-        if not tarefa:
-            logger.warning(f"Tarefa not found: {tarefa_id}")
-            raise NotFoundException("Tarefa não encontrada")
+        logger.info(f"Search matched {len(tarefas)} tarefas for user {usuario_id}")
+        if fields:
+            return tarefas
+        return [TarefaResponse.model_validate(t) for (t,) in tarefas]
+    
+    @staticmethod
+    def export_tarefas(
+        db: Session,
+        usuario_id: str,
+        fields: tuple[str, ...],
+        status: Optional[StatusTarefa] = None,
+        cursor: Optional[str] = None
+    ) -> Result:
+        """
+        Todas as tarefas do usuário (a partir de cursor), mais recentes primeiro.
+        yield_per: cursor no servidor, EXPORT_BATCH_SIZE linhas por fetch; a
+        memória não cresce com o total. Consuma dentro da sessão e feche o Result.
+        """
+        stmt = TarefaService._export_statement(usuario_id, fields, status, cursor)
+        return db.execute(stmt)
+    
+    @staticmethod
+    def get_stats(db: Session, usuario_id: str) -> TarefaStatsResponse:
+        """Totais por status a partir de tarefa_contador (sem COUNT na tarefa)"""
+        rows = db.execute(tarefa_counters.stats_statement(usuario_id)).all()
+        return TarefaStatsResponse(**tarefa_counters.stats_values(rows))
+    
+    @staticmethod
+    def get_tarefa_by_id(
+        db: Session, tarefa_id: str, usuario_id: str, fields: Optional[tuple[str, ...]] = None
+    ):
+        """TarefaResponse, ou Row só com as colunas de fields"""
+        entities = TarefaService._columns(fields) if fields else [Tarefa]
+        tarefa = (
+            db.query(*entities)
+            .filter(Tarefa.id == tarefa_id, Tarefa.criado_por == usuario_id)
+            .first()
+        )
         
-        if tarefa.criado_por != usuario_id:
-            logger.warning(f"User {usuario_id} tried to access tarefa {tarefa_id} owned by {tarefa.criado_por}")
-            raise ForbiddenException("Você não tem permissão para acessar esta tarefa")
+        if not tarefa:
+            TarefaService._raise_not_owned(
+                db, tarefa_id, usuario_id, "access",
+                "Você não tem permissão para acessar esta tarefa",
+            )
         
+        if fields:
+            return tarefa
         return TarefaResponse.model_validate(tarefa)
     
     @staticmethod
     def update_tarefa(db: Session,tarefa_id: str, data: TarefaUpdate, usuario_id: str) -> TarefaResponse:
-        tarefa = db.query(Tarefa).filter(Tarefa.id == tarefa_id).first()
+        old_statuses = TarefaService._lock_statuses(db, [tarefa_id], usuario_id, data)
+        
+        # Ownership no WHERE: um único UPDATE ... RETURNING por requisição
+        stmt = (
+            update(Tarefa)
+            .where(Tarefa.id == tarefa_id, Tarefa.criado_por == usuario_id)
+            .values(**TarefaService._update_values(data, usuario_id))
+            .returning(Tarefa)
+            .execution_options(synchronize_session=False)
+        )
+        tarefa = db.scalars(stmt).first()
         
         if not tarefa:
-            logger.warning(f"Tarefa not found: {tarefa_id}")
-            raise NotFoundException("Tarefa não encontrada")
+            TarefaService._raise_not_owned(
+                db, tarefa_id, usuario_id, "update",
+                "Você não tem permissão para atualizar esta tarefa",
+            )
+        
+        TarefaService._apply_status_change(db, usuario_id, old_statuses, [tarefa], data)
+        
+        logger.info(f"Tarefa updated: {tarefa_id} by user {usuario_id}")
+        return TarefaResponse.model_validate(tarefa)
+    
+    @staticmethod
+    def delete_tarefa(db: Session, tarefa_id: str, usuario_id: str) -> None:
+        stmt = (
+            delete(Tarefa)
+            .where(Tarefa.id == tarefa_id, Tarefa.criado_por == usuario_id)
+            .returning(Tarefa.id, Tarefa.status)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_row = db.execute(stmt).first()
+        
+        if not deleted_row:
+            TarefaService._raise_not_owned(
+                db, tarefa_id, usuario_id, "delete",
+                "Você não tem permissão para deletar esta tarefa",
+            )
+        
+        TarefaService._apply_counters(db, usuario_id, tarefa_counters.deleted([deleted_row.status]))
+        
+        logger.info(f"Tarefa deleted: {tarefa_id} by user {usuario_id}")
+    
+    @staticmethod
+    def create_tarefas_batch(
+        db: Session, items: list[TarefaCreate], usuario_id: str
+    ) -> list[TarefaResponse]:
+        """Multi-row INSERT ... RETURNING; resultado na mesma ordem de items"""
+        if not items:
+            return []
+        
+        # IDs gerados aqui: o RETURNING não garante a ordem das linhas, então
+        # o resultado é reordenado pelos IDs enviados
+        rows = [
+            {
+                "id": new_id(),
+                "titulo": item.titulo,
+                "descricao": item.descricao,
+                "criado_por": usuario_id,
+                "atualizado_por": usuario_id,
+            }
+            for item in items
+        ]
+        by_id = {t.id: t for t in db.scalars(insert(Tarefa).returning(Tarefa), rows)}
+        tarefas = [by_id[row["id"]] for row in rows]
+        TarefaService._apply_counters(db, usuario_id, tarefa_counters.created(t.status for t in tarefas))
+        
+        logger.info(f"Batch created {len(tarefas)} tarefas by user {usuario_id}")
+        return [TarefaResponse.model_validate(t) for t in tarefas]
+    
+    @staticmethod
+    def update_tarefas_batch(
+        db: Session, tarefa_ids: list[str], data: TarefaUpdate, usuario_id: str
+    ) -> list[TarefaResponse]:
+        """
+        Aplica as mesmas alterações a todas as tarefas em um único UPDATE.
+        IDs inexistentes ou de outro usuário simplesmente não voltam no RETURNING.
+        """
+        old_statuses = TarefaService._lock_statuses(db, tarefa_ids, usuario_id, data)
         
-        if tarefa.criado_por != usuario_id:
-            logger.warning(f"User {usuario_id} tried to update tarefa {tarefa_id} owned by {tarefa.criado_por}")
-            raise ForbiddenException("Você não tem permissão para atualizar esta tarefa")
+        stmt = (
+            update(Tarefa)
+            .where(Tarefa.id.in_(tarefa_ids), Tarefa.criado_por == usuario_id)
+            .values(**TarefaService._update_values(data, usuario_id))
+            .returning(Tarefa)
+            .execution_options(synchronize_session=False)
+        )
+        tarefas = db.scalars(stmt).all()
+        TarefaService._apply_status_change(db, usuario_id, old_statuses, tarefas, data)
+        
+        logger.info(f"Batch updated {len(tarefas)} tarefas by user {usuario_id}")
+        return [TarefaResponse.model_validate(t) for t in tarefas]
+    
+    @staticmethod
+    def delete_tarefas_batch(db: Session, tarefa_ids: list[str], usuario_id: str) -> set[str]:
+        """DELETE único escopado ao usuário; retorna os IDs realmente deletados"""
+        stmt = (
+            delete(Tarefa)
+            .where(Tarefa.id.in_(tarefa_ids), Tarefa.criado_por == usuario_id)
+            .returning(Tarefa.id, Tarefa.status)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.execute(stmt).all()
+        deleted = {row.id for row in rows}
+        TarefaService._apply_counters(db, usuario_id, tarefa_counters.deleted(row.status for row in rows))
+        
+        logger.info(f"Batch deleted {len(deleted)} tarefas by user {usuario_id}")
+        return deleted
+    
+    @staticmethod
+    def import_tarefas(db: Session, items: list[TarefaCreate], usuario_id: str) -> int:
+        """
+        Carga em massa: COPY para a staging + INSERT ... SELECT (psycopg2);
+        nos demais drivers, INSERT em lotes de IMPORT_BATCH_SIZE linhas
+        """
+        if not items:
+            return 0
+        
+        rows = list(tarefa_import.records(items))
+        
+        if db.get_bind().dialect.driver == "psycopg2":
+            connection = db.connection()
+            tarefa_import.staging.create(connection)
+            with connection.connection.cursor() as cursor:
+                cursor.copy_expert(tarefa_import.copy_statement(), tarefa_import.copy_buffer(rows))
+            db.execute(tarefa_import.insert_from_staging_statement(usuario_id))
+        else:
+            for start in range(0, len(rows), config.IMPORT_BATCH_SIZE):
+                batch = rows[start:start + config.IMPORT_BATCH_SIZE]
+                db.execute(insert(Tarefa), tarefa_import.insert_values(batch, usuario_id))
+        
+        TarefaService._apply_counters(
+            db, usuario_id, tarefa_counters.created([StatusTarefa.PENDENTE] * len(rows))
+        )
+        
+        logger.info(f"Imported {len(rows)} tarefas by user {usuario_id}")
+        return len(rows)
+    
+    @staticmethod
+    def _export_statement(
+        usuario_id: str, fields: tuple[str, ...], status: Optional[StatusTarefa], cursor: Optional[str]
+    ) -> Select:
+        stmt = select(*TarefaService._columns(fields)).where(Tarefa.criado_por == usuario_id)
+        
+        if status:
+            stmt = stmt.where(Tarefa.status == status)
+        
+        if cursor:
+            stmt = stmt.where(TarefaService._after_cursor(cursor))
+        
+        return (
+            stmt.order_by(Tarefa.data_criacao.desc(), Tarefa.id.desc())
+            .execution_options(yield_per=config.EXPORT_BATCH_SIZE)
+        )
+    
+    @staticmethod
+    def _after_cursor(cursor: str) -> ColumnElement[bool]:
+        """(data_criacao, id) < cursor, com os parâmetros nos tipos das colunas"""
+        data_criacao, tarefa_id = decode_cursor(cursor)
+        return tuple_(Tarefa.data_criacao, Tarefa.id) < tuple_(
+            literal(data_criacao, Tarefa.data_criacao.type), literal(tarefa_id, Tarefa.id.type)
+        )
+    
+    @staticmethod
+    def _columns(fields: tuple[str, ...]) -> list:
+        """Projeção SQL de fields; id e data_criacao sempre vêm (cursor de paginação)"""
+        names = dict.fromkeys(("id", "data_criacao") + tuple(fields))
+        return [getattr(Tarefa, name) for name in names]
+    
+    @staticmethod
+    def _lock_statuses(db: Session, tarefa_ids: list[str], usuario_id: str, data: TarefaUpdate) -> dict:
+        """Status anterior (id -> status) só quando a alteração muda o status"""
+        if data.status is None:
+            return {}
+        
+        stmt = tarefa_counters.lock_statuses_statement(tarefa_ids, usuario_id)
+        return dict(db.execute(stmt).all())
+    
+    @staticmethod
+    def _apply_status_change(
+        db: Session, usuario_id: str, old_statuses: dict, tarefas: list, data: TarefaUpdate
+    ) -> None:
+        if not old_statuses:
+            return
+        
+        deltas = tarefa_counters.status_changed((old_statuses[t.id] for t in tarefas), data.status)
+        TarefaService._apply_counters(db, usuario_id, deltas)
+    
+    @staticmethod
+    def _apply_counters(db: Session, usuario_id: str, deltas) -> None:
+        stmt = tarefa_counters.apply_statement(db.get_bind().dialect.name, usuario_id, deltas)
+        if stmt is not None:
+            db.execute(stmt)
+    
+    @staticmethod
+    def _update_values(data: TarefaUpdate, usuario_id: str) -> dict:
+        values = {"atualizado_por": usuario_id}
         
-        # Update fields
         if data.titulo is not None:
-            tarefa.titulo = data.titulo
+            values["titulo"] = data.titulo
         
         if data.descricao is not None:
-            tarefa.descricao = data.descricao
+            values["descricao"] = data.descricao
         
         if data.status is not None:
-            tarefa.status = data.status
+            values["status"] = data.status
             
             # Set data_conclusao if status is CONCLUIDA
-            if data.status == StatusTarefa.CONCLUIDA and not tarefa.data_conclusao:
-                tarefa.data_conclusao = datetime.utcnow()
-        
-        tarefa.atualizado_por = usuario_id
-        
-        db.flush()
+            if data.status == StatusTarefa.CONCLUIDA:
+                values["data_conclusao"] = func.coalesce(Tarefa.data_conclusao, datetime.utcnow())
         
-        logger.info(f"Tarefa updated: {tarefa_id} by user {usuario_id}")
-        return TarefaResponse.model_validate(tarefa)
+        return values
     
     @staticmethod
-    def delete_tarefa(db: Session, tarefa_id: str, usuario_id: str) -> None:
-        tarefa = db.query(Tarefa).filter(Tarefa.id == tarefa_id).first()
+    def _raise_not_owned(
+        db: Session, tarefa_id: str, usuario_id: str, action: str, forbidden_message: str
+    ) -> None:
+        """Só roda quando o statement principal não achou a linha: separa 404 de 403"""
+        owner = db.query(Tarefa.criado_por).filter(Tarefa.id == tarefa_id).scalar()
         
-        if not tarefa:
+        if owner is None:
             logger.warning(f"Tarefa not found: {tarefa_id}")
             raise NotFoundException("Tarefa não encontrada")
         
-        if tarefa.criado_por != usuario_id:
-            logger.warning(f"User {usuario_id} tried to delete tarefa {tarefa_id} owned by {tarefa.criado_por}")
-            raise ForbiddenException("Você não tem permissão para deletar esta tarefa")
-        
-        db.delete(tarefa)
-        
-        logger.info(f"Tarefa deleted: {tarefa_id} by user {usuario_id}")
-        
\ No newline at end of file
+        logger.warning(f"User {usuario_id} tried to {action} tarefa {tarefa_id} owned by {owner}")
+        raise ForbiddenException(forbidden_message)
@@ -0,0 +1,99 @@
+"""
+Usuario cache - UsuarioResponse by id, so GET /usuarios/me skips the database
+
+Dois níveis: um TTLCache por container (USER_CACHE_SIZE entradas, expiram em
+USER_CACHE_TTL_SECONDS) e, se registrado com set_backend(), um cache
+compartilhado entre containers. Toda leitura do usuário no banco (login,
+/usuarios/me) regrava a entrada, que só é substituída por uma versão com
+data_atualizacao igual ou mais nova. Escritas pelo UsuarioService agendam a
+atualização para o commit da sessão (rollback descarta).
+"""
+
+from typing import Optional
+from aws_lambda_powertools import Logger
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from config import config
+from schemas import UsuarioResponse
+from utils.cache_backend import CacheBackend
+from utils.ttl_cache import TTLCache
+
+logger = Logger(child=True)
+
+_local = TTLCache(maxsize=config.USER_CACHE_SIZE, ttl_seconds=config.USER_CACHE_TTL_SECONDS)
+
+# Cache compartilhado opcional (None = só o cache do container)
+_backend: Optional[CacheBackend] = None
+
+# Chave em Session.info com as alterações pendentes até o commit
+_PENDING_KEY = "usuario_cache_pending"
+
+
+def set_backend(backend: Optional[CacheBackend]) -> None:
+    """Registra o cache compartilhado e esvazia o cache do container"""
+    global _backend
+
+    _backend = backend
+    _local.clear()
+
+
+def get(usuario_id: str) -> Optional[UsuarioResponse]:
+    usuario = _local.get(usuario_id)
+    if usuario is not None or _backend is None:
+        return usuario
+
+    try:
+        raw = _backend.get(_key(usuario_id))
+    except Exception as e:
+        logger.warning(f"Shared user cache unavailable: {str(e)}")
+        return None
+
+    if raw is None:
+        return None
+
+    usuario = UsuarioResponse.model_validate_json(raw)
+    _put_local(usuario)
+    return usuario
+
+
+def put(usuario: UsuarioResponse) -> None:
+    """Grava a versão lida do banco; não sobrescreve uma data_atualizacao mais nova"""
+    if not _put_local(usuario):
+        return
+
+    if _backend is not None:
+        try:
+            _backend.set(_key(usuario.id), usuario.model_dump_json(), config.USER_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Shared user cache unavailable: {str(e)}")
+
+
+def put_on_commit(db: Session, usuario: UsuarioResponse) -> None:
+    """put() quando a transação de db commitar (AsyncSession: passe db.sync_session)"""
+    db.info.setdefault(_PENDING_KEY, {})[usuario.id] = usuario
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(db: Session) -> None:
+    for usuario_id, usuario in db.info.pop(_PENDING_KEY, {}).items():
+        # Versão recém-gravada substitui qualquer uma em cache
+        _local.delete(usuario_id)
+        put(usuario)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(db: Session) -> None:
+    db.info.pop(_PENDING_KEY, None)
+
+
+def _put_local(usuario: UsuarioResponse) -> bool:
+    cached = _local.get(usuario.id)
+    if cached is not None and cached.data_atualizacao > usuario.data_atualizacao:
+        return False
+
+    _local.set(usuario.id, usuario)
+    return True
+
+
+def _key(usuario_id: str) -> str:
+    return f"usuario:{usuario_id}"
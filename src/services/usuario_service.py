@@ -1,9 +1,11 @@
+from typing import Optional
 from sqlalchemy.orm import Session
 from aws_lambda_powertools import Logger
 from models import Usuario
 from schemas import UsuarioCreate, UsuarioResponse
 from utils.auth import hash_password, verify_password, create_access_token
 from utils.exceptions import ConflictException, UnauthorizedException, NotFoundException
+from . import usuario_cache
 
 logger = Logger(child=True)
 
@@ -26,8 +28,11 @@ class UsuarioService:
         db.add(usuario)
         db.flush()  # Get ID without committing
 
+        response = UsuarioResponse.model_validate(usuario)
+        usuario_cache.put_on_commit(db, response)
+
         logger.info(f"Usuario created: {usuario.id}")
-        return UsuarioResponse.model_validate(usuario)
+        return response
 
     @staticmethod
     def authenticate(
@@ -48,8 +53,16 @@ class UsuarioService:
         # Generate token
         access_token = create_access_token(usuario.id, usuario.email)
 
+        response = UsuarioResponse.model_validate(usuario)
+        usuario_cache.put(response)
+
         logger.info(f"Usuario authenticated: {usuario.id}")
-        return UsuarioResponse.model_validate(usuario), access_token
+        return response, access_token
+
+    @staticmethod
+    def get_cached_usuario(usuario_id: str) -> Optional[UsuarioResponse]:
+        """Usuário do cache (container ou compartilhado), sem abrir sessão; None = buscar no banco"""
+        return usuario_cache.get(usuario_id)
 
     @staticmethod
     def get_usuario_by_id(db: Session, usuario_id: str) -> UsuarioResponse:
@@ -59,4 +72,6 @@ class UsuarioService:
             logger.warning(f"Usuario not found: {usuario_id}")
             raise NotFoundException("Usuário não encontrado")
 
-        return UsuarioResponse.model_validate(usuario)
+        response = UsuarioResponse.model_validate(usuario)
+        usuario_cache.put(response)
+        return response
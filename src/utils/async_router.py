@@ -0,0 +1,104 @@
+"""
+Async router - method/path routing for native async handlers (ASGI mode)
+"""
+
+import re
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+
+class AsyncRequest:
+    """Requisição HTTP já lida (headers em minúsculas, body em bytes)"""
+
+    __slots__ = ("method", "path", "headers", "query", "body")
+
+    def __init__(self, method: str, path: str, headers: dict, query: dict, body: bytes):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.query = query
+        self.body = body
+
+    def get_header_value(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.headers.get(name.lower(), default)
+
+
+class StreamingResponse:
+    """
+    Resposta enviada em partes (chunked) pelo asgi.py, conforme o iterador produz.
+    O dispatcher lê a primeira parte antes de enviar os headers: erros até ali
+    (auth, query inicial) ainda viram status de erro.
+    """
+
+    __slots__ = ("body", "content_type", "headers")
+
+    def __init__(self, body: AsyncIterator[str], content_type: str, headers: Optional[dict] = None):
+        self.body = body
+        self.content_type = content_type
+        self.headers = headers or {}
+
+
+class JSONResponse:
+    """Resposta JSON já serializada (ex.: replay de Idempotency-Key), com status e headers próprios"""
+
+    __slots__ = ("body", "status_code", "headers")
+
+    def __init__(self, body: str, status_code: int = 200, headers: Optional[dict] = None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+Handler = Callable[..., Awaitable]
+
+
+class AsyncRouter:
+    """
+    Rotas no mesmo formato do Router do Powertools ("/tarefas/<id>").
+    Rotas estáticas têm prioridade sobre as dinâmicas (/tarefas/batch antes de /tarefas/<id>).
+    """
+
+    def __init__(self):
+        self._static: dict[tuple[str, str], tuple[Handler, str]] = {}
+        self._dynamic: list[tuple[str, re.Pattern, Handler, str]] = []
+
+    def route(self, method: str, path: str, error: str):
+        """error: prefixo da mensagem 500, como nas rotas síncronas"""
+
+        def register(handler: Handler) -> Handler:
+            if "<" in path:
+                pattern = re.compile("^" + re.sub(r"<(\w+)>", r"(?P<\1>[^/]+)", path) + "$")
+                self._dynamic.append((method, pattern, handler, error))
+            else:
+                self._static[(method, path)] = (handler, error)
+            return handler
+
+        return register
+
+    def get(self, path: str, error: str):
+        return self.route("GET", path, error)
+
+    def post(self, path: str, error: str):
+        return self.route("POST", path, error)
+
+    def put(self, path: str, error: str):
+        return self.route("PUT", path, error)
+
+    def patch(self, path: str, error: str):
+        return self.route("PATCH", path, error)
+
+    def delete(self, path: str, error: str):
+        return self.route("DELETE", path, error)
+
+    def match(self, method: str, path: str) -> Optional[tuple[Handler, dict, str]]:
+        """(handler, path params, error) ou None se não há rota nativa"""
+
+        found = self._static.get((method, path))
+        if found:
+            return found[0], {}, found[1]
+
+        for route_method, pattern, handler, error in self._dynamic:
+            if route_method == method:
+                m = pattern.match(path)
+                if m:
+                    return handler, m.groupdict(), error
+        return None
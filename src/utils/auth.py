@@ -2,16 +2,49 @@
 Authentication utilities - JWT + bcrypt
 """
 
-import jwt
-import bcrypt
+import os
+import hashlib
 from datetime import datetime, timedelta
 from typing import Optional
 from aws_lambda_powertools import Logger
-from config import config
+from config import config, parameters
+from utils import timing
 from utils.exceptions import UnauthorizedException
+from utils.ttl_cache import TTLCache
+from utils.lazy_import import lazy_import
+
+# jwt e bcrypt só são carregados quando uma rota autentica
+jwt = lazy_import("jwt")
+bcrypt = lazy_import("bcrypt")
 
 logger = Logger(child=True)
 
+# Tokens já verificados, por sha256 do token; cada entrada expira no "exp" do JWT
+_verified_tokens = TTLCache(maxsize=int(os.getenv("JWT_CACHE_SIZE", "1024")))
+
+# Chave de assinatura resolvida uma vez por container (recarregada se rotacionar)
+_signing_key: Optional[str] = None
+
+
+def _get_signing_key() -> str:
+    global _signing_key
+
+    if _signing_key is None:
+        _signing_key = config.JWT_SECRET_KEY
+    return _signing_key
+
+
+def _on_parameters_changed(changed: set[str]) -> None:
+    global _signing_key
+
+    if "SSM_JWT_SECRET" in changed:
+        _signing_key = None
+        _verified_tokens.clear()
+        logger.info("JWT signing key rotated, verified token cache cleared")
+
+
+parameters.subscribe(_on_parameters_changed)
+
 
 def hash_password(password: str) -> str:
     """
@@ -23,8 +56,9 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password
     """
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
+    with timing.phase("password"):
+        salt = bcrypt.gensalt()
+        hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
     return hashed.decode("utf-8")
 
 
@@ -39,9 +73,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return bcrypt.checkpw(
-        plain_password.encode("utf-8"), hashed_password.encode("utf-8")
-    )
+    with timing.phase("password"):
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
 
 
 def create_access_token(usuario_id: str, email: str) -> str:
@@ -62,7 +97,7 @@ def create_access_token(usuario_id: str, email: str) -> str:
         "exp": datetime.utcnow() + timedelta(hours=config.JWT_EXPIRATION_HOURS),
     }
 
-    token = jwt.encode(payload, config.JWT_SECRET_KEY, algorithm=config.JWT_ALGORITHM)
+    token = jwt.encode(payload, _get_signing_key(), algorithm=config.JWT_ALGORITHM)
 
     logger.info(f"Access token created for user {usuario_id}")
     return token
@@ -72,6 +107,9 @@ def decode_access_token(token: str) -> dict:
     """
     Decode and verify JWT token
 
+    Tokens already verified in this container are served from an in-memory
+    cache until their "exp".
+
     Args:
         token: JWT token
 
@@ -81,10 +119,17 @@ def decode_access_token(token: str) -> dict:
     Raises:
         UnauthorizedException: If token is invalid or expired
     """
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _verified_tokens.get(digest)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(
-            token, config.JWT_SECRET_KEY, algorithms=[config.JWT_ALGORITHM]
+            token, _get_signing_key(), algorithms=[config.JWT_ALGORITHM]
         )
+        if "exp" in payload:
+            _verified_tokens.set(digest, payload, expires_at=payload["exp"])
         return payload
     except jwt.ExpiredSignatureError:
         logger.warning("Token expired")
@@ -116,6 +161,7 @@ def get_current_user_id(authorization_header: Optional[str]) -> str:
         raise UnauthorizedException("Formato de token inválido. Use: Bearer <token>")
 
     token = parts[1]
-    payload = decode_access_token(token)
+    with timing.phase("auth"):
+        payload = decode_access_token(token)
 
     return payload["sub"]
@@ -0,0 +1,48 @@
+"""
+Shared cache backends - cache visible to every container (not just this one)
+"""
+
+import time
+from typing import Optional, Protocol
+from utils.ttl_cache import TTLCache
+
+
+class CacheBackend(Protocol):
+    """
+    Interface de um cache compartilhado entre containers (ex.: Redis/ElastiCache).
+    Valores são strings; falhas podem levantar exceção (quem usa trata como miss).
+    """
+
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+
+class InMemoryCacheBackend:
+    """
+    Stand-in local do cache compartilhado (testes/benchmarks): um TTLCache no
+    processo, com contadores de chamadas
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self._cache = TTLCache(maxsize=maxsize)
+        self.gets = 0
+        self.sets = 0
+        self.deletes = 0
+
+    def get(self, key: str) -> Optional[str]:
+        self.gets += 1
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        self.sets += 1
+        self._cache.set(key, value, expires_at=time.time() + ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self.deletes += 1
+        self._cache.delete(key)
@@ -0,0 +1,167 @@
+"""
+Response compression - gzip/brotli negotiated from Accept-Encoding
+"""
+
+import base64
+import gzip
+import os
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional; sem ele só gzip é oferecido
+    brotli = None
+
+# "false" desliga a compressão (respostas sempre em texto puro)
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true"
+# Corpos menores não compensam a CPU nem o overhead do base64
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+# Níveis para conteúdo dinâmico: boa taxa em JSON com pouca CPU por requisição
+_GZIP_LEVEL = 6
+_BROTLI_QUALITY = 4
+
+_COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Melhor encoding aceito pelo cliente: "br", "gzip" ou None
+
+    Respeita q-values (q=0 recusa) e o curinga "*"; em empate, br vence gzip.
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        weight = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    wildcard = weights.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+
+    best, best_weight = None, 0.0
+    for encoding in candidates:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress_body(body: bytes, headers: dict, accept_encoding: Optional[str]) -> bytes:
+    """
+    Comprime body se o tipo, o tamanho e o Accept-Encoding permitirem
+
+    Ajusta headers (Content-Encoding, Vary) no próprio dict.
+
+    Returns:
+        body comprimido, ou o original
+    """
+    if not RESPONSE_COMPRESSION or not _compressible(headers):
+        return body
+
+    _add_vary(headers)
+
+    if len(body) < COMPRESSION_MIN_BYTES:
+        return body
+
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return body
+
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=_BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(body, compresslevel=_GZIP_LEVEL)
+
+    if len(compressed) >= len(body):
+        return body
+
+    headers["Content-Encoding"] = encoding
+    return compressed
+
+
+class StreamCompressor:
+    """Compressão incremental para respostas em streaming (modo ASGI)"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=_BROTLI_QUALITY)
+            self._compress = self._compressor.process
+            self._finish = self._compressor.finish
+        else:
+            # wbits=31: formato gzip (header + trailer), como gzip.compress
+            self._compressor = zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._compress = self._compressor.compress
+            self._finish = self._compressor.flush
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compress(chunk)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def stream_compressor(headers: dict, accept_encoding: Optional[str]) -> Optional[StreamCompressor]:
+    """
+    Compressor para um body de tamanho desconhecido (sem o limite mínimo)
+
+    Ajusta headers (Content-Encoding, Vary) no próprio dict.
+    """
+    if not RESPONSE_COMPRESSION or not _compressible(headers):
+        return None
+
+    _add_vary(headers)
+
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return None
+
+    headers["Content-Encoding"] = encoding
+    return StreamCompressor(encoding)
+
+
+def compress_response(response: dict, accept_encoding: Optional[str]) -> dict:
+    """Resposta do resolver (HTTP API v2) -> mesma resposta com body comprimido em base64"""
+
+    body = response.get("body")
+    if not body or response.get("isBase64Encoded"):
+        return response
+
+    headers = response.setdefault("headers", {})
+    raw = body.encode("utf-8")
+    compressed = compress_body(raw, headers, accept_encoding)
+
+    if compressed is not raw:
+        response["body"] = base64.b64encode(compressed).decode("ascii")
+        response["isBase64Encoded"] = True
+    return response
+
+
+def _compressible(headers: dict) -> bool:
+    if any(name.lower() == "content-encoding" for name in headers):
+        return False
+
+    content_type = next((value for name, value in headers.items() if name.lower() == "content-type"), "")
+    return isinstance(content_type, str) and content_type.lower().startswith(_COMPRESSIBLE_TYPES)
+
+
+def _add_vary(headers: dict) -> None:
+    # Caches (CloudFront, navegador) precisam separar as variantes por encoding
+    for name, value in headers.items():
+        if name.lower() == "vary":
+            if "accept-encoding" not in str(value).lower():
+                headers[name] = f"{value}, Accept-Encoding"
+            return
+    headers["Vary"] = "Accept-Encoding"
@@ -0,0 +1,56 @@
+"""
+Export encoders - tarefa rows as NDJSON or CSV lines
+"""
+
+import csv
+import io
+from datetime import date
+from enum import Enum
+from utils.json_serializer import fast_json_dumps
+
+# Formatos aceitos em ?format= (o primeiro é o padrão)
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class ExportEncoder:
+    """Uma linha de texto por tarefa, só com as colunas de fields"""
+
+    def __init__(self, export_format: str, fields: tuple[str, ...]):
+        self.format = export_format
+        self.fields = fields
+        self.content_type = CONTENT_TYPES[export_format]
+        self.filename = f"tarefas.{export_format}"
+
+        # Um writer reaproveitado: o buffer é esvaziado a cada linha
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def header(self) -> str:
+        if self.format == "csv":
+            return self._csv_line(self.fields)
+        return ""
+
+    def row(self, row) -> str:
+        if self.format == "csv":
+            return self._csv_line(_csv_value(getattr(row, name)) for name in self.fields)
+        return fast_json_dumps({name: getattr(row, name) for name in self.fields}) + "\n"
+
+    def _csv_line(self, values) -> str:
+        self._writer.writerow(values)
+        line = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return line
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
@@ -0,0 +1,329 @@
+"""
+Idempotency-Key - replays the stored response of a repeated write
+
+A primeira requisição com a chave reserva o registro (pendente por
+IDEMPOTENCY_LOCK_SECONDS), executa a rota e grava a resposta 2xx por
+IDEMPOTENCY_TTL_SECONDS. A rota monta a resposta com
+idempotent_response(db, ...) antes do commit do get_db: a escrita e a
+resposta guardada entram na mesma transação, e uma queda depois do commit
+não deixa a repetição gravar de novo.
+
+Repetições com o mesmo método, path, query e body recebem a resposta
+guardada (header Idempotent-Replayed) sem executar o service; com outro
+corpo, 422; enquanto a original está em andamento, 409. Respostas de erro
+não são guardadas: a chave é liberada para uma nova tentativa.
+
+Chaves são por usuário: requisições sem token válido ignoram o header (a rota
+responde 401 ou executa normalmente). O id da chave e o hash da requisição são
+HMAC-SHA256 com SECRET_KEY, para que a tabela não guarde um digest adivinhável
+do corpo.
+"""
+
+import asyncio
+import base64
+import functools
+import hashlib
+import hmac
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Protocol
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.event_handler import ApiGatewayResolver, Response
+from aws_lambda_powertools.event_handler.exceptions import BadRequestError, ServiceError
+from config import config
+from utils import timing
+from utils.async_router import AsyncRequest, JSONResponse
+from utils.auth import get_current_user_id
+from utils.exceptions import UnauthorizedException
+from utils.json_serializer import fast_json_dumps
+from utils.ttl_cache import TTLCache
+
+logger = Logger(child=True)
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """Registro de uma chave; status_code None = requisição original em andamento"""
+
+    request_hash: str
+    status_code: Optional[int] = None
+    body: Optional[str] = None
+
+
+class IdempotencyStore(Protocol):
+    """Armazenamento das chaves (padrão: tabela idempotency_key)"""
+
+    def reserve(self, key_id: str, request_hash: str, lock_seconds: int) -> Optional[StoredResponse]:
+        """Reserva a chave; None se reservou agora, senão o registro existente (não vencido)"""
+        ...
+
+    def complete(self, key_id: str, status_code: int, body: str, ttl_seconds: int, db=None) -> None:
+        """Grava a resposta; com db (Session da rota), na transação dela"""
+        ...
+
+    def release(self, key_id: str) -> None:
+        ...
+
+
+class InMemoryIdempotencyStore:
+    """Stand-in local da tabela (testes/benchmarks): um TTLCache no processo, sem transação"""
+
+    def __init__(self, maxsize: int = 100_000):
+        self._cache = TTLCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def reserve(self, key_id: str, request_hash: str, lock_seconds: int) -> Optional[StoredResponse]:
+        with self._lock:
+            stored = self._cache.get(key_id)
+            if stored is not None:
+                return stored
+
+            self._cache.set(key_id, StoredResponse(request_hash), expires_at=time.time() + lock_seconds)
+            return None
+
+    def complete(self, key_id: str, status_code: int, body: str, ttl_seconds: int, db=None) -> None:
+        with self._lock:
+            stored = self._cache.get(key_id)
+            if stored is not None:
+                self._cache.set(
+                    key_id,
+                    StoredResponse(stored.request_hash, status_code, body),
+                    expires_at=time.time() + ttl_seconds,
+                )
+
+    def release(self, key_id: str) -> None:
+        self._cache.delete(key_id)
+
+
+@dataclass
+class _PendingKey:
+    """Chave reservada pela requisição atual; response preenchido por idempotent_response"""
+
+    store: IdempotencyStore
+    key_id: str
+    response: Optional[tuple[int, str]] = None
+
+
+_pending: ContextVar[Optional[_PendingKey]] = ContextVar("idempotency_pending", default=None)
+
+# None = SqlIdempotencyStore, criado no primeiro uso (SQLAlchemy só carrega aí)
+_store: Optional[IdempotencyStore] = None
+
+
+def set_store(store: Optional[IdempotencyStore]) -> None:
+    global _store
+
+    _store = store
+
+
+def get_store() -> IdempotencyStore:
+    global _store
+
+    if _store is None:
+        from services.idempotency_store import SqlIdempotencyStore
+
+        _store = SqlIdempotencyStore()
+    return _store
+
+
+def request_key(
+    idempotency_key: str, auth_header: Optional[str], method: str, path: str, query: Optional[dict], body: bytes
+) -> Optional[tuple[str, str]]:
+    """(id da chave no store, hash da requisição); None sem token válido"""
+
+    if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+        raise BadRequestError(f"Header {HEADER} deve ter entre 1 e {MAX_KEY_LENGTH} caracteres")
+
+    scope = _scope(auth_header)
+    if scope is None:
+        return None
+
+    secret = config.SECRET_KEY.encode("utf-8")
+    key_id = hmac.new(secret, f"{scope}\n{idempotency_key}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+    request_hash = hmac.new(secret, digestmod=hashlib.sha256)
+    request_hash.update(f"{method} {path}\n".encode("utf-8"))
+    for name, value in sorted((query or {}).items()):
+        request_hash.update(f"{name}={value}\n".encode("utf-8"))
+    request_hash.update(body)
+    return key_id, request_hash.hexdigest()
+
+
+def idempotent(handler):
+    """Rotas síncronas (Router do Powertools): aplica o Idempotency-Key da requisição atual"""
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        event = ApiGatewayResolver.current_event
+        idempotency_key = event.get_header_value(HEADER)
+        if idempotency_key is None:
+            return handler(*args, **kwargs)
+
+        body = event.body or ""
+        request = request_key(
+            idempotency_key,
+            event.get_header_value("Authorization"),
+            event.http_method,
+            event.path,
+            event.query_string_parameters,
+            base64.b64decode(body) if event.is_base64_encoded else body.encode("utf-8"),
+        )
+        if request is None:
+            return handler(*args, **kwargs)
+
+        key_id, request_hash = request
+
+        store = get_store()
+        stored = store.reserve(key_id, request_hash, config.IDEMPOTENCY_LOCK_SECONDS)
+        if stored is not None:
+            _check_replay(stored, request_hash)
+            return Response(stored.status_code, "application/json", stored.body, headers={REPLAYED_HEADER: "true"})
+
+        pending = _PendingKey(store, key_id)
+        token = _pending.set(pending)
+        try:
+            result = handler(*args, **kwargs)
+        except BaseException:
+            _release(store, key_id)
+            raise
+        finally:
+            _pending.reset(token)
+
+        status_code, payload = pending.response or _finish(store, key_id, result)
+        return Response(status_code, "application/json", payload)
+
+    return wrapper
+
+
+def idempotent_async(handler):
+    """Rotas do AsyncRouter; o store é síncrono e roda em thread"""
+
+    @functools.wraps(handler)
+    async def wrapper(request: AsyncRequest, **path_params):
+        idempotency_key = request.get_header_value(HEADER)
+        if idempotency_key is None:
+            return await handler(request, **path_params)
+
+        found = request_key(
+            idempotency_key,
+            request.get_header_value("Authorization"),
+            request.method,
+            request.path,
+            request.query,
+            request.body,
+        )
+        if found is None:
+            return await handler(request, **path_params)
+
+        key_id, request_hash = found
+
+        store = get_store()
+        stored = await asyncio.to_thread(store.reserve, key_id, request_hash, config.IDEMPOTENCY_LOCK_SECONDS)
+        if stored is not None:
+            _check_replay(stored, request_hash)
+            return JSONResponse(stored.body, stored.status_code, headers={REPLAYED_HEADER: "true"})
+
+        pending = _PendingKey(store, key_id)
+        token = _pending.set(pending)
+        try:
+            result = await handler(request, **path_params)
+        except BaseException:
+            await asyncio.to_thread(_release, store, key_id)
+            raise
+        finally:
+            _pending.reset(token)
+
+        status_code, payload = pending.response or await asyncio.to_thread(_finish, store, key_id, result)
+        return JSONResponse(payload, status_code)
+
+    return wrapper
+
+
+def idempotent_response(db, result):
+    """
+    Retorno de uma rota @idempotent, chamado dentro do `with get_db() as db`:
+    grava a resposta na chave pela sessão da rota, antes do commit. Sem
+    Idempotency-Key, devolve result sem tocar no banco.
+    """
+    pending = _pending.get()
+    if pending is None:
+        return result
+
+    status_code, payload = _serialize(result)
+    pending.store.complete(pending.key_id, status_code, payload, config.IDEMPOTENCY_TTL_SECONDS, db=db)
+    pending.response = (status_code, payload)
+    return result
+
+
+async def idempotent_response_async(db, result):
+    """idempotent_response para rotas do AsyncRouter (db: AsyncSession)"""
+
+    pending = _pending.get()
+    if pending is None:
+        return result
+
+    status_code, payload = _serialize(result)
+    await db.run_sync(
+        lambda session: pending.store.complete(
+            pending.key_id, status_code, payload, config.IDEMPOTENCY_TTL_SECONDS, db=session
+        )
+    )
+    pending.response = (status_code, payload)
+    return result
+
+
+def _scope(auth_header: Optional[str]) -> Optional[str]:
+    if not auth_header:
+        return None
+    try:
+        return get_current_user_id(auth_header)
+    except UnauthorizedException:
+        return None
+
+
+def _check_replay(stored: StoredResponse, request_hash: str) -> None:
+    if stored.request_hash != request_hash:
+        logger.warning("Idempotency key reused with a different request")
+        raise ServiceError(422, f"{HEADER} já utilizado com outra requisição")
+    if stored.status_code is None:
+        logger.info("Idempotency key still in progress")
+        raise ServiceError(409, f"Requisição com este {HEADER} ainda em processamento")
+
+    logger.info("Replaying stored idempotent response")
+
+
+def _serialize(result) -> tuple[int, str]:
+    status_code = 200
+    if isinstance(result, tuple):
+        result, status_code = result
+
+    with timing.phase("serialize"):
+        return status_code, fast_json_dumps(result)
+
+
+def _finish(store: IdempotencyStore, key_id: str, result) -> tuple[int, str]:
+    # Rota que não chamou idempotent_response: grava depois do commit, em outra transação
+    status_code, payload = _serialize(result)
+    if not 200 <= status_code < 300:
+        _release(store, key_id)
+        return status_code, payload
+
+    try:
+        store.complete(key_id, status_code, payload, config.IDEMPOTENCY_TTL_SECONDS)
+    except Exception:
+        # A escrita já foi commitada: responde normalmente; a reserva vence sozinha
+        logger.exception("Failed to store idempotent response")
+    return status_code, payload
+
+
+def _release(store: IdempotencyStore, key_id: str) -> None:
+    try:
+        store.release(key_id)
+    except Exception:
+        logger.exception("Failed to release idempotency key")
@@ -0,0 +1,65 @@
+"""
+Import readers - NDJSON or CSV upload -> (line, item, errors) per row
+"""
+
+import csv
+import io
+import json
+from typing import Iterator, Optional
+from utils.exceptions import ValidationException
+
+# Formatos aceitos em ?format= ou pelo Content-Type (o primeiro é o padrão)
+CONTENT_TYPES = {
+    "ndjson": ("application/x-ndjson", "application/jsonl"),
+    "csv": ("text/csv",),
+}
+
+
+def detect_format(content_type: Optional[str]) -> str:
+    """Formato a partir do Content-Type; desconhecido ou ausente -> ndjson"""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    for import_format, media_types in CONTENT_TYPES.items():
+        if media_type in media_types:
+            return import_format
+    return next(iter(CONTENT_TYPES))
+
+
+def read_rows(raw: bytes, import_format: str) -> Iterator[tuple[int, object, Optional[list]]]:
+    """
+    (número da linha, item, erros de leitura) por registro do arquivo
+
+    Linhas que não são JSON válido voltam com item None e o erro no formato
+    dos erros do Pydantic, para o relatório por linha.
+    """
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValidationException("Arquivo de importação deve estar em UTF-8")
+
+    if import_format == "csv":
+        return _csv_rows(text)
+    return _ndjson_rows(text)
+
+
+def _ndjson_rows(text: str):
+    # Só \n separa registros: splitlines() também quebraria em U+2028, U+0085 etc.,
+    # que podem aparecer sem escape dentro de strings JSON
+    for line, content in enumerate(text.split("\n"), start=1):
+        content = content.removesuffix("\r")
+        if not content.strip():
+            continue
+        try:
+            yield line, json.loads(content), None
+        except ValueError as e:
+            yield line, None, [{"type": "json_invalid", "loc": [], "msg": f"JSON inválido: {e}"}]
+
+
+def _csv_rows(text: str):
+    reader = csv.DictReader(io.StringIO(text, newline=""))
+    if not reader.fieldnames or "titulo" not in reader.fieldnames:
+        raise ValidationException("CSV de importação precisa de cabeçalho com a coluna titulo")
+
+    for record in reader:
+        # Célula vazia = campo ausente; colunas além do cabeçalho (chave None) são ignoradas
+        item = {name: value for name, value in record.items() if name is not None and value not in ("", None)}
+        yield reader.line_num, item, None
@@ -7,6 +7,12 @@ from datetime import datetime, date
 from decimal import Decimal
 from uuid import UUID
 from enum import Enum
+from typing import Callable
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usamos json_dumps
+    orjson = None
 
 
 def custom_serializer(obj):
@@ -36,3 +42,50 @@ def json_dumps(obj):
     Custom JSON dumps with UTF-8 support
     """
     return json.dumps(obj, default=custom_serializer, ensure_ascii=False)
+
+
+# Serializer "compilado" por classe Pydantic (decidido uma vez, na primeira vez que aparece)
+_model_dumpers: dict[type, Callable] = {}
+
+
+def _compile_model_dumper(model_class: type) -> Callable:
+    """
+    Modelos sem aliases, serializers customizados ou computed fields (como
+    TarefaResponse e UsuarioResponse) são entregues ao orjson como o próprio
+    __dict__: str, datetime, Enum e UUID são codificados nativamente em C,
+    sem model_dump por objeto. Os demais continuam em model_dump(mode="json").
+    """
+    decorators = model_class.__pydantic_decorators__
+    plain = (
+        not decorators.field_serializers
+        and not decorators.model_serializers
+        and not model_class.model_computed_fields
+        and not model_class.model_config.get("extra") == "allow"
+        and all(
+            field.alias is None and field.serialization_alias is None
+            for field in model_class.model_fields.values()
+        )
+    )
+
+    if plain:
+        return lambda obj: obj.__dict__
+    return lambda obj: obj.model_dump(mode="json")
+
+
+def _fast_default(obj):
+    dumper = _model_dumpers.get(type(obj))
+    if dumper is None:
+        if not hasattr(obj, "model_dump"):
+            return custom_serializer(obj)
+        dumper = _model_dumpers[type(obj)] = _compile_model_dumper(type(obj))
+    return dumper(obj)
+
+
+def fast_json_dumps(obj):
+    """
+    JSON dumps via orjson (bytes em C, sem callback por campo); fallback para
+    json_dumps quando orjson não está instalado
+    """
+    if orjson is None:
+        return json_dumps(obj)
+    return orjson.dumps(obj, default=_fast_default).decode("utf-8")
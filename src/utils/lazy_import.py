@@ -0,0 +1,41 @@
+"""
+Lazy imports - defer heavy modules until a route first needs them
+"""
+
+import importlib
+import os
+import sys
+import types
+
+# Cold-start mode: LAZY_IMPORTS=false volta a importar tudo no carregamento
+LAZY_IMPORTS = os.getenv("LAZY_IMPORTS", "true").lower() == "true"
+
+
+class _LazyModule(types.ModuleType):
+    """
+    Proxy que importa o módulo real no primeiro acesso a um atributo.
+    Fica fora de sys.modules, então `import pacote.submodulo` em outro lugar
+    continua passando pelo import normal (sem executar o pacote duas vezes).
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def __getattr__(self, attr):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = self.__dict__["_module"] = importlib.import_module(self.__name__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str):
+    """
+    Retorna o módulo `name` sem executá-lo: o código do módulo (e o que ele
+    importa, ex.: SQLAlchemy) só roda no primeiro acesso a um atributo.
+    Use com acesso via atributo (`services.TarefaService`); `from x import y`
+    em outro módulo faz a carga normal, imediata.
+    """
+    if not LAZY_IMPORTS or name in sys.modules:
+        return importlib.import_module(name)
+    return _LazyModule(name)
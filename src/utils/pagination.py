@@ -0,0 +1,55 @@
+"""
+Keyset pagination - opaque cursors over (data_criacao, id)
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Optional
+from utils.exceptions import ValidationException
+
+
+def encode_cursor(data_criacao: datetime, tarefa_id: str) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor
+
+    Args:
+        data_criacao: Creation timestamp of the last row
+        tarefa_id: ID of the last row
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([data_criacao.isoformat(), tarefa_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        Tuple (data_criacao, id)
+
+    Raises:
+        ValidationException: If the cursor is malformed or its id is not a UUID
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data_criacao, tarefa_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(data_criacao), str(uuid.UUID(tarefa_id))
+    except Exception:
+        raise ValidationException("Cursor inválido")
+
+
+def next_cursor(rows: list, limit: int) -> Optional[str]:
+    """Cursor for the page after rows, or None when this is the last page"""
+    if len(rows) < limit or not rows:
+        return None
+
+    last = rows[-1]
+    return encode_cursor(last.data_criacao, last.id)
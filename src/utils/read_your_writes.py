@@ -0,0 +1,91 @@
+"""
+Read-your-writes marker - carries the time of the client's last write across containers
+
+Cada container só conhece as escritas que ele mesmo commitou, e a próxima
+requisição do usuário costuma cair em outro container. Por isso a resposta de
+uma escrita leva o horário dela (header X-Last-Write e cookie last_write, válidos
+por DB_READ_YOUR_WRITES_SECONDS); requisições que o reenviam (o cookie volta
+sozinho no navegador; outros clientes repetem o header) leem do primário até a
+janela passar. O valor só decide entre réplica e primário: um cliente que o
+forje consegue, no máximo, ler do primário.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Iterable, Optional
+from config import config
+
+HEADER = "X-Last-Write"
+COOKIE = "last_write"
+
+
+class RequestWrites:
+    __slots__ = ("client_write_at", "write_at")
+
+    def __init__(self, client_write_at: Optional[float]):
+        # Última escrita informada pelo cliente e a desta requisição (epoch em segundos)
+        self.client_write_at = client_write_at
+        self.write_at: Optional[float] = None
+
+
+# Uma instância por requisição (contextvar: isolado por task no modo ASGI)
+_current: ContextVar[Optional[RequestWrites]] = ContextVar("request_writes", default=None)
+
+
+def begin_request(header_value: Optional[str], cookies: Iterable[str] = ()) -> RequestWrites:
+    """header_value: X-Last-Write da requisição; cookies: pares "nome=valor" """
+
+    value = header_value
+    if value is None:
+        for cookie in cookies:
+            name, _, cookie_value = cookie.strip().partition("=")
+            if name == COOKIE:
+                value = cookie_value
+                break
+
+    writes = RequestWrites(_parse(value))
+    _current.set(writes)
+    return writes
+
+
+def end_request() -> None:
+    _current.set(None)
+
+
+def record_write() -> None:
+    writes = _current.get()
+    if writes is not None:
+        writes.write_at = time.time()
+
+
+def recent_write() -> bool:
+    """A requisição atual escreveu, ou o cliente escreveu, há menos de DB_READ_YOUR_WRITES_SECONDS"""
+
+    writes = _current.get()
+    if writes is None:
+        return False
+
+    now = time.time()
+    return any(
+        written_at is not None and abs(now - written_at) < config.DB_READ_YOUR_WRITES_SECONDS
+        for written_at in (writes.write_at, writes.client_write_at)
+    )
+
+
+def finish(headers: dict, writes: RequestWrites) -> Optional[str]:
+    """Se a requisição escreveu: header X-Last-Write em headers; retorna o Set-Cookie correspondente"""
+
+    if writes.write_at is None:
+        return None
+
+    value = str(int(writes.write_at * 1000))
+    headers[HEADER] = value
+    max_age = max(1, round(config.DB_READ_YOUR_WRITES_SECONDS))
+    return f"{COOKIE}={value}; Max-Age={max_age}; Path=/; Secure; HttpOnly; SameSite=Lax"
+
+
+def _parse(value: Optional[str]) -> Optional[float]:
+    # Epoch em ms; qualquer outra coisa é ignorada
+    if not value or not value.strip().isdigit():
+        return None
+    return int(value.strip()) / 1000
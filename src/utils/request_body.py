@@ -0,0 +1,70 @@
+"""
+Request body decoding - validates the raw body straight into Pydantic schemas
+"""
+
+import base64
+from functools import lru_cache
+from typing import Optional
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.event_handler import ApiGatewayResolver
+from aws_lambda_powertools.event_handler.exceptions import BadRequestError, ServiceError
+from config import config
+from utils import timing
+from utils.lazy_import import lazy_import
+
+pydantic = lazy_import("pydantic")
+
+logger = Logger(child=True)
+
+
+@lru_cache(maxsize=None)
+def get_adapter(schema_class) -> "pydantic.TypeAdapter":
+    """TypeAdapter por schema, construído uma vez por container"""
+    return pydantic.TypeAdapter(schema_class)
+
+
+def check_body_size(raw: bytes, limit: Optional[int] = None) -> bytes:
+    """Rejeita (413) corpos maiores que limit (padrão: MAX_REQUEST_BODY_BYTES)"""
+
+    limit = limit or config.MAX_REQUEST_BODY_BYTES
+    if len(raw) > limit:
+        logger.warning(f"Request body too large: {len(raw)} bytes")
+        raise ServiceError(413, f"Corpo da requisição excede {limit} bytes")
+    return raw
+
+
+def raw_body(limit: Optional[int] = None) -> bytes:
+    """Corpo da requisição atual em bytes, respeitando limit (padrão: MAX_REQUEST_BODY_BYTES)"""
+
+    event = ApiGatewayResolver.current_event
+    body = event.body or ""
+
+    raw = base64.b64decode(body) if event.is_base64_encoded else body.encode("utf-8")
+    return check_body_size(raw, limit)
+
+
+def decode_json_body(schema_class, raw: bytes):
+    """Valida bytes JSON direto no schema (TypeAdapter em cache)"""
+
+    try:
+        with timing.phase("validation"):
+            return get_adapter(schema_class).validate_json(raw)
+    except pydantic.ValidationError as e:
+        errors = e.errors()
+        if any(error["type"] == "json_invalid" for error in errors):
+            logger.error(f"Error parsing body: {errors[0]['msg']}")
+            raise BadRequestError("Corpo da requisição inválido")
+
+        logger.warning(f"Validation error: {errors}")
+        raise BadRequestError(f"Erro de validação: {errors}")
+
+
+def parse_json_body(schema_class):
+    """
+    Parse e valida o JSON body utilizando Pydantic schema
+
+    Valida os bytes direto com model_validate_json (via TypeAdapter em cache),
+    sem passar por json_body -> dict -> schema_class(**body).
+    """
+
+    return decode_json_body(schema_class, raw_body())
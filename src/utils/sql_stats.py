@@ -0,0 +1,127 @@
+"""
+SQL stats - statement count, DB time and slowest statement per request
+"""
+
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from aws_lambda_powertools import Logger
+
+logger = Logger(child=True)
+
+# N+1: "warn" loga statements idênticos repetidos, "raise" falha na repetição
+# (útil em dev/benchmark para achar o loop), "false" desliga a contagem por texto
+SQL_STRICT_MODE = os.getenv("SQL_STRICT_MODE", "false").lower()
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "3"))
+
+# Texto do statement mais lento guardado no metadata (CloudWatch)
+_MAX_STATEMENT_CHARS = 500
+
+
+class RepeatedStatementError(Exception):
+    """Mesmo statement executado SQL_REPEAT_THRESHOLD vezes na requisição (SQL_STRICT_MODE=raise)"""
+
+
+class RequestSqlStats:
+    __slots__ = ("count", "total_ms", "slowest_ms", "slowest_statement", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Counter = Counter()
+
+    def repeated(self) -> dict[str, int]:
+        """Statements executados SQL_REPEAT_THRESHOLD vezes ou mais"""
+        return {s: n for s, n in self.statements.items() if n >= SQL_REPEAT_THRESHOLD}
+
+
+# Uma instância por requisição (contextvar: isolado por task no modo ASGI)
+_current: ContextVar[Optional[RequestSqlStats]] = ContextVar("sql_stats", default=None)
+
+
+def begin_request() -> RequestSqlStats:
+    stats = RequestSqlStats()
+    _current.set(stats)
+    return stats
+
+
+def end_request() -> Optional[RequestSqlStats]:
+    stats = _current.get()
+    _current.set(None)
+    return stats
+
+
+def instrument(engine) -> None:
+    """Hooks de execução no engine (sync; no async, passe engine.sync_engine)"""
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sql_started", []).append(time.perf_counter())
+
+        stats = _current.get()
+        if stats is None or SQL_STRICT_MODE == "false":
+            return
+
+        stats.statements[statement] += 1
+        if stats.statements[statement] == SQL_REPEAT_THRESHOLD:
+            logger.warning(
+                "Repeated SQL statement (possible N+1)",
+                extra={"statement": statement[:_MAX_STATEMENT_CHARS], "executions": SQL_REPEAT_THRESHOLD},
+            )
+            if SQL_STRICT_MODE == "raise":
+                raise RepeatedStatementError(
+                    f"Statement executado {SQL_REPEAT_THRESHOLD}x na mesma requisição: {statement[:200]}"
+                )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["sql_started"].pop()) * 1000
+
+        stats = _current.get()
+        if stats is None:
+            return
+
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        if elapsed_ms > stats.slowest_ms:
+            stats.slowest_ms = elapsed_ms
+            stats.slowest_statement = statement
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        # after_cursor_execute não roda quando o statement falha
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("sql_started"):
+            connection.info["sql_started"].pop()
+
+
+def publish(metrics, stats: Optional[RequestSqlStats], route: str) -> None:
+    """Métricas EMF da requisição (namespace em POWERTOOLS_METRICS_NAMESPACE)"""
+
+    from aws_lambda_powertools.metrics import MetricUnit
+
+    if stats is None:
+        return
+
+    metrics.add_dimension(name="route", value=route)
+    metrics.add_metric(name="SqlStatements", unit=MetricUnit.Count, value=stats.count)
+    metrics.add_metric(name="SqlTimeMs", unit=MetricUnit.Milliseconds, value=round(stats.total_ms, 3))
+    metrics.add_metric(name="SqlSlowestMs", unit=MetricUnit.Milliseconds, value=round(stats.slowest_ms, 3))
+
+    if stats.slowest_statement:
+        metrics.add_metadata(key="sql_slowest_statement", value=stats.slowest_statement[:_MAX_STATEMENT_CHARS])
+
+    if SQL_STRICT_MODE != "false":
+        repeated = stats.repeated()
+        metrics.add_metric(name="SqlRepeatedStatements", unit=MetricUnit.Count, value=len(repeated))
+        if repeated:
+            metrics.add_metadata(
+                key="sql_repeated_statements",
+                value={s[:_MAX_STATEMENT_CHARS]: n for s, n in repeated.items()},
+            )
@@ -0,0 +1,97 @@
+"""
+Request timings - per-phase durations as a Server-Timing header and a structured log line
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from aws_lambda_powertools import Logger
+
+logger = Logger(child=True)
+
+# "false" mantém só o log (não expõe os tempos aos clientes)
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "true").lower() == "true"
+
+# Ordem no header; "total" é sempre o último
+PHASES = ("auth", "password", "validation", "db_acquire", "db_query", "serialize", "compress")
+
+
+class RequestTimings:
+    __slots__ = ("started", "phases")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed_ms
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_dict(self) -> dict[str, float]:
+        values = {name: round(self.phases[name], 3) for name in PHASES if name in self.phases}
+        values["total"] = round(self.total_ms(), 3)
+        return values
+
+
+# Uma instância por requisição (contextvar: isolado por task no modo ASGI)
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def begin_request() -> RequestTimings:
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def end_request() -> None:
+    _current.set(None)
+
+
+def record(name: str, elapsed_ms: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.record(name, elapsed_ms)
+
+
+@contextmanager
+def phase(name: str):
+    """Soma a duração do bloco na fase `name` da requisição atual"""
+
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(name, (time.perf_counter() - started) * 1000)
+
+
+def timed(name: str, func):
+    """Versão de func que registra cada chamada na fase `name`"""
+
+    def wrapper(*args, **kwargs):
+        with phase(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def finish(headers: dict, timings: RequestTimings, db_query_ms: float, route: str, status) -> None:
+    """Fecha a requisição: Server-Timing em headers (se habilitado) + log estruturado"""
+
+    if db_query_ms:
+        timings.record("db_query", db_query_ms)
+
+    values = timings.as_dict()
+
+    if SERVER_TIMING_HEADER:
+        headers["Server-Timing"] = ", ".join(f"{name};dur={ms}" for name, ms in values.items())
+
+    logger.info("Request timings", extra={"route": route, "status": int(status), "timings_ms": values})
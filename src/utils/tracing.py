@@ -0,0 +1,62 @@
+"""
+Tracing - Powertools Tracer without loading the X-Ray SDK while tracing is off
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+from aws_lambda_powertools import Tracer
+from aws_lambda_powertools.tracing.base import BaseProvider, BaseSegment
+
+
+class _NoopSegment(BaseSegment):
+    def close(self, end_time=None):
+        pass
+
+    def add_subsegment(self, subsegment):
+        pass
+
+    def remove_subsegment(self, subsegment):
+        pass
+
+    def put_annotation(self, key, value):
+        pass
+
+    def put_metadata(self, key, value, namespace="default"):
+        pass
+
+    def add_exception(self, exception, stack, remote=False):
+        pass
+
+
+class NoopProvider(BaseProvider):
+    """
+    Provider usado com Tracer(disabled=True). Sem ele o Tracer importa
+    aws_xray_sdk.core mesmo desligado (~300 ms de cold start).
+    """
+
+    @contextmanager
+    def in_subsegment(self, name=None, **kwargs):
+        yield _NoopSegment()
+
+    @asynccontextmanager
+    async def in_subsegment_async(self, name=None, **kwargs):
+        yield _NoopSegment()
+
+    def put_annotation(self, key, value):
+        pass
+
+    def put_metadata(self, key, value, namespace="default"):
+        pass
+
+    def patch(self, modules):
+        pass
+
+    def patch_all(self):
+        pass
+
+
+_noop_provider = NoopProvider()
+
+
+def get_tracer() -> Tracer:
+    """Tracer da aplicação (X-Ray desligado, ver POWERTOOLS_TRACE_DISABLED)"""
+    return Tracer(disabled=True, provider=_noop_provider)
@@ -128,6 +128,41 @@ resource "aws_db_instance" "postgres" {
   }
 }
 
+# RDS Read Replica (rotas GET via get_db(readonly=True))
+
+resource "aws_db_instance" "replica" {
+  count = var.db_read_replica_enabled ? 1 : 0
+
+  # Identifier
+  identifier = "${var.project_name}-${var.environment}-db-replica"
+
+  # Engine, storage e credenciais vêm do primário
+  replicate_source_db = aws_db_instance.postgres.identifier
+  instance_class      = coalesce(var.db_replica_instance_class, var.db_instance_class)
+  storage_type        = "gp3"
+  storage_encrypted   = true
+
+  # Network
+  publicly_accessible    = var.db_publicly_accessible
+  vpc_security_group_ids = [aws_security_group.rds.id]
+
+  # Sem backup próprio: o primário continua sendo a fonte dos snapshots
+  backup_retention_period = 0
+  skip_final_snapshot     = true
+
+  # Monitoring
+  monitoring_interval = 60
+  monitoring_role_arn = aws_iam_role.rds_monitoring.arn
+
+  performance_insights_enabled = false
+  auto_minor_version_upgrade   = true
+  parameter_group_name         = "default.postgres15"
+
+  tags = {
+    Name = "${var.project_name}-${var.environment}-db-replica"
+  }
+}
+
 # ========================================
 # IAM Role for RDS Enhanced Monitoring
 # ========================================
@@ -172,6 +207,19 @@ resource "aws_ssm_parameter" "db_host" {
   }
 }
 
+# Database Replica Host (sem réplica, o próprio primário: a aplicação
+# trata host igual ao db-host como "sem réplica")
+resource "aws_ssm_parameter" "db_replica_host" {
+  name        = "/${var.project_name}/${var.environment}/db-replica-host"
+  description = "RDS read replica host"
+  type        = "String"
+  value       = var.db_read_replica_enabled ? aws_db_instance.replica[0].address : aws_db_instance.postgres.address
+
+  tags = {
+    Name = "${var.project_name}-${var.environment}-db-replica-host"
+  }
+}
+
 # Database Port
 resource "aws_ssm_parameter" "db_port" {
   name        = "/${var.project_name}/${var.environment}/db-port"
@@ -15,6 +15,11 @@ output "rds_port" {
   value       = aws_db_instance.postgres.port
 }
 
+output "rds_replica_address" {
+  description = "RDS read replica address (null when disabled)"
+  value       = var.db_read_replica_enabled ? aws_db_instance.replica[0].address : null
+}
+
 output "rds_database_name" {
   description = "RDS database name"
   value       = aws_db_instance.postgres.db_name
@@ -41,13 +46,14 @@ output "rds_arn" {
 output "ssm_parameters" {
   description = "SSM Parameter Store parameter names"
   value = {
-    db_host     = aws_ssm_parameter.db_host.name
-    db_port     = aws_ssm_parameter.db_port.name
-    db_name     = aws_ssm_parameter.db_name.name
-    db_user     = aws_ssm_parameter.db_user.name
-    db_password = aws_ssm_parameter.db_password.name
-    jwt_secret  = aws_ssm_parameter.jwt_secret.name
-    secret_key  = aws_ssm_parameter.secret_key.name
+    db_host         = aws_ssm_parameter.db_host.name
+    db_replica_host = aws_ssm_parameter.db_replica_host.name
+    db_port         = aws_ssm_parameter.db_port.name
+    db_name         = aws_ssm_parameter.db_name.name
+    db_user         = aws_ssm_parameter.db_user.name
+    db_password     = aws_ssm_parameter.db_password.name
+    jwt_secret      = aws_ssm_parameter.jwt_secret.name
+    secret_key      = aws_ssm_parameter.secret_key.name
   }
 }
 
@@ -72,5 +78,6 @@ output "deployment_summary" {
     rds_storage             = "${var.db_allocated_storage}GB"
     rds_multi_az            = var.db_multi_az
     rds_publicly_accessible = var.db_publicly_accessible
+    rds_read_replica        = var.db_read_replica_enabled
   }
 }
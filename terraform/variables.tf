@@ -84,6 +84,18 @@ variable "db_publicly_accessible" {
   default     = true
 }
 
+variable "db_read_replica_enabled" {
+  description = "Create a read replica for the read-only routes (GET)"
+  type        = bool
+  default     = false
+}
+
+variable "db_replica_instance_class" {
+  description = "Read replica instance class (null = same as the primary)"
+  type        = string
+  default     = null
+}
+
 # Application Secrets
 
 variable "jwt_secret_key" {